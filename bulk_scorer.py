@@ -0,0 +1,140 @@
+"""
+QPFL Bulk Scorer
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+
+from scoring import ScoringRules, load_rules, score_player
+
+# columns copied from each stat line to its score line
+ID_FIELDS = ("player", "team", "position", "week")
+
+
+def read_stat_lines(path: str):
+    """
+    Reads player-week stat lines from a CSV, JSON (a list of records) or JSONL file. Every line needs a
+    position column (qb, rb, wr, te, k, def, hc) plus the stat fields of that position from scoring.py.
+
+    Args:
+        path (str): stat file
+
+    Returns:
+        iterator: one stat record dict per player-week
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, "r", newline="") as f:
+        if extension == ".csv":
+            yield from csv.DictReader(f)
+        elif extension == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def score_stat_lines(stat_lines, rules: ScoringRules = None) -> list:
+    """
+    Scores player-week stat lines with the league scoring rules
+
+    Args:
+        stat_lines: iterable of stat record dicts with a position field
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        list: one dict per line with the ID_FIELDS it had and its points
+    """
+    scores = []
+    for stats in stat_lines:
+        score = {field: stats[field] for field in ID_FIELDS if field in stats}
+        score["points"] = score_player(stats["position"], stats, rules)
+        scores.append(score)
+    return scores
+
+
+def write_scores(path: str, scores: list):
+    """
+    Writes score lines as CSV, or as JSON for a .json path
+
+    Args:
+        path (str): output file
+        scores (list): score dicts from score_stat_lines
+    """
+    with open(path, "w", newline="") as f:
+        if path.lower().endswith(".json"):
+            json.dump(scores, f, indent=2)
+            return
+        fields = [field for field in ID_FIELDS if scores and field in scores[0]] + ["points"]
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(scores)
+
+
+def score_stat_lines_vectorized(stat_lines, rules: ScoringRules = None) -> list:
+    """
+    Scores player-week stat lines with the columnar NumPy path, same results as score_stat_lines
+
+    Args:
+        stat_lines: iterable of stat record dicts with a position field
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        list: one dict per line with the ID_FIELDS it had and its points
+    """
+    # numpy is only needed for this path
+    from vectorized_scoring import columns_from_records, score_columns
+
+    records = list(stat_lines)
+    positions, columns = columns_from_records(records, rules)
+    points = score_columns(positions, columns, rules).tolist()
+    return [
+        dict({field: stats[field] for field in ID_FIELDS if field in stats}, points=score)
+        for stats, score in zip(records, points)
+    ]
+
+
+def score_file(input_path: str, output_path: str, vectorized: bool = False, rules_path: str = None) -> dict:
+    """
+    Scores every stat line in a file and writes the scores
+
+    Args:
+        input_path (str): CSV, JSON or JSONL stat file
+        output_path (str): CSV or JSON score file
+        vectorized (bool): score with the columnar NumPy path
+        rules_path (str): scoring rules file, defaults to scoring_rules.json
+
+    Returns:
+        dict: player-weeks scored, seconds and player-weeks per second
+    """
+    start = time.perf_counter()
+    rules = load_rules(rules_path) if rules_path else None
+    if vectorized:
+        scores = score_stat_lines_vectorized(read_stat_lines(input_path), rules)
+    else:
+        scores = score_stat_lines(read_stat_lines(input_path), rules)
+    write_scores(output_path, scores)
+    seconds = time.perf_counter() - start
+    return {
+        "player_weeks": len(scores),
+        "seconds": round(seconds, 3),
+        "player_weeks_per_second": round(len(scores) / max(seconds, 1e-9), 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a file of player-week stat lines")
+    parser.add_argument("input", help="CSV, JSON or JSONL stat lines")
+    parser.add_argument("output", help="CSV or JSON scores")
+    parser.add_argument("--vectorized", action="store_true", help="score with the columnar NumPy path")
+    parser.add_argument("--rules", default=None, help="scoring rules JSON, defaults to scoring_rules.json")
+    args = parser.parse_args()
+    summary = score_file(args.input, args.output, vectorized=args.vectorized, rules_path=args.rules)
+    logging.getLogger("scorer_logs").warning(
+        f"Scored {summary['player_weeks']} player-weeks in {summary['seconds']}s "
+        f"({summary['player_weeks_per_second']} per second)"
+    )
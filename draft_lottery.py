@@ -0,0 +1,208 @@
+"""
+QPFL Draft Lottery
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import time
+
+import numpy as np
+
+from generate_random_draft_order import snake_order
+
+
+def lottery_weights(team_count: int, weights: list = None) -> list:
+    """
+    Returns the ping-pong balls of each team, worst team first. By default the worst team gets team_count balls,
+    the next worst one fewer and the champion one.
+
+    Args:
+        team_count (int): number of teams
+        weights (list): balls per team, worst team first, None for the default
+
+    Returns:
+        list: balls per team, worst team first
+    """
+    if weights is None:
+        return list(range(team_count, 0, -1))
+    if len(weights) != team_count or any(weight <= 0 for weight in weights):
+        raise ValueError(f"Need a positive weight for each of the {team_count} teams, got {weights}")
+    return list(weights)
+
+
+def exact_odds(weights: list, lottery_picks: int = None) -> np.ndarray:
+    """
+    Computes the exact chance of every team landing every pick. Lottery picks are drawn without replacement in
+    proportion to the balls left, and the teams not drawn take the remaining picks worst first. A dynamic program
+    over the set of teams already drawn visits each set once, 2^n states instead of n! draw orders.
+
+    Args:
+        weights (list): balls per team, worst team first
+        lottery_picks (int): picks decided by the lottery, defaults to every pick
+
+    Returns:
+        np.ndarray: teams x picks probabilities, teams worst first, each row and column sums to 1
+    """
+    team_count = len(weights)
+    lottery_picks = team_count if lottery_picks is None else min(lottery_picks, team_count)
+    odds = np.zeros((team_count, team_count))
+    reach = np.zeros(1 << team_count)
+    drawn_weight = np.zeros(1 << team_count)
+    reach[0] = 1.0
+    total = float(sum(weights))
+    # a set is only reached from smaller sets, so ascending order visits every set after all of its sources
+    for drawn in range(1 << team_count):
+        chance = reach[drawn]
+        if chance == 0.0:
+            continue
+        pick = bin(drawn).count("1")
+        if pick == lottery_picks:
+            undrawn = [team for team in range(team_count) if not drawn >> team & 1]
+            for offset, team in enumerate(undrawn):
+                odds[team, pick + offset] += chance
+            continue
+        left = total - drawn_weight[drawn]
+        for team in range(team_count):
+            if drawn >> team & 1:
+                continue
+            step = chance * weights[team] / left
+            odds[team, pick] += step
+            reach[drawn | 1 << team] += step
+            drawn_weight[drawn | 1 << team] = drawn_weight[drawn] + weights[team]
+    return odds
+
+
+def simulate_odds(
+    weights: list, lottery_picks: int = None, draws: int = 1000000, seed: int = None, chunk_size: int = 250000
+) -> np.ndarray:
+    """
+    Estimates the same table as exact_odds by running the lottery many times, vectorized with NumPy. Sorting each
+    team's log balls plus Gumbel noise gives one weighted draw without replacement per row.
+
+    Args:
+        weights (list): balls per team, worst team first
+        lottery_picks (int): picks decided by the lottery, defaults to every pick
+        draws (int): number of simulated lotteries
+        seed (int): random seed
+        chunk_size (int): lotteries per block, bounds memory
+
+    Returns:
+        np.ndarray: teams x picks frequencies, teams worst first
+    """
+    team_count = len(weights)
+    lottery_picks = team_count if lottery_picks is None else min(lottery_picks, team_count)
+    rng = np.random.default_rng(seed)
+    log_weights = np.log(np.asarray(weights, dtype=float))
+    # teams left after the lottery keep worst-first order: drawn teams sort last, the rest by team number
+    standing = np.arange(team_count, dtype=float)
+    counts = np.zeros((team_count, team_count), dtype=np.int64)
+    for first in range(0, draws, chunk_size):
+        size = min(chunk_size, draws - first)
+        keys = log_weights + rng.gumbel(size=(size, team_count))
+        order = np.argsort(-keys, axis=1)
+        if lottery_picks < team_count:
+            drawn = np.zeros((size, team_count), dtype=bool)
+            np.put_along_axis(drawn, order[:, :lottery_picks], True, axis=1)
+            tail = np.argsort(np.where(drawn, np.inf, standing), axis=1)[:, : team_count - lottery_picks]
+            order = np.concatenate([order[:, :lottery_picks], tail], axis=1)
+        for pick in range(team_count):
+            counts[:, pick] += np.bincount(order[:, pick], minlength=team_count)
+    return counts / max(draws, 1)
+
+
+def draw_lottery(teams: list, weights: list, lottery_picks: int = None, seed: int = None) -> list:
+    """
+    Runs the lottery once for the real draft order
+
+    Args:
+        teams (list): team names, worst team first
+        weights (list): balls per team, worst team first
+        lottery_picks (int): picks decided by the lottery, defaults to every pick
+        seed (int): random seed, None for a fresh draw
+
+    Returns:
+        list: team names in first round pick order
+    """
+    rng = random.Random(seed)
+    lottery_picks = len(teams) if lottery_picks is None else min(lottery_picks, len(teams))
+    left = list(range(len(teams)))
+    order = []
+    for _ in range(lottery_picks):
+        team = rng.choices(left, weights=[weights[number] for number in left])[0]
+        left.remove(team)
+        order.append(team)
+    return [teams[number] for number in order + left]
+
+
+def format_odds_table(teams: list, weights: list, odds: np.ndarray) -> str:
+    """
+    Renders the odds table, one row per team worst first and one column per pick
+
+    Args:
+        teams (list): team names, worst team first
+        weights (list): balls per team, worst team first
+        odds (np.ndarray): teams x picks probabilities
+
+    Returns:
+        str: odds table
+    """
+    header = f"{'Team':<14}{'Balls':>6}" + "".join(f"{pick:>7}" for pick in range(1, len(teams) + 1))
+    lines = [header]
+    for number, team in enumerate(teams):
+        lines.append(
+            f"{team:<14}{weights[number]:>6g}" + "".join(f"{probability:>7.1%}" for probability in odds[number])
+        )
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    from generate_random_draft_order import teams as default_teams
+    from standings import Standings
+
+    parser = argparse.ArgumentParser(description="Weighted QPFL draft lottery odds and draw")
+    parser.add_argument(
+        "--standings", nargs="+", default=None, help="final standings, champion first, defaults to the league teams"
+    )
+    parser.add_argument("--results", nargs="*", default=[], help="weekly_results.py --out JSON files to rank from")
+    parser.add_argument("--weights", type=float, nargs="+", default=None, help="balls per team, worst team first")
+    parser.add_argument("--lottery-picks", type=int, default=None, help="picks decided by lottery, default all")
+    parser.add_argument("--draws", type=int, default=1000000, help="simulated lotteries for the cross-check, 0 skips")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for the simulation and the draw")
+    parser.add_argument("--draw", action="store_true", help="also draw the real order and print the snake")
+    args = parser.parse_args()
+    logger = logging.getLogger("draft_logs")
+    final_standings = args.standings or default_teams
+    if args.results:
+        weekly = []
+        for path in args.results:
+            with open(path, "r") as f:
+                weekly.append(json.load(f))
+        weekly.sort(key=lambda week_results: week_results["week"])
+        standings = Standings(sorted({team for week_results in weekly for team in week_results["lineups"]}))
+        for week_results in weekly:
+            standings.apply_results(week_results)
+        final_standings = [row["team"] for row in standings.table()]
+    league = list(reversed(final_standings))
+    balls = lottery_weights(len(league), args.weights)
+    start = time.perf_counter()
+    table = exact_odds(balls, args.lottery_picks)
+    logger.warning(f"Exact odds in {time.perf_counter() - start:.4f}s")
+    print(format_odds_table(league, balls, table))
+    if args.draws:
+        start = time.perf_counter()
+        simulated = simulate_odds(balls, args.lottery_picks, args.draws, args.seed)
+        # largest gap against the exact table in standard errors of a binomial frequency
+        error = np.sqrt(np.maximum(table * (1 - table), 1e-12) / args.draws)
+        worst = float(np.max(np.abs(simulated - table) / error))
+        logger.warning(
+            f"{args.draws:,} simulated lotteries in {time.perf_counter() - start:.2f}s, largest gap "
+            f"{np.max(np.abs(simulated - table)):.5f} ({worst:.1f} standard errors)"
+        )
+        if worst > 5 + math.log(table.size):
+            logger.error("Simulated odds disagree with the exact table")
+    if args.draw:
+        for team in snake_order(draw_lottery(league, balls, args.lottery_picks), rounds=2):
+            print(team)
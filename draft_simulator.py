@@ -0,0 +1,275 @@
+"""
+QPFL Snake Draft Simulator
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import time
+from collections import Counter
+
+import numpy as np
+
+from bulk_scorer import read_stat_lines
+from generate_random_draft_order import random_draft_order, snake_order
+from rosters import LINEUP_SLOTS
+
+
+def load_adp(path: str) -> list:
+    """
+    Reads a draft board from a CSV, JSON or JSONL file with player, position and either an adp column (lower goes
+    earlier) or a projection column (higher goes earlier). An optional adp_std column sets how far each player's
+    draft spot wanders between drafts.
+
+    Args:
+        path (str): ADP or projection table
+
+    Returns:
+        list: (player, position, adp, adp_std or None) tuples, earliest first
+    """
+    lines = list(read_stat_lines(path))
+    if lines and lines[0].get("adp") in (None, ""):
+        # projections only: rank them into ADPs
+        lines.sort(key=lambda line: -float(line["projection"]))
+        for rank, line in enumerate(lines, start=1):
+            line["adp"] = rank
+    board = []
+    for line in lines:
+        adp_std = line.get("adp_std")
+        board.append(
+            (
+                line["player"],
+                line["position"].strip().lower(),
+                float(line["adp"]),
+                float(adp_std) if adp_std not in (None, "") else None,
+            )
+        )
+    board.sort(key=lambda entry: entry[2])
+    return board
+
+
+def _simulate_drafts(task: tuple) -> tuple:
+    """
+    Runs a block of drafts inside a worker process, vectorized across the drafts: every pick takes, in each draft
+    at once, the player with the earliest noisy ADP among the positions the team on the clock still needs. Within
+    a position players always go in board order, so each draft only tracks the next player up at every position
+    and a pick compares one candidate per position instead of the whole board.
+
+    Args:
+        task (tuple): (drafts, seed sequence, pick team ids, team count, player position ids, adps, adp stds,
+            slots needed per position id)
+
+    Returns:
+        tuple: (times each player was available at each pick as a picks x players array, times each player was
+            taken at each pick as a picks x players array)
+    """
+    drafts, seed_sequence, pick_teams, team_count, positions, adps, stds, needs = task
+    rng = np.random.default_rng(seed_sequence)
+    player_count = len(adps)
+    position_count = len(needs)
+    pick_count = len(pick_teams)
+    # one noisy board per draft: everyone in a draft sees the same reach or slide of a player
+    boards = adps + stds * rng.standard_normal((drafts, player_count))
+    # each position's players in board order per draft, padded with an empty slot once a position runs out
+    depth = max(int(np.count_nonzero(positions == position)) for position in range(position_count)) + 1
+    queue_values = np.full((drafts, position_count, depth), np.inf)
+    queue_players = np.zeros((drafts, position_count, depth), dtype=np.int64)
+    for position in range(position_count):
+        players = np.flatnonzero(positions == position)
+        ranked = np.argsort(boards[:, players], axis=1)
+        queue_players[:, position, : len(players)] = players[ranked]
+        queue_values[:, position, : len(players)] = np.take_along_axis(boards[:, players], ranked, axis=1)
+    next_up = np.zeros((drafts, position_count), dtype=np.int64)
+    remaining = np.tile(needs, (drafts, team_count, 1))
+    taken_at = np.full((drafts, player_count), pick_count, dtype=np.int64)
+    rows = np.arange(drafts)
+    for pick, team in enumerate(pick_teams):
+        candidates = np.take_along_axis(queue_values, next_up[:, :, None], axis=2)[:, :, 0]
+        needed = np.where(remaining[:, team, :] > 0, candidates, np.inf)
+        # a team whose lineup is full takes the best player left at any position
+        full = np.isinf(needed).all(axis=1)
+        needed[full] = candidates[full]
+        position = needed.argmin(axis=1)
+        taken_at[rows, queue_players[rows, position, next_up[rows, position]]] = pick
+        next_up[rows, position] += 1
+        remaining[rows, team, position] -= 1
+    # players never taken land in an extra bucket past the last pick
+    taken_counts = np.bincount(
+        (taken_at * player_count + np.arange(player_count)).ravel(), minlength=(pick_count + 1) * player_count
+    ).reshape(pick_count + 1, player_count)[:pick_count]
+    available_counts = drafts - np.cumsum(taken_counts, axis=0) + taken_counts
+    return available_counts, taken_counts
+
+
+def simulate_draft(
+    board: list,
+    first_round: list,
+    drafts: int = 20000,
+    rounds: int = len(LINEUP_SLOTS),
+    lineup: tuple = LINEUP_SLOTS,
+    workers: int = None,
+    seed: int = None,
+    chunk_size: int = 2500,
+) -> dict:
+    """
+    Simulates many snake drafts from one draft order and counts, for every pick, how often each player was still
+    on the board and how often that pick took them. Auto-picks follow the board's ADP with per-draft noise and fill
+    each team's lineup before taking anyone at a filled position.
+
+    Args:
+        board (list): (player, position, adp, adp_std or None) tuples from load_adp
+        first_round (list): team names in first round pick order
+        drafts (int): number of simulated drafts
+        rounds (int): rounds in the draft
+        lineup (tuple): lineup slots every team needs, one entry per slot
+        workers (int): worker processes, 1 simulates in this process, defaults to the number of cores
+        seed (int): random seed, the same seed gives the same result for any number of workers
+        chunk_size (int): drafts per vectorized block
+
+    Returns:
+        dict: drafts, teams, players, pick order and the availability and pick count arrays
+    """
+    if rounds * len(first_round) > len(board):
+        raise ValueError(f"{rounds} rounds of {len(first_round)} teams need more than {len(board)} players")
+    position_ids = {position: number for number, position in enumerate(sorted(set(lineup)))}
+    unknown = {position for _, position, _, _ in board} - set(position_ids)
+    if unknown:
+        raise ValueError(f"Board has positions {', '.join(sorted(unknown))} that are not in the lineup")
+    order = snake_order(first_round, rounds)
+    team_ids = {team: number for number, team in enumerate(first_round)}
+    pick_teams = np.array([team_ids[team] for team in order])
+    positions = np.array([position_ids[position] for _, position, _, _ in board])
+    adps = np.array([adp for _, _, adp, _ in board])
+    # without a listed spread, later picks wander more than early ones
+    stds = np.array([std if std is not None else 1.5 + 0.1 * adp for _, _, adp, std in board])
+    needs = np.zeros(len(position_ids), dtype=np.int64)
+    for position, count in Counter(lineup).items():
+        needs[position_ids[position]] = count
+    chunks = [min(chunk_size, drafts - first) for first in range(0, drafts, chunk_size)]
+    tasks = [
+        (chunk, seed_sequence, pick_teams, len(first_round), positions, adps, stds, needs)
+        for chunk, seed_sequence in zip(chunks, np.random.SeedSequence(seed).spawn(len(chunks)))
+    ]
+    available = np.zeros((len(order), len(board)), dtype=np.int64)
+    taken = np.zeros((len(order), len(board)), dtype=np.int64)
+    if workers == 1 or len(tasks) <= 1:
+        for chunk_available, chunk_taken in map(_simulate_drafts, tasks):
+            available += chunk_available
+            taken += chunk_taken
+    else:
+        with multiprocessing.Pool(processes=min(workers or multiprocessing.cpu_count(), len(tasks))) as pool:
+            for chunk_available, chunk_taken in pool.imap_unordered(_simulate_drafts, tasks):
+                available += chunk_available
+                taken += chunk_taken
+    return {
+        "drafts": drafts,
+        "teams": list(first_round),
+        "players": [(player, position) for player, position, _, _ in board],
+        "order": order,
+        "available": available,
+        "taken": taken,
+    }
+
+
+def team_report(result: dict, team: str, top: int = 8) -> list:
+    """
+    Summarizes one team's picks: the earliest-ADP players most likely still on the board and who the team most
+    often takes
+
+    Args:
+        result (dict): output of simulate_draft
+        team (str): team name
+        top (int): players to list per pick
+
+    Returns:
+        list: one dict per pick with round, overall pick, likely available players and likely picks
+    """
+    picks = []
+    team_count = len(result["teams"])
+    for overall, picking_team in enumerate(result["order"]):
+        if picking_team != team:
+            continue
+        available = result["available"][overall] / result["drafts"]
+        taken = result["taken"][overall] / result["drafts"]
+        likely = [number for number in range(len(available)) if available[number] >= 0.05][:top]
+        favorites = np.argsort(-taken, kind="stable")[:top]
+        picks.append(
+            {
+                "round": overall // team_count + 1,
+                "pick": overall + 1,
+                "available": [
+                    {
+                        "player": result["players"][number][0],
+                        "position": result["players"][number][1],
+                        "probability": round(float(available[number]), 4),
+                    }
+                    for number in likely
+                ],
+                "taken": [
+                    {
+                        "player": result["players"][number][0],
+                        "position": result["players"][number][1],
+                        "probability": round(float(taken[number]), 4),
+                    }
+                    for number in favorites
+                    if taken[number] > 0
+                ],
+            }
+        )
+    return picks
+
+
+def format_team_report(team: str, picks: list) -> str:
+    """
+    Renders a team's pick report as text
+
+    Args:
+        team (str): team name
+        picks (list): output of team_report
+
+    Returns:
+        str: report text
+    """
+    lines = [f"{team} draft outlook"]
+    for pick in picks:
+        lines.append(f"Round {pick['round']}, pick {pick['pick']}")
+        lines.append(
+            "  Likely available: "
+            + ", ".join(f"{entry['player']} ({entry['probability']:.0%})" for entry in pick["available"])
+        )
+        lines.append(
+            "  Usually takes:    "
+            + ", ".join(f"{entry['player']} ({entry['probability']:.0%})" for entry in pick["taken"][:4])
+        )
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    from generate_random_draft_order import teams as default_teams
+
+    parser = argparse.ArgumentParser(description="Simulate QPFL snake drafts from an ADP or projection table")
+    parser.add_argument("--adp", default="draft_fixtures/adp.csv", help="ADP or projection table")
+    parser.add_argument("--order", nargs="+", default=None, help="first round order, defaults to a random one")
+    parser.add_argument("--order-seed", type=int, default=None, help="seed for the random first round order")
+    parser.add_argument("--drafts", type=int, default=20000, help="number of simulated drafts")
+    parser.add_argument("--rounds", type=int, default=len(LINEUP_SLOTS), help="rounds in the draft")
+    parser.add_argument("--team", default=None, help="print this team's outlook, defaults to every team")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, 1 simulates in this process")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for the simulated drafts")
+    parser.add_argument("--out", default=None, help="write every team's outlook as JSON here")
+    args = parser.parse_args()
+    first_round = args.order or random_draft_order(default_teams, args.order_seed)
+    start = time.perf_counter()
+    draft = simulate_draft(
+        load_adp(args.adp), first_round, args.drafts, args.rounds, workers=args.workers, seed=args.seed
+    )
+    logging.getLogger("draft_logs").warning(
+        f"Simulated {args.drafts} drafts of {len(draft['order'])} picks in {time.perf_counter() - start:.2f}s"
+    )
+    reports = {team: team_report(draft, team) for team in first_round}
+    for team in [args.team] if args.team else first_round:
+        print(format_team_report(team, reports[team]))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"order": draft["order"], "drafts": args.drafts, "teams": reports}, f, indent=2)
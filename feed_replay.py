@@ -0,0 +1,114 @@
+"""
+QPFL Stat Feed Replay
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+
+from rosters import load_rosters
+from scoring import POSITION_FIELDS
+
+# (field, most added per event) for the made-up events, a field missing here never changes
+SYNTHETIC_STEPS = {
+    "pass_yards": 30,
+    "rush_yards": 15,
+    "rec_yards": 20,
+    "tds": 1,
+    "turnovers": 1,
+    "two_pt": 1,
+    "pat_made": 1,
+    "fg_30_39": 1,
+    "fg_40_49": 1,
+    "points_allowed": 7,
+    "sacks": 1,
+    "margin": 7,
+}
+
+
+def synthetic_feed(rosters: dict, count: int, seed: int = None):
+    """
+    Builds a made-up live feed for the rostered players: each event picks a player, grows one of their stats and
+    carries the player's full cumulative stat line, the way a live provider sends updates
+
+    Args:
+        rosters (dict): list of (player, position) tuples keyed by team
+        count (int): number of events
+        seed (int): random seed
+
+    Returns:
+        iterator: event dicts
+    """
+    rng = random.Random(seed)
+    positions = {player: position for roster in rosters.values() for player, position in roster}
+    players = sorted(positions)
+    totals = {player: {} for player in players}
+    for _ in range(count):
+        player = rng.choice(players)
+        position = positions[player]
+        stats = totals[player]
+        if position == "hc":
+            stats["win"] = rng.random() < 0.5
+        fields = [field for field in POSITION_FIELDS[position] if field in SYNTHETIC_STEPS]
+        field = rng.choice(fields)
+        stats[field] = stats.get(field, 0) + rng.randint(0, SYNTHETIC_STEPS[field])
+        yield {"player": player, "position": position, "stats": dict(stats)}
+
+
+def replay(lines, output, rate: float = None):
+    """
+    Writes feed lines to an output stream, optionally paced to a fixed number of events per second
+
+    Args:
+        lines: iterable of JSON lines or event dicts
+        output: text stream to write to
+        rate (float): events per second, None writes as fast as possible
+
+    Returns:
+        int: number of events written
+    """
+    count = 0
+    start = time.perf_counter()
+    for line in lines:
+        if isinstance(line, dict):
+            line = json.dumps(line)
+        line = line.strip()
+        if not line:
+            continue
+        if rate:
+            delay = start + count / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        output.write(line + "\n")
+        output.flush()
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a JSONL stat feed, or a made-up one, for the live scorer")
+    parser.add_argument("feed", nargs="?", help="recorded JSONL feed to replay")
+    parser.add_argument("--rosters", help="rosters JSON, makes up a feed for these players when no feed is given")
+    parser.add_argument("--events", type=int, default=1000, help="made-up events to write")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for made-up events")
+    parser.add_argument("--rate", type=float, default=None, help="events per second, default as fast as possible")
+    parser.add_argument("--out", default="-", help="file to append events to, - for stdout")
+    args = parser.parse_args()
+    if args.feed:
+        source = open(args.feed, "r")
+    elif args.rosters:
+        source = synthetic_feed(load_rosters(args.rosters), args.events, args.seed)
+    else:
+        parser.error("pass a feed file or --rosters")
+    output = sys.stdout if args.out == "-" else open(args.out, "a")
+    try:
+        written = replay(source, output, args.rate)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if args.feed:
+            source.close()
+    logging.getLogger("scorer_logs").info(f"Replayed {written} events")
@@ -17,9 +17,38 @@ teams = [
     "Arnav",
 ]
 
-first_round = random.sample(teams, len(teams))
-second_round = first_round[::-1]
-combined_order = first_round + second_round
 
-for team in combined_order:
-    print(team)
+def random_draft_order(teams: list, seed: int = None) -> list:
+    """
+    Shuffles the teams into a first round order
+
+    Args:
+        teams (list): team names
+        seed (int): random seed, None for a fresh shuffle
+
+    Returns:
+        list: team names in first round pick order
+    """
+    return random.Random(seed).sample(teams, len(teams))
+
+
+def snake_order(first_round: list, rounds: int = 2) -> list:
+    """
+    Expands a first round order into a snake draft, every other round reversed
+
+    Args:
+        first_round (list): team names in first round pick order
+        rounds (int): number of rounds
+
+    Returns:
+        list: team name of every pick, first overall pick first
+    """
+    return [team for number in range(rounds) for team in (first_round if number % 2 == 0 else first_round[::-1])]
+
+
+if __name__ == "__main__":
+    first_round = random_draft_order(teams)
+    combined_order = snake_order(first_round, rounds=2)
+
+    for team in combined_order:
+        print(team)
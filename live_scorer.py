@@ -0,0 +1,233 @@
+"""
+QPFL Live Scorer
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+from rosters import load_rosters
+from schedule_model import load_season
+from scoring import ScoringRules, load_rules, score_player
+
+# event keys that identify the player rather than carry a stat
+EVENT_ID_FIELDS = ("player", "position", "team", "week", "time", "stats")
+
+
+class LiveScoreboard:
+    """
+    Keeps every rostered player's cumulative stats and points and every team's total for one week. Applying a
+    stat event rescores only that player and adjusts only the totals of the teams that roster them, so the cost
+    of an event does not depend on how many rosters are loaded.
+    """
+
+    def __init__(self, rosters: dict, matchups: list, rules: ScoringRules = None):
+        """
+        Initializer for the LiveScoreboard class
+
+        Args:
+            rosters (dict): list of (player, position) tuples keyed by team
+            matchups (list): (team, opponent) tuples for the week
+            rules (ScoringRules): compiled scoring rules, defaults to the league rules
+        """
+        self.rules = rules
+        self.positions = {}
+        self.player_teams = {}
+        for team, roster in rosters.items():
+            for player, position in roster:
+                if self.positions.setdefault(player, position) != position:
+                    raise ValueError(f"{player} is listed as both {self.positions[player]} and {position}")
+                self.player_teams.setdefault(player, []).append(team)
+        self.opponents = {}
+        for team, opponent in matchups:
+            for side in (team, opponent):
+                if side not in rosters:
+                    raise ValueError(f"{side} plays this week but has no roster")
+            self.opponents[team] = opponent
+            self.opponents[opponent] = team
+        self.matchups = [tuple(matchup) for matchup in matchups]
+        # players without an event yet have not played and count 0, not the score of an empty stat line
+        self.stats = {player: {} for player in self.positions}
+        self.points = dict.fromkeys(self.positions, 0)
+        self.team_scores = dict.fromkeys(rosters, 0)
+        self.unknown_players = 0
+
+    def apply(self, event: dict) -> list:
+        """
+        Method to apply one stat event. Stats in the event are the player's cumulative totals so far, given either
+        under a "stats" key or as top-level fields, and replace the values they name.
+
+        Args:
+            event (dict): {"player": name, "stats": {field: total}} or {"player": name, field: total, ...}
+
+        Returns:
+            list: (team, score, opponent, opponent score) for each matchup the player appears in, empty for a
+                player on no roster
+        """
+        player = event["player"]
+        if player not in self.positions:
+            self.unknown_players += 1
+            return []
+        stats = event.get("stats")
+        if stats is None:
+            stats = {field: value for field, value in event.items() if field not in EVENT_ID_FIELDS}
+        self.stats[player].update(stats)
+        points = score_player(self.positions[player], self.stats[player], self.rules)
+        change = points - self.points[player]
+        self.points[player] = points
+        updates = []
+        for team in self.player_teams[player]:
+            self.team_scores[team] += change
+            opponent = self.opponents.get(team)
+            if opponent is not None:
+                updates.append((team, self.team_scores[team], opponent, self.team_scores[opponent]))
+        return updates
+
+    def matchup_scores(self) -> list:
+        """
+        Method to return the current score of every matchup
+
+        Returns:
+            list: (team, score, opponent, opponent score) tuples in schedule order
+        """
+        return [
+            (team, self.team_scores[team], opponent, self.team_scores[opponent]) for team, opponent in self.matchups
+        ]
+
+
+def read_feed(stream, follow: bool = False, poll_interval: float = 0.1):
+    """
+    Reads stat events from a line-delimited JSON stream. With follow, waits for more lines at end of file the way
+    tail -f does and only stops when interrupted. Lines that are not valid JSON are logged and skipped.
+
+    Args:
+        stream: open text file or sys.stdin
+        follow (bool): keep waiting for new lines at end of file
+        poll_interval (float): seconds between checks for new lines when following
+
+    Returns:
+        iterator: one event dict per line
+    """
+    logger = logging.getLogger("scorer_logs")
+    partial = ""
+    while True:
+        line = stream.readline()
+        if not line:
+            if not follow:
+                break
+            time.sleep(poll_interval)
+            continue
+        if follow and not line.endswith("\n"):
+            # the writer has not finished this line yet
+            partial += line
+            continue
+        line, partial = partial + line, ""
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping bad feed line {line.strip()!r}: {e}")
+    if partial.strip():
+        logger.warning(f"Feed ended in an unfinished line {partial.strip()!r}")
+
+
+def week_matchups(schedule_path: str, week: int) -> list:
+    """
+    Reads one week's matchups from a saved schedule
+
+    Args:
+        schedule_path (str): schedule file in any format load_season reads
+        week (int): week number, week 1 first
+
+    Returns:
+        list: (team, opponent) tuples
+    """
+    season = load_season(schedule_path)
+    if not 1 <= week <= len(season.weeks):
+        raise ValueError(f"{schedule_path} has weeks 1-{len(season.weeks)}, not week {week}")
+    return season.weeks[week - 1]
+
+
+def run_live(scoreboard: LiveScoreboard, events, output=None) -> dict:
+    """
+    Applies a stream of events and writes the updated matchup scores after each one as a JSON line
+
+    Args:
+        scoreboard (LiveScoreboard): scoreboard to update
+        events: iterable of event dicts
+        output: text stream for the JSON lines, None to only time the updates
+
+    Returns:
+        dict: events applied, events for players on no roster, and mean and max microseconds per event
+    """
+    count = 0
+    total = 0.0
+    slowest = 0.0
+    try:
+        for event in events:
+            start = time.perf_counter()
+            updates = scoreboard.apply(event)
+            elapsed = time.perf_counter() - start
+            count += 1
+            total += elapsed
+            slowest = max(slowest, elapsed)
+            if output is not None and updates:
+                line = {
+                    "player": event["player"],
+                    "points": scoreboard.points[event["player"]],
+                    "matchups": [
+                        {"team": team, "score": score, "opponent": opponent, "opponent_score": opponent_score}
+                        for team, score, opponent, opponent_score in updates
+                    ],
+                }
+                output.write(json.dumps(line) + "\n")
+                output.flush()
+    except KeyboardInterrupt:
+        # stopping a followed feed still reports the events applied so far
+        pass
+    return {
+        "events": count,
+        "unknown_players": scoreboard.unknown_players,
+        "mean_us": round(1e6 * total / max(count, 1), 2),
+        "max_us": round(1e6 * slowest, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a week's matchups live from a JSONL stat feed")
+    parser.add_argument("--rosters", required=True, help="rosters JSON, see rosters.py")
+    parser.add_argument("--schedule", default="schedule/schedule.json", help="saved schedule to read matchups from")
+    parser.add_argument("--week", type=int, help="week of the schedule to score")
+    parser.add_argument(
+        "--matchup", nargs=2, action="append", metavar=("TEAM", "OPPONENT"), help="score this matchup instead"
+    )
+    parser.add_argument("--feed", default="-", help="JSONL stat feed, - for stdin")
+    parser.add_argument("--follow", action="store_true", help="keep waiting for new events at end of the feed")
+    parser.add_argument("--rules", default=None, help="scoring rules JSON, defaults to scoring_rules.json")
+    parser.add_argument("--quiet", action="store_true", help="only report timing, do not print matchup scores")
+    args = parser.parse_args()
+    logger = logging.getLogger("scorer_logs")
+    if args.matchup:
+        matchups = [tuple(matchup) for matchup in args.matchup]
+    elif args.week is not None:
+        matchups = week_matchups(args.schedule, args.week)
+    else:
+        parser.error("pass --week or at least one --matchup")
+    scoreboard = LiveScoreboard(
+        load_rosters(args.rosters), matchups, rules=load_rules(args.rules) if args.rules else None
+    )
+    stream = sys.stdin if args.feed == "-" else open(args.feed, "r")
+    try:
+        summary = run_live(scoreboard, read_feed(stream, follow=args.follow), None if args.quiet else sys.stdout)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    for team, score, opponent, opponent_score in scoreboard.matchup_scores():
+        logger.warning(f"{team} {score} - {opponent_score} {opponent}")
+    logger.warning(
+        f"{summary['events']} events ({summary['unknown_players']} for unrostered players), "
+        f"{summary['mean_us']}us mean, {summary['max_us']}us max per event"
+    )
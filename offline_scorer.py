@@ -2,17 +2,214 @@
 Simple Offline Scorer
 """
 
-import math
+import argparse
+import logging
+
+from score_cache import ScoreCache
+from scoring import (
+    DEFAULT_RULES,
+    ScoringRules,
+    load_rules,
+    score_defense,
+    score_head_coach,
+    score_kicker,
+    score_offense,
+    score_player,
+)
+from scoring_journal import ScoringJournal, archive_finished
+
+MODES = ("p", "t", "m")
+PLAYER_TYPES = ("qb", "rb", "wr", "te", "k", "def", "hc")
+YES_NO = {"y": True, "yes": True, "n": False, "no": False}
 
 
 class Scorer:
-    def __init__(self):
+    def __init__(
+        self,
+        rules: ScoringRules = None,
+        cache_path: str = "scores.db",
+        week: int = None,
+        journal: ScoringJournal = None,
+    ):
         """
         Initializer for Scorer class
+
+        Args:
+            rules (ScoringRules): compiled scoring rules, defaults to the league rules
+            cache_path (str): SQLite score cache shared across runs, None to score without one
+            week (int): week being scored, asked for by the controller when None and a cache is used
+            journal (ScoringJournal): journal every answer is recorded in, its recorded answers are replayed first
         """
+        self.logger = logging.getLogger("scorer_logs")
+        self.rules = rules or DEFAULT_RULES
+        self.cache = ScoreCache(cache_path, self.rules) if cache_path else None
+        self.week = week
+        self.journal = journal
         self.team_score = 0
         self.opponent_score = 0
 
+    def _player(self) -> tuple:
+        """
+        Helper method to ask which player is being scored and look up their stored score for the week. A stored
+        score is shown with the option to re-enter the player's stats, for corrected stat lines.
+
+        Returns:
+            tuple: (player name, stored points), the name is "" when the cache is off or skipped and the points
+                are None when the player still needs scoring
+        """
+        # a journaled session that used the cache replays its players without one
+        if self.cache is None and not self._journaled("player"):
+            return "", None
+        player = self._ask("player", "Player name (blank to skip the cache): ", str.strip)
+        if not player:
+            return "", None
+        # journal the stored stat line the player was found with, so a replay re-scores the same stats without the
+        # cache, and a player entered in this session is not taken from the cache when it is replayed
+        line = self._decide(
+            "stored", lambda: self.cache.stat_line(player, self.week) if self.cache is not None else None
+        )
+        points = None
+        if line is not None:
+            position, stats = line
+            points = score_player(position, stats, self.rules)
+            print(f"{player} already scored for week {self.week}: {points}")
+            if self._ask_yes_no("re_enter", "Re-enter their stats? y/n: "):
+                return player, None
+            print()
+        return player, points
+
+    def _ask(self, key: str, prompt: str, parse):
+        """
+        Helper method to ask one question, taking the next journaled answer instead while the journal is replayed.
+        Answers that do not parse are asked again, and every accepted answer is journaled before it is used.
+
+        Args:
+            key (str): what is being asked, journaled with the answer
+            prompt (str): prompt shown to the user
+            parse: callable turning the typed answer into its value, raising ValueError on a bad answer
+
+        Returns:
+            the parsed answer
+        """
+        entry = self.journal.next(key) if self.journal is not None else None
+        if entry is not None:
+            print(f"{prompt}{entry['answer']}")
+            return parse(entry["answer"])
+        while True:
+            answer = input(prompt).strip()
+            try:
+                value = parse(answer)
+            except ValueError as e:
+                print(f"Input {answer!r} not recognized ({e}). Please try again")
+                continue
+            if self.journal is not None:
+                self.journal.record(key, answer)
+            return value
+
+    def _ask_int(self, key: str, prompt: str) -> int:
+        """
+        Helper method to ask for a stat, a whole number that is not negative
+
+        Args:
+            key (str): stat field
+            prompt (str): prompt shown to the user
+
+        Returns:
+            int: the answer
+        """
+
+        def parse(answer: str) -> int:
+            if not answer.isdigit():
+                raise ValueError("whole numbers of 0 or more accepted")
+            return int(answer)
+
+        return self._ask(key, prompt, parse)
+
+    def _ask_yes_no(self, key: str, prompt: str) -> bool:
+        """
+        Helper method to ask a y/n question
+
+        Args:
+            key (str): what is being asked
+            prompt (str): prompt shown to the user
+
+        Returns:
+            bool: True for yes
+        """
+
+        def parse(answer: str) -> bool:
+            if answer.lower() not in YES_NO:
+                raise ValueError("y/n accepted")
+            return YES_NO[answer.lower()]
+
+        return self._ask(key, prompt, parse)
+
+    def _ask_choice(self, key: str, prompt: str, choices: tuple) -> str:
+        """
+        Helper method to ask for one of a set of options
+
+        Args:
+            key (str): what is being asked
+            prompt (str): prompt shown to the user
+            choices (tuple): accepted answers, lower case
+
+        Returns:
+            str: the chosen option
+        """
+
+        def parse(answer: str) -> str:
+            if answer.lower() not in choices:
+                raise ValueError(f"{', '.join(choices)} accepted")
+            return answer.lower()
+
+        return self._ask(key, prompt, parse)
+
+    def _journaled(self, key: str) -> bool:
+        """
+        Helper method to check whether the journal answers a question next, so a session recorded with the cache
+        asks it again when replayed without one
+
+        Args:
+            key (str): what would be asked
+
+        Returns:
+            bool: True if the next journaled answer is for that question
+        """
+        return self.journal is not None and self.journal.upcoming(key)
+
+    def _decide(self, key: str, decide):
+        """
+        Helper method to journal a decision the scorer makes itself, replaying the journaled one when there is one
+
+        Args:
+            key (str): what is being decided
+            decide: callable returning the decision when it is not journaled
+
+        Returns:
+            the decision
+        """
+        entry = self.journal.next(key) if self.journal is not None else None
+        if entry is not None:
+            return entry["answer"]
+        value = decide()
+        if self.journal is not None:
+            self.journal.record(key, value)
+        return value
+
+    def _store(self, player: str, position: str, stats: dict, points: int):
+        """
+        Helper method to save a newly scored player in the cache
+
+        Args:
+            player (str): player name, "" for an unnamed player that is not stored
+            position (str): qb, rb, wr, te, k, def or hc
+            stats (dict): stats entered for the player
+            points (int): player's points
+        """
+        if self.cache is not None and player and self.cache.lookup(player, self.week, stats) is None:
+            # a stat line that hashes differently from the stored one replaces it
+            self.cache.store(player, self.week, position, stats, points)
+
     def _quarterback(self) -> int:
         """
         Helper method to score a quarterback
@@ -21,23 +218,21 @@ class Scorer:
             int: QB's total points for the week
         """
         print("Scoring quarterback")
-        points = 0
-        pyards = input("Passing Yards: ")
-        points += math.floor(int(pyards) / 25)
-        rush_yards = int(input("Rushing Yards: "))
-        points += math.floor(rush_yards / 10)
-        points += 6 * int(input("Total TDs: "))
-        turnovers = 2 * int(input("Total turnovers: "))
-        points -= turnovers
-        if turnovers > 0:
-            pick_fumble_six = int(input("Total turnovers returned for TDs: "))
-            points -= 4 * pick_fumble_six
-        go_further = str(input("Did your QB score another way? y/n: "))
-        if go_further == "y":
-            two_pt = int(input("Total two point conversions: "))
-            points += two_pt * 2
-            rec_yds = int(input("Receiving Yards: "))
-            points += math.floor(rec_yds / 10)
+        player, points = self._player()
+        if points is not None:
+            return points
+        stats = {}
+        stats["pass_yards"] = self._ask_int("pass_yards", "Passing Yards: ")
+        stats["rush_yards"] = self._ask_int("rush_yards", "Rushing Yards: ")
+        stats["tds"] = self._ask_int("tds", "Total TDs: ")
+        stats["turnovers"] = self._ask_int("turnovers", "Total turnovers: ")
+        if stats["turnovers"] > 0:
+            stats["turnover_tds"] = self._ask_int("turnover_tds", "Total turnovers returned for TDs: ")
+        if self._ask_yes_no("go_further", "Did your QB score another way? y/n: "):
+            stats["two_pt"] = self._ask_int("two_pt", "Total two point conversions: ")
+            stats["rec_yards"] = self._ask_int("rec_yards", "Receiving Yards: ")
+        points = score_offense(stats, self.rules)
+        self._store(player, "qb", stats, points)
         print(f"QB Score: {points}")
         print()
         return points
@@ -50,29 +245,21 @@ class Scorer:
             int: RB's total points for the week
         """
         print("Scoring running back")
-        points = 0
-        rush_yards = input("Rushing Yards: ")
-        if str.lower(rush_yards) == "scored":
-            points = int(input("Points: "))
+        player, points = self._player()
+        if points is not None:
             return points
-        points += math.floor(int(rush_yards) / 10)
-        rec_yds = int(input("Receiving Yards: "))
-        points += math.floor(rec_yds / 10)
-        points += 6 * int(input("Total TDs: "))
-        turnovers = 2 * int(input("Total turnovers: "))
-        points -= turnovers
-        if turnovers > 0:
-            pick_fumble_six = int(input("Total turnovers returned for TDs: "))
-            points -= 4 * pick_fumble_six
-        go_further = str.lower(input("Did your RB score another way? y/n: "))
-        if go_further == "y":
-            pyards = int(input("Passing Yards: "))
-            points += math.floor(pyards / 25)
-            two_pt = int(input("Total two point conversions: "))
-            points += two_pt * 2
-        elif go_further != "n":
-            print(f"Input {go_further} not recognized (y/n accepted). Please try again")
-            points = self._runningback()
+        stats = {}
+        stats["rush_yards"] = self._ask_int("rush_yards", "Rushing Yards: ")
+        stats["rec_yards"] = self._ask_int("rec_yards", "Receiving Yards: ")
+        stats["tds"] = self._ask_int("tds", "Total TDs: ")
+        stats["turnovers"] = self._ask_int("turnovers", "Total turnovers: ")
+        if stats["turnovers"] > 0:
+            stats["turnover_tds"] = self._ask_int("turnover_tds", "Total turnovers returned for TDs: ")
+        if self._ask_yes_no("go_further", "Did your RB score another way? y/n: "):
+            stats["pass_yards"] = self._ask_int("pass_yards", "Passing Yards: ")
+            stats["two_pt"] = self._ask_int("two_pt", "Total two point conversions: ")
+        points = score_offense(stats, self.rules)
+        self._store(player, "rb", stats, points)
         print(f"RB Score: {points}")
         print()
         return points
@@ -88,29 +275,21 @@ class Scorer:
             int: WR/TE's points for the week
         """
         print(f"Scoring {str.upper(player_type)}")
-        points = 0
-        rec_yds = input("Receiving Yards: ")
-        if str.lower(rec_yds) == "scored":
-            points = int(input("Points: "))
+        player, points = self._player()
+        if points is not None:
             return points
-        points += math.floor(int(rec_yds) / 10)
-        points += 6 * int(input("Total TDs: "))
-        turnovers = 2 * int(input("Total turnovers: "))
-        points -= turnovers
-        if turnovers > 0:
-            pick_fumble_six = int(input("Total turnovers returned for TDs: "))
-            points -= 4 * pick_fumble_six
-        go_further = str.lower(input(f"Did your {str.upper(player_type)} score another way? y/n: "))
-        if go_further == "y":
-            rush_yards = int(input("Rushing Yards: "))
-            points = math.floor(rush_yards / 10)
-            pyards = int(input("Passing Yards: "))
-            points += math.floor(pyards / 25)
-            two_pt = int(input("Total two point conversions: "))
-            points += two_pt * 2
-        elif go_further != "n":
-            print(f"Input {go_further} not recognized (y/n accepted). Please try again")
-            points = self._runningback()
+        stats = {}
+        stats["rec_yards"] = self._ask_int("rec_yards", "Receiving Yards: ")
+        stats["tds"] = self._ask_int("tds", "Total TDs: ")
+        stats["turnovers"] = self._ask_int("turnovers", "Total turnovers: ")
+        if stats["turnovers"] > 0:
+            stats["turnover_tds"] = self._ask_int("turnover_tds", "Total turnovers returned for TDs: ")
+        if self._ask_yes_no("go_further", f"Did your {str.upper(player_type)} score another way? y/n: "):
+            stats["rush_yards"] = self._ask_int("rush_yards", "Rushing Yards: ")
+            stats["pass_yards"] = self._ask_int("pass_yards", "Passing Yards: ")
+            stats["two_pt"] = self._ask_int("two_pt", "Total two point conversions: ")
+        points = score_offense(stats, self.rules)
+        self._store(player, player_type, stats, points)
         print(f"{str.upper(player_type)} Score: {points}")
         print()
         return points
@@ -123,21 +302,18 @@ class Scorer:
             int: K's total points for the week
         """
         print("Scoring kicker")
-        points = 0
-        first = input("PATs made: ")
-        if str.lower(first) == "scored":
-            points = int(input("Points: "))
+        player, points = self._player()
+        if points is not None:
             return points
-        else:
-            points += int(first)
-        points -= 2 * int(input("PATs missed: "))
-        points += int(input("FGs 1-29 yards: "))
-        points += 2 * int(input("FGs 30-49 yards: "))
-        points += 3 * int(input("FGs 40-49 yards: "))
-        points += 4 * int(input("FGs 50-59 yards: "))
-        points += 5 * int(input("FGs 60-69 yards: "))
-        points += 6 * int(input("FGs 70+ yards: "))
-        points -= 1 * int(input("Field Goals missed: "))
+        stats = {}
+        stats["pat_made"] = self._ask_int("pat_made", "PATs made: ")
+        stats["pat_missed"] = self._ask_int("pat_missed", "PATs missed: ")
+        # one prompt per field goal distance bucket in the rules
+        for field, label, _ in self.rules.field_goals:
+            stats[field] = self._ask_int(field, f"{label}: ")
+        stats["fg_missed"] = self._ask_int("fg_missed", "Field Goals missed: ")
+        points = score_kicker(stats, self.rules)
+        self._store(player, "k", stats, points)
         print(f"K Score: {points}")
         print()
         return points
@@ -150,33 +326,19 @@ class Scorer:
             int: D/ST's total points for the week
         """
         print("Scoring D/ST")
-        points = 0
-        points_allowed = input("Points Allowed: ")
-        if str.lower(points_allowed) == "scored":
-            points = int(input("Points: "))
+        player, points = self._player()
+        if points is not None:
             return points
-        else:
-            points_allowed = int(points_allowed)
-        if points_allowed == 0:
-            points += 8
-        elif points_allowed <= 9:
-            points += 6
-        elif points_allowed <= 13:
-            points += 4
-        elif points_allowed <= 17:
-            points += 2
-        elif points_allowed <= 31:
-            points += -2
-        elif points_allowed <= 35:
-            points += -4
-        else:
-            points += -6
-        points += 2 * int(input("Turnovers: "))
-        points += int(input("Sacks: "))
-        points += 2 * int(input("Safeties: "))
-        points += 2 * int(input("Blocked punt or FGs: "))
-        points += int(input("Blocked PATs: "))
-        points += 4 * int(input("Defensive TDs: "))
+        stats = {}
+        stats["points_allowed"] = self._ask_int("points_allowed", "Points Allowed: ")
+        stats["turnovers"] = self._ask_int("turnovers", "Turnovers: ")
+        stats["sacks"] = self._ask_int("sacks", "Sacks: ")
+        stats["safeties"] = self._ask_int("safeties", "Safeties: ")
+        stats["blocked_kicks"] = self._ask_int("blocked_kicks", "Blocked punt or FGs: ")
+        stats["blocked_pats"] = self._ask_int("blocked_pats", "Blocked PATs: ")
+        stats["def_tds"] = self._ask_int("def_tds", "Defensive TDs: ")
+        points = score_defense(stats, self.rules)
+        self._store(player, "def", stats, points)
         print(f"D/ST Score: {points}")
         print()
         return points
@@ -189,28 +351,17 @@ class Scorer:
             int: HC's total points for the week
         """
         print("Scoring head coach")
-        points = 0
-        win = str.lower(input("Coach Win? y/n: "))
-        if str.lower(win) == "scored":
-            points = int(input("Points: "))
+        player, points = self._player()
+        if points is not None:
             return points
-        win_bool = True if win == "y" else False
-        if win_bool:
-            win_margin = int(input("Margin of Victory: "))
-            if win_margin < 10:
-                points += 2
-            elif win_margin <= 19:
-                points += 3
-            else:
-                points += 4
+        stats = {}
+        stats["win"] = self._ask_yes_no("win", "Coach Win? y/n: ")
+        if stats["win"]:
+            stats["margin"] = self._ask_int("margin", "Margin of Victory: ")
         else:
-            loss_margin = int(input("Margin of Defeat: "))
-            if loss_margin < 10:
-                points -= 1
-            elif loss_margin <= 20:
-                points -= 2
-            else:
-                points -= 3
+            stats["margin"] = self._ask_int("margin", "Margin of Defeat: ")
+        points = score_head_coach(stats, self.rules)
+        self._store(player, "hc", stats, points)
         print(f"HC Score: {points}")
         print()
         return points
@@ -242,12 +393,14 @@ class Scorer:
             tuple: (team score, opponent score), each defaults to 0 if mode not activated
         """
         print("QPFL Scorer Modes: (p) player, (t) team, (m) matchup")
-        self.mode = str.lower(input("Choose mode (p, t, m): "))
+        self.mode = self._ask_choice("mode", "Choose mode (p, t, m): ", MODES)
+        if (self.cache is not None or self._journaled("week")) and self.week is None:
+            self.week = self._ask_int("week", "Week: ")
         if self.mode == "p":
-            player_count = int(input("How many players would you like to score: "))
+            player_count = self._ask_int("player_count", "How many players would you like to score: ")
             for i in range(player_count):
                 print("Player Types: qb, rb, wr, te, k, def, hc")
-                player_type = str.lower(input("Player Type: "))
+                player_type = self._ask_choice("player_type", "Player Type: ", PLAYER_TYPES)
                 if player_type == "qb":
                     score = self._quarterback()
                 elif player_type == "rb":
@@ -269,9 +422,50 @@ class Scorer:
         else:
             self.team_score = self._team_controller()
             print(f"Team Score: {self.team_score}")
+        if self.journal is not None and not self.journal.finished:
+            self.journal.record("done", [self.team_score, self.opponent_score], rules=self.rules.fingerprint)
         return (self.team_score, self.opponent_score)
 
 
 if __name__ == "__main__":
-    scorer = Scorer()
-    scorer.controller()
+    parser = argparse.ArgumentParser(description="Score QPFL players, teams or matchups interactively")
+    parser.add_argument("--week", type=int, default=None, help="week being scored, asked for when omitted")
+    parser.add_argument("--cache", default="scores.db", help="SQLite score cache shared across runs")
+    parser.add_argument("--no-cache", action="store_true", help="score without looking up or storing players")
+    parser.add_argument("--rules", default=None, help="scoring rules JSON, defaults to scoring_rules.json")
+    parser.add_argument(
+        "--journal", default="scoring_session.jsonl", help="session journal, an unfinished one is resumed"
+    )
+    parser.add_argument("--no-journal", action="store_true", help="score without journaling answers")
+    parser.add_argument("--replay", default=None, help="re-score a journaled session without prompting")
+    args = parser.parse_args()
+    rules = load_rules(args.rules) if args.rules else DEFAULT_RULES
+    if args.replay:
+        try:
+            journal = ScoringJournal(args.replay, replay_only=True)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        if journal.header.get("rules") != rules.fingerprint:
+            print(f"Re-scoring {args.replay} under different rules than it was recorded with")
+        if not journal.finished:
+            print(f"{args.replay} is unfinished, remaining answers are asked but not journaled (resume with --journal)")
+    elif args.no_journal:
+        journal = None
+    else:
+        archived = archive_finished(args.journal)
+        if archived:
+            print(f"Previous journal at {args.journal} moved to {archived}")
+        journal = ScoringJournal(args.journal, rules.fingerprint)
+        if journal.replaying:
+            print(f"Resuming the session in {args.journal} after {len(journal.entries)} journaled answers")
+    scorer = Scorer(rules, cache_path=None if args.no_cache else args.cache, week=args.week, journal=journal)
+    try:
+        scorer.controller()
+    except (KeyboardInterrupt, EOFError):
+        print()
+        if journal is not None and not args.replay:
+            print(f"Session interrupted, run again with --journal {args.journal} to resume")
+        raise SystemExit(1)
+    finally:
+        if journal is not None:
+            journal.close()
@@ -0,0 +1,268 @@
+"""
+QPFL Playoff Odds
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import time
+
+import numpy as np
+
+from bulk_scorer import read_stat_lines
+from schedule_model import load_season
+
+
+def load_team_scores(path: str) -> list:
+    """
+    Reads weekly team scores from a CSV, JSON or JSONL file with week, team and score columns
+
+    Args:
+        path (str): team score file
+
+    Returns:
+        list: (week, team, score) tuples
+    """
+    return [(int(line["week"]), line["team"], float(line["score"])) for line in read_stat_lines(path)]
+
+
+def team_scores_from_results(results: list) -> list:
+    """
+    Collects weekly team scores from weekly_results.score_week outputs
+
+    Args:
+        results (list): score_week dicts, one per played week
+
+    Returns:
+        list: (week, team, score) tuples
+    """
+    team_scores = []
+    for week_results in results:
+        for matchup in week_results["matchups"]:
+            team_scores.append((week_results["week"], matchup["team"], float(matchup["score"])))
+            team_scores.append((week_results["week"], matchup["opponent"], float(matchup["opponent_score"])))
+    return team_scores
+
+
+def season_state(season, team_scores: list) -> dict:
+    """
+    Replays the played weeks of a season. A week counts as played once every matchup in it has both scores, and
+    every week after the last played week is left to simulate. A tie is half a win for each team.
+
+    Args:
+        season (Season): full season schedule
+        team_scores (list): (week, team, score) tuples
+
+    Returns:
+        dict: played weeks, wins and points for arrays in season.teams order, and the remaining weeks as
+            (home index array, away index array) pairs
+    """
+    index = {team: number for number, team in enumerate(season.teams)}
+    scores = {(week, team): score for week, team, score in team_scores}
+    wins = np.zeros(len(season.teams))
+    points_for = np.zeros(len(season.teams))
+    played = 0
+    for week, week_matchups in enumerate(season.weeks, start=1):
+        if not all((week, team) in scores for matchup in week_matchups for team in matchup):
+            break
+        played = week
+        for team, opponent in week_matchups:
+            score, opponent_score = scores[(week, team)], scores[(week, opponent)]
+            points_for[index[team]] += score
+            points_for[index[opponent]] += opponent_score
+            wins[index[team]] += 1.0 if score > opponent_score else 0.5 if score == opponent_score else 0.0
+            wins[index[opponent]] += 1.0 if opponent_score > score else 0.5 if score == opponent_score else 0.0
+    remaining = [
+        (
+            np.array([index[team] for team, _ in week_matchups]),
+            np.array([index[opponent] for _, opponent in week_matchups]),
+        )
+        for week_matchups in season.weeks[played:]
+    ]
+    return {"played_weeks": played, "wins": wins, "points_for": points_for, "remaining": remaining}
+
+
+def score_distributions(teams: list, team_scores: list, prior_games: float = 3.0) -> tuple:
+    """
+    Estimates each team's weekly score distribution as a normal. A team's mean is its average shrunk toward the
+    league average by prior_games phantom league-average weeks, and every team uses the league's spread, which is
+    far steadier than any one team's handful of weeks.
+
+    Args:
+        teams (list): team names
+        team_scores (list): (week, team, score) tuples
+        prior_games (float): weight of the league average in each team's mean, in weeks
+
+    Returns:
+        tuple: (means, standard deviations) arrays in teams order
+    """
+    if not team_scores:
+        # nothing played yet: every matchup is a coin flip
+        return np.zeros(len(teams)), np.ones(len(teams))
+    all_scores = np.array([score for _, _, score in team_scores])
+    league_mean = all_scores.mean()
+    league_std = all_scores.std() if len(all_scores) > 1 and all_scores.std() > 0 else 1.0
+    means = np.empty(len(teams))
+    for number, team in enumerate(teams):
+        own = [score for _, scored_team, score in team_scores if scored_team == team]
+        means[number] = (sum(own) + prior_games * league_mean) / (len(own) + prior_games)
+    return means, np.full(len(teams), league_std)
+
+
+def _simulate_chunk(task: tuple) -> tuple:
+    """
+    Plays out the remaining weeks for a block of simulated seasons inside a worker process. Each simulation ranks
+    teams by wins, then points for.
+
+    Args:
+        task (tuple): (simulations, seed sequence, wins, points for, remaining weeks, means, stds)
+
+    Returns:
+        tuple: (seed counts as a teams x seeds array, total wins per team)
+    """
+    simulations, seed_sequence, wins, points_for, remaining, means, stds = task
+    rng = np.random.default_rng(seed_sequence)
+    team_count = len(wins)
+    # teams x simulations, so each team's row is contiguous when matchups gather home and away rows
+    wins = np.repeat(wins[:, None], simulations, axis=1)
+    points_for = np.repeat(points_for[:, None], simulations, axis=1)
+    means, stds = means[:, None], stds[:, None]
+    for home, away in remaining:
+        scores = rng.standard_normal((team_count, simulations), dtype=np.float32)
+        scores *= stds
+        scores += means
+        points_for += scores
+        margin = scores[home] - scores[away]
+        result = (margin > 0) + 0.5 * (margin == 0)
+        wins[home] += result
+        wins[away] += 1.0 - result
+    # wins move in half steps, so scaling them past any possible points for total sorts by wins then points for
+    order = np.argsort(-(wins * 1e9 + points_for), axis=0, kind="stable")
+    seed_counts = np.stack([np.bincount(order[seed], minlength=team_count) for seed in range(team_count)], axis=1)
+    return seed_counts, wins.sum(axis=1)
+
+
+def playoff_odds(
+    season,
+    team_scores: list,
+    simulations: int = 1000000,
+    playoff_teams: int = 6,
+    byes: int = 2,
+    workers: int = None,
+    seed: int = None,
+    chunk_size: int = 100000,
+    prior_games: float = 3.0,
+) -> dict:
+    """
+    Simulates the rest of the season many times and counts where every team finishes. Each block of chunk_size
+    simulations is vectorized with NumPy and the blocks are spread across a process pool.
+
+    Args:
+        season (Season): full season schedule
+        team_scores (list): (week, team, score) tuples of the played weeks
+        simulations (int): number of simulated seasons
+        playoff_teams (int): number of seeds that make the playoffs
+        byes (int): number of top seeds with a first round bye
+        workers (int): worker processes, 1 simulates in this process, defaults to the number of cores
+        seed (int): random seed, the same seed gives the same odds for any number of workers
+        chunk_size (int): simulations per block
+        prior_games (float): weight of the league average in each team's mean score, in weeks
+
+    Returns:
+        dict: played weeks, simulations, seconds, and per team the playoff, bye and seed probabilities and
+            mean final wins
+    """
+    start = time.perf_counter()
+    state = season_state(season, team_scores)
+    means, stds = score_distributions(season.teams, team_scores, prior_games)
+    chunks = [min(chunk_size, simulations - first) for first in range(0, simulations, chunk_size)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [
+        (chunk, seed_sequence, state["wins"], state["points_for"], state["remaining"], means, stds)
+        for chunk, seed_sequence in zip(chunks, seed_sequences)
+    ]
+    team_count = len(season.teams)
+    seed_counts = np.zeros((team_count, team_count), dtype=np.int64)
+    total_wins = np.zeros(team_count)
+    if workers == 1 or len(tasks) <= 1:
+        for counts, wins in map(_simulate_chunk, tasks):
+            seed_counts += counts
+            total_wins += wins
+    else:
+        with multiprocessing.Pool(processes=min(workers or multiprocessing.cpu_count(), len(tasks))) as pool:
+            for counts, wins in pool.imap_unordered(_simulate_chunk, tasks):
+                seed_counts += counts
+                total_wins += wins
+    probabilities = seed_counts / max(simulations, 1)
+    teams = {}
+    for number, team in enumerate(season.teams):
+        teams[team] = {
+            "playoffs": float(probabilities[number, :playoff_teams].sum()),
+            "bye": float(probabilities[number, :byes].sum()),
+            "seeds": [float(probability) for probability in probabilities[number, :playoff_teams]],
+            "mean_wins": float(total_wins[number] / max(simulations, 1)),
+            "mean_score": float(means[number]),
+        }
+    return {
+        "played_weeks": state["played_weeks"],
+        "simulations": simulations,
+        "playoff_teams": playoff_teams,
+        "byes": byes,
+        "seconds": round(time.perf_counter() - start, 3),
+        "teams": teams,
+    }
+
+
+def format_odds(odds: dict) -> str:
+    """
+    Renders playoff odds as a table, best playoff odds first
+
+    Args:
+        odds (dict): output of playoff_odds
+
+    Returns:
+        str: odds table
+    """
+    seeds = "".join(f"{'Seed ' + str(seed):>9}" for seed in range(1, odds["playoff_teams"] + 1))
+    lines = [
+        f"Playoff odds after week {odds['played_weeks']} ({odds['simulations']:,} simulations)",
+        f"{'Team':<14}{'Wins':>6}{'Playoffs':>10}{'Bye':>8}{seeds}",
+    ]
+    ranked = sorted(odds["teams"].items(), key=lambda item: (-item[1]["playoffs"], -item[1]["mean_wins"]))
+    for team, team_odds in ranked:
+        line = f"{team:<14}{team_odds['mean_wins']:>6.1f}{team_odds['playoffs']:>10.1%}{team_odds['bye']:>8.1%}"
+        lines.append(line + "".join(f"{probability:>9.1%}" for probability in team_odds["seeds"]))
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate the rest of the QPFL season for playoff odds")
+    parser.add_argument("--schedule", default="schedule/schedule.json", help="saved full season schedule")
+    parser.add_argument("--scores", default=None, help="CSV, JSON or JSONL team scores with week, team, score")
+    parser.add_argument("--results", nargs="*", default=[], help="weekly_results.py --out JSON files")
+    parser.add_argument("--simulations", type=int, default=1000000, help="number of simulated seasons")
+    parser.add_argument("--playoff-teams", type=int, default=6, help="seeds that make the playoffs")
+    parser.add_argument("--byes", type=int, default=2, help="top seeds with a first round bye")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, 1 simulates in this process")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--out", default=None, help="write the odds as JSON here")
+    args = parser.parse_args()
+    scores = load_team_scores(args.scores) if args.scores else []
+    for path in args.results:
+        with open(path, "r") as f:
+            scores += team_scores_from_results([json.load(f)])
+    season_odds = playoff_odds(
+        load_season(args.schedule),
+        scores,
+        simulations=args.simulations,
+        playoff_teams=args.playoff_teams,
+        byes=args.byes,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(format_odds(season_odds), end="")
+    logging.getLogger("scorer_logs").warning(f"Simulated in {season_odds['seconds']}s")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(season_odds, f, indent=2)
@@ -0,0 +1,100 @@
+"""
+QPFL League Rosters
+"""
+
+import argparse
+import json
+import random
+
+# lineup slots scored for every team each week, the same order the interactive scorer uses
+LINEUP_SLOTS = ("qb", "rb", "rb", "wr", "wr", "te", "k", "def", "hc")
+
+# NFL teams, the pool of D/ST and head coach players that several QPFL teams may share
+NFL_TEAMS = tuple(
+    "ARI ATL BAL BUF CAR CHI CIN CLE DAL DEN DET GB HOU IND JAX KC "
+    "LAC LAR LV MIA MIN NE NO NYG NYJ PHI PIT SEA SF TB TEN WAS".split()
+)
+
+
+def load_rosters(path: str) -> dict:
+    """
+    Reads league rosters from a JSON file shaped {team: [{"player": name, "position": pos}, ...]}. A player is
+    identified by name, and the same name may appear on several teams (an NFL D/ST or head coach).
+
+    Args:
+        path (str): rosters JSON file
+
+    Returns:
+        dict: list of (player, position) tuples keyed by team
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    rosters = {}
+    for team, players in data.items():
+        rosters[team] = [(entry["player"], entry["position"].strip().lower()) for entry in players]
+    return rosters
+
+
+def check_lineup(team: str, roster: list):
+    """
+    Checks that a roster fills LINEUP_SLOTS exactly
+
+    Args:
+        team (str): team name for the error message
+        roster (list): (player, position) tuples
+    """
+    positions = sorted(position for _, position in roster)
+    if positions != sorted(LINEUP_SLOTS):
+        raise ValueError(f"{team} lineup has {', '.join(positions)}, expected {', '.join(LINEUP_SLOTS)}")
+
+
+def random_rosters(teams: list, seed: int = None) -> dict:
+    """
+    Builds made-up rosters for testing: unique offensive players and kickers per team, D/STs and head coaches
+    drawn from the NFL teams so some are shared between QPFL teams
+
+    Args:
+        teams (list): QPFL team names
+        seed (int): random seed
+
+    Returns:
+        dict: list of (player, position) tuples keyed by team
+    """
+    rng = random.Random(seed)
+    rosters = {}
+    for team_number, team in enumerate(teams, start=1):
+        roster = []
+        for slot, position in enumerate(LINEUP_SLOTS, start=1):
+            if position in ("def", "hc"):
+                roster.append((f"{rng.choice(NFL_TEAMS)} {position.upper()}", position))
+            else:
+                roster.append((f"{position.upper()}{team_number}-{slot}", position))
+        rosters[team] = roster
+    return rosters
+
+
+def rosters_to_dict(rosters: dict) -> dict:
+    """
+    Converts rosters to the JSON shape read by load_rosters
+
+    Args:
+        rosters (dict): list of (player, position) tuples keyed by team
+
+    Returns:
+        dict: JSON-ready rosters
+    """
+    return {
+        team: [{"player": player, "position": position} for player, position in roster]
+        for team, roster in rosters.items()
+    }
+
+
+if __name__ == "__main__":
+    from schedule_generator import ScheduleGenerator
+
+    parser = argparse.ArgumentParser(description="Write made-up QPFL rosters for testing")
+    parser.add_argument("--out", default="rosters.json", help="output JSON file")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    args = parser.parse_args()
+    with open(args.out, "w") as f:
+        json.dump(rosters_to_dict(random_rosters(ScheduleGenerator().teams, args.seed)), f, indent=2)
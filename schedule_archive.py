@@ -0,0 +1,215 @@
+"""
+QPFL Past Schedule Archive
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+
+from schedule_model import _write_atomic, load_season
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "past_schedules")
+SEASON_FILE = re.compile(r"^(\d{4})_.*\.(txt|json|csv)$")
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "qpfl_tools")
+
+
+class ScheduleArchive:
+    """
+    Every archived season parsed once into flat game records and indexed by pair and by team and week, so
+    head-to-head questions are dictionary lookups. The parsed records are cached outside the source tree and the
+    text files are only parsed again when one of them is added, removed or changed.
+    """
+
+    def __init__(self, directory: str = ARCHIVE_DIR, cache_path: str = None):
+        """
+        Initializer for the ScheduleArchive class
+
+        Args:
+            directory (str): directory of season files named like 2024_team_schedules.txt, one per year in any
+                format load_season reads
+            cache_path (str): parsed record cache, defaults to a file in CACHE_DIR named after the directory, ""
+                disables it
+        """
+        self.logger = logging.getLogger(name="schedule_logger")
+        self.directory = directory
+        if cache_path is None:
+            # one cache per archive directory, kept out of the directory so the repository stays clean
+            digest = hashlib.blake2b(os.path.abspath(directory).encode("utf-8"), digest_size=8).hexdigest()
+            cache_path = os.path.join(CACHE_DIR, f"archive_index_{digest}.json")
+        self.cache_path = cache_path
+        self.rebuilt = False
+        # (year, week, home, away) tuples, one per game
+        self.games = []
+        self.rivalry_weeks = {}
+        self._load()
+        self.years = sorted({year for year, _, _, _ in self.games} | set(self.rivalry_weeks))
+        self.pair_games = {}
+        self.week_opponents = {}
+        for year, week, home, away in self.games:
+            self.pair_games.setdefault(_pair(home, away), []).append((year, week))
+            self.week_opponents.setdefault((home, week), {})[year] = away
+            self.week_opponents.setdefault((away, week), {})[year] = home
+        self.season_pairs = {}
+        for year, week, home, away in self.games:
+            self.season_pairs.setdefault(year, {}).setdefault(week, set()).add(_pair(home, away))
+
+    def _signature(self) -> dict:
+        """
+        Helper method to fingerprint the season files by size and modification time. Each year must have exactly
+        one file, as a season written in several formats would otherwise be counted once per format.
+
+        Returns:
+            dict: [size, mtime_ns] keyed by file name
+        """
+        signature = {}
+        files_by_year = {}
+        for name in sorted(os.listdir(self.directory)):
+            match = SEASON_FILE.match(name)
+            if match:
+                if match.group(1) in files_by_year:
+                    raise ValueError(
+                        f"{self.directory} holds two files for {match.group(1)} ({files_by_year[match.group(1)]} and "
+                        f"{name}), keep one file per season"
+                    )
+                files_by_year[match.group(1)] = name
+                stat = os.stat(os.path.join(self.directory, name))
+                signature[name] = [stat.st_size, stat.st_mtime_ns]
+        return signature
+
+    def _load(self):
+        """
+        Helper method to read the game records from the cache when the files are unchanged, or parse every
+        season file and rewrite the cache
+        """
+        signature = self._signature()
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, "r") as f:
+                    cached = json.load(f)
+                if cached["files"] == signature:
+                    self.games = [tuple(game) for game in cached["games"]]
+                    self.rivalry_weeks = {int(year): week for year, week in cached["rivalry_weeks"].items()}
+                    return
+            except (ValueError, KeyError) as e:
+                self.logger.warning(f"Ignoring unreadable archive cache {self.cache_path}: {e}")
+        self.rebuilt = True
+        for name in signature:
+            year = int(SEASON_FILE.match(name).group(1))
+            season = load_season(os.path.join(self.directory, name))
+            self.rivalry_weeks[year] = season.rivalry_week
+            for week, week_matchups in enumerate(season.weeks, start=1):
+                self.games += [(year, week, home, away) for home, away in week_matchups]
+        if self.cache_path:
+            cached = {"files": signature, "rivalry_weeks": self.rivalry_weeks, "games": self.games}
+            try:
+                os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+                _write_atomic(self.cache_path, json.dumps(cached, separators=(",", ":")) + "\n")
+            except OSError as e:
+                self.logger.warning(f"Could not write archive cache {self.cache_path}: {e}")
+
+    def meetings(self, home: str, away: str) -> int:
+        """
+        Method to return how many times two teams have met across the archive
+
+        Args:
+            home (str): first team
+            away (str): second team
+
+        Returns:
+            int: number of meetings
+        """
+        return len(self.pair_games.get(_pair(home, away), ()))
+
+    def meeting_history(self, home: str, away: str) -> list:
+        """
+        Method to list every meeting of two teams
+
+        Args:
+            home (str): first team
+            away (str): second team
+
+        Returns:
+            list: (year, week) tuples, oldest first
+        """
+        return sorted(self.pair_games.get(_pair(home, away), ()))
+
+    def rematches(self, home: str, away: str) -> dict:
+        """
+        Method to return the seasons in which two teams met more than once
+
+        Args:
+            home (str): first team
+            away (str): second team
+
+        Returns:
+            dict: meeting weeks keyed by year
+        """
+        by_year = {}
+        for year, week in self.meeting_history(home, away):
+            by_year.setdefault(year, []).append(week)
+        return {year: weeks for year, weeks in by_year.items() if len(weeks) > 1}
+
+    def opponents(self, team: str, week: int) -> dict:
+        """
+        Method to return a team's opponent in one week of every archived season
+
+        Args:
+            team (str): team name
+            week (int): week number
+
+        Returns:
+            dict: opponent keyed by year
+        """
+        return dict(self.week_opponents.get((team, week), {}))
+
+    def week_pairs(self, year: int = None) -> dict:
+        """
+        Method to return one season's pairings by week, as ScheduleGenerator reads them
+
+        Args:
+            year (int): season, defaults to the latest archived season
+
+        Returns:
+            dict: sets of (team, team) tuples in sorted order keyed by week number
+        """
+        if year is None:
+            if not self.years:
+                return {}
+            year = self.years[-1]
+        return {week: set(pairs) for week, pairs in self.season_pairs.get(year, {}).items()}
+
+
+def _pair(home: str, away: str) -> tuple:
+    """
+    Orders a pair of teams so either listing finds the same entry
+
+    Returns:
+        tuple: the two teams in sorted order
+    """
+    return (home, away) if home < away else (away, home)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the archive of past QPFL schedules")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="directory of past season files")
+    parser.add_argument("--teams", nargs=2, default=None, metavar=("TEAM", "OPPONENT"), help="head-to-head history")
+    parser.add_argument("--team", default=None, help="team whose past opponents to list, with --week")
+    parser.add_argument("--week", type=int, default=1, help="week for --team")
+    args = parser.parse_args()
+    archive = ScheduleArchive(args.archive)
+    logging.getLogger("schedule_logger").warning(
+        f"{len(archive.games)} games from seasons {', '.join(map(str, archive.years)) or 'none'}"
+        f"{' (index rebuilt)' if archive.rebuilt else ''}"
+    )
+    if args.teams:
+        home, away = args.teams
+        history = ", ".join(f"{year} week {week}" for year, week in archive.meeting_history(home, away))
+        print(f"{home} and {away} have met {archive.meetings(home, away)} times: {history or 'never'}")
+        for year, weeks in archive.rematches(home, away).items():
+            print(f"Rematch in {year}: weeks {', '.join(map(str, weeks))}")
+    if args.team:
+        for year, opponent in sorted(archive.opponents(args.team, args.week).items()):
+            print(f"{year} week {args.week}: {args.team} versus {opponent}")
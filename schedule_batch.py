@@ -0,0 +1,152 @@
+"""
+QPFL Bulk Schedule Generator
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import random
+import time
+
+from schedule_generator import ScheduleGenerator, reproduce_command
+from schedule_optimizer import ScheduleOptimizer
+from schedule_validator import validate_season
+
+
+def canonical_key(weeks: list) -> str:
+    """
+    Hashes a season in canonical form: each matchup's teams sorted, and each week's matchups sorted, so two
+    seasons with the same pairings in the same weeks hash the same regardless of home/away or listing order
+
+    Args:
+        weeks (list): each week's matchups as (team, opponent) tuples, week 1 first
+
+    Returns:
+        str: hex digest of the canonical season
+    """
+    canonical = "|".join(
+        ";".join(sorted(",".join(sorted(matchup)) for matchup in week_matchups)) for week_matchups in weeks
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _batch_attempt(task: tuple):
+    """
+    Builds and scores one seeded season inside a worker process
+
+    Args:
+        task (tuple): (seed, teams, rivals, solver, optimize_iterations)
+
+    Returns:
+        tuple: (seed, season dict, metrics), or None if the attempt failed or broke a season rule
+    """
+    seed, teams, rivals, solver, optimize_iterations = task
+    SG = ScheduleGenerator(teams=teams, rivals=rivals, seed=seed)
+    if not SG.build_season(solver=solver):
+        return None
+    if optimize_iterations:
+        SG.optimize_schedule(iterations=optimize_iterations)
+    season = SG.season()
+    if validate_season(season, rivals=SG.rivals, round_robin_weeks=SG.round_robin_weeks):
+        return None
+    optimizer = ScheduleOptimizer(SG.teams, SG.schedule, SG.round_robin_weeks, SG.rivalry_week)
+    return seed, season.to_dict(), optimizer.metrics()
+
+
+def generate_batch(
+    count: int,
+    output_path: str,
+    first_seed: int = None,
+    workers: int = None,
+    solver: bool = True,
+    optimize_iterations: int = 0,
+    max_attempts: int = None,
+    teams: list = None,
+    rivals: dict = None,
+) -> dict:
+    """
+    Generates distinct valid seasons and streams each one to a JSONL file as soon as it is found. Only the
+    hashes of written seasons are kept, so memory stays flat regardless of the count.
+
+    Args:
+        count (int): number of distinct seasons to write
+        output_path (str): JSONL file to write, one season per line
+        first_seed (int): seed of the first attempt, attempt i uses first_seed + i
+        workers (int): number of worker processes, defaults to the number of cores
+        solver (bool): use the backtracking solver instead of random trial and error
+        optimize_iterations (int): optimizer moves to run on each season, 0 skips optimization
+        max_attempts (int): stop after this many attempts, defaults to 10 times the count
+        teams (list): team names, defaults to the current QPFL teams
+        rivals (dict): each team's rival keyed by team, defaults to the current QPFL rivalries
+
+    Returns:
+        dict: summary with seasons written, attempts, duplicates, failures, seconds and seasons per second
+    """
+    logger = logging.getLogger("controller_logs")
+    if first_seed is None:
+        first_seed = random.SystemRandom().randrange(2**32)
+    if max_attempts is None:
+        max_attempts = 10 * count
+    seen = set()
+    summary = {"seasons": 0, "attempts": 0, "duplicates": 0, "failures": 0}
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes=workers) as pool, open(output_path, "w") as f:
+        # submit seeds in blocks so the pool never queues more than one block of work
+        block = 256 * (workers or multiprocessing.cpu_count())
+        while summary["seasons"] < count and summary["attempts"] < max_attempts:
+            # attempts are counted as their results come in, a block is only cut short once the batch is complete
+            seeds = range(
+                first_seed + summary["attempts"], first_seed + min(summary["attempts"] + block, max_attempts)
+            )
+            tasks = ((seed, teams, rivals, solver, optimize_iterations) for seed in seeds)
+            for result in pool.imap(_batch_attempt, tasks, chunksize=16):
+                summary["attempts"] += 1
+                if result is None:
+                    summary["failures"] += 1
+                    continue
+                seed, season, metrics = result
+                key = canonical_key(season["weeks"])
+                if key in seen:
+                    summary["duplicates"] += 1
+                    continue
+                seen.add(key)
+                record = {
+                    "seed": seed,
+                    "reproduce": reproduce_command(seed, solver=solver, optimize_iterations=optimize_iterations),
+                    "hash": key,
+                    "metrics": metrics,
+                    **season,
+                }
+                f.write(json.dumps(record) + "\n")
+                summary["seasons"] += 1
+                if summary["seasons"] >= count:
+                    break
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    summary["seasons_per_second"] = round(summary["seasons"] / max(summary["seconds"], 1e-9), 1)
+    logger.warning(
+        f"Wrote {summary['seasons']} distinct seasons to {output_path} in {summary['seconds']}s "
+        f"({summary['seasons_per_second']} seasons/s, {summary['duplicates']} duplicates, "
+        f"{summary['failures']} failed attempts)"
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate many distinct QPFL seasons as JSONL")
+    parser.add_argument("--count", type=int, default=10000, help="number of distinct seasons to write")
+    parser.add_argument("--out", default="seasons.jsonl", help="output JSONL file")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first attempt")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--random", action="store_true", help="use random trial and error instead of the solver")
+    parser.add_argument("--optimize", type=int, default=0, metavar="MOVES", help="optimizer moves per season")
+    args = parser.parse_args()
+    generate_batch(
+        count=args.count,
+        output_path=args.out,
+        first_seed=args.seed,
+        workers=args.workers,
+        solver=not args.random,
+        optimize_iterations=args.optimize,
+    )
@@ -0,0 +1,192 @@
+"""
+QPFL Schedule Generator Benchmarks
+"""
+
+import argparse
+import functools
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from schedule_generator import ScheduleGenerator
+from schedule_matchings import matching_table
+
+
+def league(team_count: int) -> tuple:
+    """
+    Builds a synthetic league with adjacent teams paired as rivals
+
+    Args:
+        team_count (int): number of teams, must be even
+
+    Returns:
+        tuple: (teams, rivals)
+    """
+    teams = [f"Team {number}" for number in range(1, team_count + 1)]
+    rivals = {}
+    for index in range(0, team_count - 1, 2):
+        rivals[teams[index]] = teams[index + 1]
+        rivals[teams[index + 1]] = teams[index]
+    return teams, rivals
+
+
+def _time_to_valid_season(config: dict, seed: int, solver: bool, max_attempts: int) -> dict:
+    """
+    Runs seeded attempts in sequence, the way the command line does, until one produces a valid season
+
+    Args:
+        config (dict): league and season settings passed to ScheduleGenerator
+        seed (int): seed of the first attempt
+        solver (bool): use the backtracking solver
+        max_attempts (int): attempts before giving up
+
+    Returns:
+        dict: seconds spent, attempts used and whether a valid season was found
+    """
+    start = time.perf_counter()
+    for attempt in range(1, max_attempts + 1):
+        SG = ScheduleGenerator(seed=seed * max_attempts + attempt, **config)
+        if SG.build_season(solver=solver):
+            return {"seconds": time.perf_counter() - start, "attempts": attempt, "found": True}
+    return {"seconds": time.perf_counter() - start, "attempts": max_attempts, "found": False}
+
+
+@functools.lru_cache(maxsize=None)
+def _table_memory(team_count: int) -> tuple:
+    """
+    Measures the memory of a league's matching table by building it again under tracemalloc. Tracing slows the
+    build down many times over, so it is measured once per league size.
+
+    Args:
+        team_count (int): number of teams
+
+    Returns:
+        tuple: (bytes held by the built table, peak bytes while building it)
+    """
+    matching_table.cache_clear()
+    tracemalloc.start()
+    try:
+        matching_table(team_count)
+        return tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+
+def _peak_memory(config: dict, seed: int, solver: bool) -> int:
+    """
+    Measures the peak traced memory of one generation attempt, including the league's matching table when the
+    attempt uses it. The table is shared through a cache, so it is measured separately and its held bytes are
+    added to the attempt's own peak.
+
+    Args:
+        config (dict): league and season settings passed to ScheduleGenerator
+        seed (int): seed of the attempt
+        solver (bool): use the backtracking solver
+
+    Returns:
+        int: peak allocated bytes
+    """
+    team_count = len(config["teams"])
+    table_held, table_peak = _table_memory(team_count)
+    lookups = matching_table.cache_info().hits + matching_table.cache_info().misses
+    tracemalloc.start()
+    try:
+        ScheduleGenerator(seed=seed, **config).build_season(solver=solver)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if matching_table.cache_info().hits + matching_table.cache_info().misses > lookups:
+        peak = max(table_peak, table_held + peak)
+    return peak
+
+
+def run_benchmarks(
+    team_counts: list, season_lengths: list, seeds: int, modes: list, max_attempts: int, rivalry: list
+) -> dict:
+    """
+    Benchmarks schedule generation over every combination of league size, season length and rivalry setting
+
+    Args:
+        team_counts (list): league sizes to run
+        season_lengths (list): season lengths in weeks to run
+        seeds (int): number of fixed seeds per combination, seeds 0 to seeds - 1
+        modes (list): "random" and/or "solver"
+        max_attempts (int): attempts per seed before a run counts as failed
+        rivalry (list): True and/or False, whether week 5 is rivalry week
+
+    Returns:
+        dict: benchmark metadata and one result per combination
+    """
+    results = []
+    for team_count in team_counts:
+        teams, rivals = league(team_count)
+        for season_length in season_lengths:
+            for with_rivalry in rivalry:
+                config = {
+                    "teams": teams,
+                    "rivals": rivals,
+                    "season_length": season_length,
+                    "rivalry_week": 5 if with_rivalry else None,
+                }
+                for mode in modes:
+                    solver = mode == "solver"
+                    runs = [_time_to_valid_season(config, seed, solver, max_attempts) for seed in range(seeds)]
+                    found = [run for run in runs if run["found"]]
+                    attempts = sum(run["attempts"] for run in runs)
+                    seconds = [run["seconds"] for run in found]
+                    results.append(
+                        {
+                            "teams": team_count,
+                            "weeks": season_length,
+                            "rivalry_week": with_rivalry,
+                            "mode": mode,
+                            "seeds": seeds,
+                            "valid_seasons": len(found),
+                            "success_rate_per_attempt": round(len(found) / attempts, 4) if attempts else 0.0,
+                            "time_to_valid_mean_s": round(statistics.mean(seconds), 6) if seconds else None,
+                            "time_to_valid_median_s": round(statistics.median(seconds), 6) if seconds else None,
+                            "time_to_valid_max_s": round(max(seconds), 6) if seconds else None,
+                            "peak_memory_bytes": _peak_memory(config, 0, solver),
+                        }
+                    )
+                    logging.getLogger("controller_logs").warning(
+                        f"{team_count} teams, {season_length} weeks, rivalry {with_rivalry}, {mode}: "
+                        f"{len(found)}/{seeds} valid"
+                    )
+    return {
+        "benchmark": "schedule_generation",
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "max_attempts": max_attempts,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark QPFL schedule generation")
+    parser.add_argument("--teams", type=int, nargs="+", default=[10, 12, 14, 16], help="league sizes")
+    parser.add_argument("--weeks", type=int, nargs="+", default=[13, 14, 15, 16, 17], help="season lengths")
+    parser.add_argument("--seeds", type=int, default=20, help="fixed seeds per combination")
+    parser.add_argument("--modes", nargs="+", default=["random", "solver"], choices=["random", "solver"])
+    parser.add_argument("--max-attempts", type=int, default=60, help="attempts per seed before giving up")
+    parser.add_argument("--no-rivalry", action="store_true", help="only run seasons without rivalry week")
+    parser.add_argument("--out", default=None, help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+    report = run_benchmarks(
+        team_counts=args.teams,
+        season_lengths=args.weeks,
+        seeds=args.seeds,
+        modes=args.modes,
+        max_attempts=args.max_attempts,
+        rivalry=[False] if args.no_rivalry else [True, False],
+    )
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,362 @@
+"""
+QPFL Season Counting
+"""
+
+import argparse
+import functools
+import json
+import logging
+import math
+import os
+import random
+import time
+
+from schedule_archive import CACHE_DIR
+from schedule_matchings import matching_table
+from schedule_model import _write_atomic
+
+
+class SeasonCounter:
+    """
+    Counts every valid season of a league exactly and draws seasons uniformly at random from all of them.
+
+    The round robin is a 1-factorization: its weeks split every pair of teams into disjoint weekly pairings, one of
+    them the fixed rivalry week. Counts are taken relative to one fixed pairing (team 2i against team 2i + 1), which
+    every rivalry week or first week can be relabelled onto. Sets of weekly pairings are counted unordered and
+    listed once each, in order of team 0's opponent (every weekly pairing holds exactly one of team 0's games),
+    and the count of every partial set is memoized on the pairs still free, so the weeks can be put in any order
+    afterwards. The rematch weeks only depend on the last round robin week and on each other.
+    """
+
+    def __init__(self, team_count: int = 10, season_length: int = 15, rivalry_week: int = 5):
+        """
+        Initializer for the SeasonCounter class
+
+        Args:
+            team_count (int): number of teams, must be even
+            season_length (int): number of weeks in the season
+            rivalry_week (int): week where every team plays its rival, None for a season without rivalry week
+        """
+        self.table = matching_table(team_count)
+        self.team_count = team_count
+        self.round_robin_weeks = min(team_count - 1, season_length)
+        self.rematch_weeks = season_length - self.round_robin_weeks
+        if rivalry_week is not None and not 1 <= rivalry_week <= self.round_robin_weeks:
+            raise ValueError(f"Rivalry week {rivalry_week} is not a round robin week")
+        self.rivalry_week = rivalry_week
+        self.full = (1 << len(self.table.bit_pairs)) - 1
+        # the fixed weekly pairing every count is taken relative to
+        self.base = self.table.pair_mask((team, team + 1) for team in range(0, team_count, 2))
+        # weekly pairings grouped by team 0's game
+        self.zero_bits = [self.table.pair_bits[(0, opponent)] for opponent in range(1, team_count)]
+        self.by_zero_pair = {bit: [mask for mask in self.table.masks if mask >> bit & 1] for bit in self.zero_bits}
+        self.memo = {}
+        self.rematch_kinds = None
+
+    def load_counts(self, path: str) -> bool:
+        """
+        Method to read memoized counts saved by save_counts. The counts only depend on the number of teams, so any
+        season length and rivalry week can share them.
+
+        Args:
+            path (str): counts file
+
+        Returns:
+            bool: True if counts were read
+        """
+        try:
+            with open(path, "r") as f:
+                saved = json.load(f)
+            if saved["team_count"] != self.team_count:
+                raise ValueError(f"counts are for {saved['team_count']} teams")
+            self.memo.update({(free, after, left): count for free, after, left, count in saved["counts"]})
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.getLogger("schedule_logger").warning(f"Ignoring unreadable season counts {path}: {e}")
+            return False
+
+    def save_counts(self, path: str):
+        """
+        Method to write the memoized counts so later processes skip counting
+
+        Args:
+            path (str): counts file
+        """
+        counts = [[free, after, left, count] for (free, after, left), count in self.memo.items()]
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            _write_atomic(path, json.dumps({"team_count": self.team_count, "counts": counts}, separators=(",", ":")))
+        except OSError as e:
+            logging.getLogger("schedule_logger").warning(f"Could not write season counts {path}: {e}")
+
+    def _children(self, free: int, after: int, left: int):
+        """
+        Helper method to list the next weekly pairing of a partial set: a pairing inside the free pairs whose game
+        for team 0 comes after the last one chosen
+
+        Args:
+            free (int): pairs still free
+            after (int): index in zero_bits of team 0's last game, -1 before the first pairing
+            left (int): pairings still to choose
+
+        Yields:
+            tuple: (index of team 0's game, pairing mask)
+        """
+        for index in range(after + 1, len(self.zero_bits) - left + 1):
+            bit = self.zero_bits[index]
+            if not free >> bit & 1:
+                continue
+            for mask in self.by_zero_pair[bit]:
+                if not mask & ~free:
+                    yield index, mask
+
+    def _count(self, free: int, after: int, left: int) -> int:
+        """
+        Helper method to count the sets of disjoint weekly pairings that complete a partial set
+
+        Args:
+            free (int): pairs still free
+            after (int): index in zero_bits of team 0's last game, -1 before the first pairing
+            left (int): pairings still to choose
+
+        Returns:
+            int: number of unordered completions
+        """
+        if left == 0:
+            return 1
+        key = (free, after, left)
+        if key not in self.memo:
+            self.memo[key] = sum(
+                self._count(free & ~mask, index, left - 1) for index, mask in self._children(free, after, left)
+            )
+        return self.memo[key]
+
+    def round_robin_count(self) -> int:
+        """
+        Method to count the valid round robins, each order of the weeks counted separately
+
+        Returns:
+            int: number of round robins
+        """
+        weeks = self.round_robin_weeks - 1
+        count = math.factorial(weeks) * self._count(self.full & ~self.base, -1, weeks)
+        if self.rivalry_week is None:
+            # without a rivalry week, the fixed pairing stands for any of the league's pairings
+            count *= len(self.table.masks)
+        return count
+
+    def _rematch_kinds(self) -> list:
+        """
+        Helper method to group the possible second rematch weeks by how they combine with the first one, relabelled
+        onto the fixed pairing. How week two combines with week one only depends on the cycle lengths the two
+        pairings form together, so each kind is counted once and weighted by how many pairings share it.
+
+        Returns:
+            list: (number of completions of the remaining weeks over all pairings of the kind, one pairing of the
+                kind), one per kind
+        """
+        if self.rematch_kinds is None:
+            kinds = {}
+            for mask in self.table.legal(self.base):
+                kinds.setdefault(self._cycle_lengths(mask), [0, mask])[0] += 1
+            later = self.rematch_weeks - 2
+            self.rematch_kinds = [
+                (number * self._count(self.full & ~self.base & ~mask, -1, later), mask)
+                for number, mask in kinds.values()
+            ]
+        return self.rematch_kinds
+
+    def rematch_count(self) -> int:
+        """
+        Method to count the ways to fill the weeks after the round robin once the round robin is set. Every pair
+        has already met once, so those weeks are disjoint pairings, the first avoiding the last round robin week.
+
+        Returns:
+            int: number of rematch week sequences, the same for every round robin
+        """
+        weeks = self.rematch_weeks
+        if weeks == 0:
+            return 1
+        # week one after the round robin avoids the last round robin week, relabelled onto the fixed pairing.
+        # Every choice leaves the same number of completions, so it is counted as one of them times their number.
+        first = self.table.legal(self.base)
+        if weeks == 1:
+            return len(first)
+        tail = sum(completions for completions, _ in self._rematch_kinds())
+        return len(first) * tail * math.factorial(weeks - 2)
+
+    def _cycle_lengths(self, mask: int) -> tuple:
+        """
+        Helper method to describe a pairing disjoint from the fixed pairing by the cycles the two form together
+
+        Args:
+            mask (int): weekly pairing with no pair in common with the fixed pairing
+
+        Returns:
+            tuple: number of teams in each cycle, longest first
+        """
+        partner = [0] * self.team_count
+        for home, away in self.table.pairs(mask):
+            partner[home] = away
+            partner[away] = home
+        seen = set()
+        lengths = []
+        for team in range(self.team_count):
+            length = 0
+            while team not in seen:
+                # alternate the fixed pairing's game (team ^ 1) with the other pairing's game
+                seen.update((team, team ^ 1))
+                length += 2
+                team = partner[team ^ 1]
+            if length:
+                lengths.append(length)
+        return tuple(sorted(lengths, reverse=True))
+
+    def total_count(self) -> int:
+        """
+        Method to count every valid season
+
+        Returns:
+            int: number of valid seasons
+        """
+        return self.round_robin_count() * self.rematch_count()
+
+    def _sample_set(self, free: int, left: int, rng: random.Random) -> list:
+        """
+        Helper method to draw one set of disjoint weekly pairings uniformly, choosing each pairing with
+        probability proportional to the number of completions it leaves
+
+        Args:
+            free (int): pairs that may be used
+            left (int): number of pairings in the set
+            rng (random.Random): random source
+
+        Returns:
+            list: pairing masks, in order of team 0's opponent
+        """
+        chosen = []
+        after = -1
+        while left:
+            pick = rng.randrange(self._count(free, after, left))
+            for index, mask in self._children(free, after, left):
+                completions = self._count(free & ~mask, index, left - 1)
+                if pick < completions:
+                    break
+                pick -= completions
+            chosen.append(mask)
+            free &= ~mask
+            after = index
+            left -= 1
+        return chosen
+
+    def _sample_rematches(self, last_week: int, rng: random.Random) -> list:
+        """
+        Helper method to draw the weeks after the round robin uniformly: week one uniformly from the pairings that
+        avoid the last round robin week, week two by the number of completions it leaves, and the rest as one
+        uniformly drawn set of pairings in random order. Week one is relabelled onto the fixed pairing so the
+        memoized counts apply, and a random relabelling that keeps the fixed pairing spreads week two uniformly
+        over its kind.
+
+        Args:
+            last_week (int): pairing mask of the last round robin week
+            rng (random.Random): random source
+
+        Returns:
+            list: pairing masks of the rematch weeks
+        """
+        if self.rematch_weeks == 0:
+            return []
+        first = rng.choice(self.table.legal(last_week))
+        if self.rematch_weeks == 1:
+            return [first]
+        kinds = self._rematch_kinds()
+        pick = rng.randrange(sum(completions for completions, _ in kinds))
+        for completions, second in kinds:
+            if pick < completions:
+                break
+            pick -= completions
+        rest = self._sample_set(self.full & ~self.base & ~second, self.rematch_weeks - 2, rng)
+        rng.shuffle(rest)
+        # relabel: shuffle and flip the fixed pairing's games, then map them onto week one's games
+        games = self.table.pairs(first)
+        rng.shuffle(games)
+        labels = [0] * self.team_count
+        for index, (home, away) in enumerate(games):
+            if rng.random() < 0.5:
+                home, away = away, home
+            labels[2 * index], labels[2 * index + 1] = home, away
+        return [first] + [
+            self.table.pair_mask((labels[home], labels[away]) for home, away in self.table.pairs(mask))
+            for mask in [second] + rest
+        ]
+
+    def sample(self, rng: random.Random) -> list:
+        """
+        Method to draw a season uniformly from every valid season. With a rivalry week, team ids 2i and 2i + 1 are
+        rivals.
+
+        Args:
+            rng (random.Random): random source
+
+        Returns:
+            list: each week's matchups as (team id, team id) tuples, week 1 first
+        """
+        weeks = self._sample_set(self.full & ~self.base, self.round_robin_weeks - 1, rng)
+        rng.shuffle(weeks)
+        if self.rivalry_week is not None:
+            weeks.insert(self.rivalry_week - 1, self.base)
+        else:
+            weeks.insert(rng.randrange(self.round_robin_weeks), self.base)
+        weeks += self._sample_rematches(weeks[-1], rng)
+        season = [self.table.pairs(mask) for mask in weeks]
+        if self.rivalry_week is None:
+            # relabel the teams at random so the fixed pairing can be any pairing
+            labels = list(range(self.team_count))
+            rng.shuffle(labels)
+            season = [[(labels[home], labels[away]) for home, away in week] for week in season]
+        return season
+
+
+@functools.lru_cache(maxsize=None)
+def season_counter(team_count: int, season_length: int, rivalry_week: int) -> SeasonCounter:
+    """
+    Returns the season counter for a league structure, shared so its memoized counts are built once. The counts
+    are also saved in CACHE_DIR per number of teams, so only the first process to count a league pays for it.
+
+    Args:
+        team_count (int): number of teams
+        season_length (int): number of weeks in the season
+        rivalry_week (int): rivalry week, None for a season without one
+
+    Returns:
+        SeasonCounter: the shared counter with every count its draws need
+    """
+    counter = SeasonCounter(team_count, season_length, rivalry_week)
+    path = os.path.join(CACHE_DIR, f"season_counts_{team_count}.json")
+    counter.load_counts(path)
+    known = len(counter.memo)
+    # counting every season visits every count a draw looks up
+    counter.total_count()
+    if len(counter.memo) > known:
+        counter.save_counts(path)
+    return counter
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count every valid QPFL season")
+    parser.add_argument("--teams", type=int, default=10, help="number of teams")
+    parser.add_argument("--weeks", type=int, default=15, help="number of weeks in the season")
+    parser.add_argument("--rivalry-week", type=int, default=5, help="rivalry week, 0 for none")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    counter = SeasonCounter(args.teams, args.weeks, args.rivalry_week or None)
+    round_robins = counter.round_robin_count()
+    rematches = counter.rematch_count()
+    print(f"Round robins (weeks 1-{counter.round_robin_weeks}): {round_robins:,}")
+    print(f"Rematch weeks per round robin: {rematches:,}")
+    print(f"Valid seasons: {round_robins * rematches:,} (about 10^{math.log10(round_robins * rematches):.1f})")
+    logging.getLogger("schedule_logger").warning(
+        f"Counted in {time.perf_counter() - start:.2f}s over {len(counter.memo):,} memoized partial seasons"
+    )
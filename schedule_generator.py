@@ -2,10 +2,30 @@
 QPFL Schedule Generator
 """
 
+import argparse
 import logging
-import os
+import multiprocessing
 import random
-import shutil
+import time
+
+from schedule_archive import ARCHIVE_DIR, ScheduleArchive
+from schedule_counting import season_counter
+from schedule_matchings import MatchingTable, matching_table
+from schedule_model import Season
+from schedule_optimizer import ScheduleOptimizer
+from schedule_validator import format_violations, validate_season
+
+REJECTION_REASONS = (
+    "rival before rivalry week",
+    "previous-week repeat",
+    "max meetings",
+    "last-season repeat",
+)
+# how last season's pairings are treated: ignored, avoided where possible, or ruled out
+LAST_SEASON_MODES = ("allow", "penalize", "forbid")
+# a dead end in the round robin redraws this many weeks before it, up to ROUND_ROBIN_RETRIES times per attempt
+ROUND_ROBIN_TAIL = 2
+ROUND_ROBIN_RETRIES = 15
 
 
 class ScheduleGenerator:
@@ -13,230 +33,121 @@ class ScheduleGenerator:
     QPFL schedule geneation class. Run this class via the controller method.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        teams: list = None,
+        rivals: dict = None,
+        seed: int = None,
+        season_length: int = 15,
+        rivalry_week: int = 5,
+        archive=None,
+        last_season: str = "allow",
+    ):
         """
         Initialization for the class, including a list of teams, rivals, and the schedule.
+
+        Args:
+            teams (list): team names, defaults to the current QPFL teams
+            rivals (dict): each team's rival keyed by team, defaults to the current QPFL rivalries
+            seed (int): seed for this generator's random choices, the same seed reproduces the same season
+            season_length (int): number of weeks in the season
+            rivalry_week (int): week where every team plays its rival, None for a season without rivalry week
+            archive (ScheduleArchive): past schedules, the latest season's pairings feed the last_season rule
+            last_season (str): "allow" ignores last season, "penalize" avoids its pairings in the same weeks
+                where possible and "forbid" rules them out (rivalry week excepted)
         """
         self.logger = logging.getLogger(name="schedule_logger")
         self.logger.info("ScheduleGenerator class initialized")
-        self.teams = [
-            "Griffin",
-            "Ryan",
-            "Kaminska",
-            "Connor",
-            "Stephen",
-            "Tim/Spencer",
-            "Joe/Joe",
-            "Anagh",
-            "Bill",
-            "Arnav",
-        ]
-        self.rivals = {
-            "Griffin": "Ryan",
-            "Ryan": "Griffin",
-            "Connor": "Kaminska",
-            "Kaminska": "Connor",
-            "Bill": "Joe/Joe",
-            "Joe/Joe": "Bill",
-            "Arnav": "Anagh",
-            "Anagh": "Arnav",
-            "Tim/Spencer": "Stephen",
-            "Stephen": "Tim/Spencer",
-        }
+        if teams is None:
+            teams = [
+                "Griffin",
+                "Ryan",
+                "Kaminska",
+                "Connor",
+                "Stephen",
+                "Tim/Spencer",
+                "Joe/Joe",
+                "Anagh",
+                "Bill",
+                "Arnav",
+            ]
+        if rivals is None:
+            rivals = {
+                "Griffin": "Ryan",
+                "Ryan": "Griffin",
+                "Connor": "Kaminska",
+                "Kaminska": "Connor",
+                "Bill": "Joe/Joe",
+                "Joe/Joe": "Bill",
+                "Arnav": "Anagh",
+                "Anagh": "Arnav",
+                "Tim/Spencer": "Stephen",
+                "Stephen": "Tim/Spencer",
+            }
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.teams = list(teams)
+        self.rivals = dict(rivals)
         self.schedule = {}
         self.previous_week = []
-        # counts matchup numbers
-        self.griffin = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.ryan = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.kaminska = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.connor = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.stephen = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.tim_spencer = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.joek = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.anagh = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.bill = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
-        }
-        self.arnav = {
-            "Griffin": 0,
-            "Ryan": 0,
-            "Kaminska": 0,
-            "Connor": 0,
-            "Stephen": 0,
-            "Tim/Spencer": 0,
-            "Joe/Joe": 0,
-            "Anagh": 0,
-            "Bill": 0,
-            "Arnav": 0,
+        # season structure: round robin through week 9 with rivalry week in week 5 for the current league
+        self.season_length = season_length
+        self.rivalry_week = rivalry_week
+        self.round_robin_weeks = min(len(self.teams) - 1, season_length)
+        # counts matchup numbers in a symmetric team x team matrix indexed by team id
+        self.team_ids = {team: team_id for team_id, team in enumerate(self.teams)}
+        self.matchup_counts = bytearray(len(self.teams) * len(self.teams))
+        if last_season not in LAST_SEASON_MODES:
+            raise ValueError(f"last_season must be one of {', '.join(LAST_SEASON_MODES)}, got {last_season!r}")
+        self.last_season = last_season
+        # last season's pairings by week, read once from the archive index, team pairs in sorted order.
+        # Rivalry week always repeats, so it is left out.
+        self.last_season_pairs = {}
+        if archive is not None and last_season != "allow":
+            for week, pairs in archive.week_pairs().items():
+                if week == rivalry_week:
+                    continue
+                self.last_season_pairs[week] = {
+                    pair for pair in pairs if pair[0] in self.team_ids and pair[1] in self.team_ids
+                }
+        # generation statistics, see stats_report
+        self.stats = {
+            "attempts": {},
+            "rejections": {reason: 0 for reason in REJECTION_REASONS},
+            "restarts": 0,
+            "week_time": {},
+            "solver_nodes": 0,
         }
+        # week the solver's clock is running for and when it was last read, see _clock_week
+        self.clocked_week = None
+        self.clock = 0.0
 
-    def _return_correct_team_dict(self, team: str) -> dict:
+    def _meetings(self, home: str, away: str) -> int:
         """
-        Helper method to return the correct team's dictionary
+        Helper method to return the number of times two teams have been scheduled against each other
 
         Args:
-            team (string): the name of the team for which to return the dictionary
+            home (str): first team in matchup
+            away (str): second team in matchup
 
         Returns:
-            dict: dictionary of the team's schedule counts
+            int: number of meetings between the two teams
         """
-        self.logger.info("Accessing correct team dictionary")
-        try:
-            if team == "Griffin":
-                return self.griffin
-            elif team == "Ryan":
-                return self.ryan
-            elif team == "Kaminska":
-                return self.kaminska
-            elif team == "Connor":
-                return self.connor
-            elif team == "Stephen":
-                return self.stephen
-            elif team == "Tim/Spencer":
-                return self.tim_spencer
-            elif team == "Joe/Joe":
-                return self.joek
-            elif team == "Anagh":
-                return self.anagh
-            elif team == "Bill":
-                return self.bill
-            elif team == "Arnav":
-                return self.arnav
-        except Exception as e:
-            self.logger.error(e)
-            raise e
+        return self.matchup_counts[self.team_ids[home] * len(self.teams) + self.team_ids[away]]
 
-    def _update_correct_team_dict(self, home: str, away: str) -> bool:
+    def _record_matchup(self, home: str, away: str, change: int = 1):
         """
-        Helper method to update the count of matchups against a specific opponent
+        Helper method to update the count of matchups between two teams in both halves of the matrix
 
         Args:
             home (str): first team in matchup
             away (str): second team in matchup
+            change (int): amount to add to the count, -1 removes a matchup
         """
-        self.logger.info("Updating correct team dictionary...")
-        try:
-            if home == "Griffin":
-                self.griffin[away] += 1
-            elif home == "Ryan":
-                self.ryan[away] += 1
-            elif home == "Kaminska":
-                self.kaminska[away] += 1
-            elif home == "Connor":
-                self.connor[away] += 1
-            elif home == "Stephen":
-                self.stephen[away] += 1
-            elif home == "Tim/Spencer":
-                self.tim_spencer[away] += 1
-            elif home == "Joe/Joe":
-                self.joek[away] += 1
-            elif home == "Anagh":
-                self.anagh[away] += 1
-            elif home == "Bill":
-                self.bill[away] += 1
-            elif home == "Arnav":
-                self.arnav[away] += 1
-            self.logger.info("Updated correct team dictionary successfully")
-        except Exception as e:
-            self.logger.error(e)
-            raise e
+        home_id = self.team_ids[home]
+        away_id = self.team_ids[away]
+        self.matchup_counts[home_id * len(self.teams) + away_id] += change
+        self.matchup_counts[away_id * len(self.teams) + home_id] += change
 
     def generate_weekly_schedule(self, week: int) -> bool:
         """
@@ -248,115 +159,118 @@ class ScheduleGenerator:
         Returns:
             week_schedule_accepted (bool): An indicator variable to show if an acceptable schedule was generated
         """
-        self.logger.warning(f"Starting schedule generation for week {week}")
-        week_matchups = []
-        available_teams = self.teams.copy()
+        self.logger.info("Starting schedule generation for week %s", week)
+        start = time.perf_counter()
+        try:
+            accepted = self._generate_weekly_schedule(week)
+        finally:
+            self.stats["week_time"][week] = self.stats["week_time"].get(week, 0.0) + time.perf_counter() - start
+        if not accepted:
+            self.stats["restarts"] += 1
+        return accepted
+
+    def _generate_weekly_schedule(self, week: int) -> bool:
+        """
+        Helper method to draw a uniformly random legal weekly pairing with the league's matching table
+
+        Args:
+            week (int): The week of the season for which to generate a schedule
+
+        Returns:
+            bool: True if an acceptable schedule was generated, False if no legal pairing exists
+        """
         # run the rivalry week method instead of generating a random schedule
-        if week == 5:
+        if week == self.rivalry_week:
             rivalry_week = self._rivalry_week(week)
             return rivalry_week
-        for team in self.teams:
-            matchup_works = False
-            infinite_loop_check = 0
-            # Moves on if team already in a matchup for this week
-            if team not in available_teams:
-                continue
-            while not matchup_works:
-                # prevents infinite loops when two incompatible teams remain
-                infinite_loop_check += 1
-                # choose opponent at random and create/validate the matchup
-                opponent = random.choice(available_teams)
-                matchup = (team, opponent)
-                self.logger.info(f"Testing matchup {matchup}")
-                matchup_works = self._validate_matchup(matchup, week)
-                self.logger.info(f"Matchup {matchup} {matchup_works}")
-                # if only two teams are left, this while can get stuck trying to create a matchup
-                # this loop prevents that by breaking the while
-                if infinite_loop_check > 10000:
-                    return False
-            # adds matchup (if accepted) to week matchups and all matchups
-            week_matchups.append((team, opponent))
-            # removes teams in a matchup from available list
-            available_teams.remove(team)
-            available_teams.remove(opponent)
-        # checks that all teams are included in the matchups
-        if len(week_matchups) == 5:
-            self.logger.info("Week schedule accepted")
-            # adds week schedule to the season schedule
-            self.schedule[f"Week {str(week)}"] = week_matchups
-            # updates matchup counts for every team
-            for matchup in week_matchups:
-                home = matchup[0]
-                away = matchup[1]
-                self._update_correct_team_dict(home=home, away=away)
-                self._update_correct_team_dict(home=away, away=home)
-            self.logger.info("Setting previous week variable equal to this week.")
-            self.previous_week = week_matchups
-            return True
-        else:
+        table = matching_table(len(self.teams))
+        forbidden_masks = self._forbidden_masks(table, week)
+        forbidden = 0
+        for reason, mask in forbidden_masks.items():
+            # count each ruled out pair once, under the first rule that rules it out
+            self.stats["rejections"][reason] += (mask & ~forbidden).bit_count()
+            forbidden |= mask
+        # under "penalize", only the legal pairings that repeat the fewest of last season's matchups this week
+        repeats = 0
+        if self.last_season == "penalize" and self.last_season_pairs.get(week):
+            repeats = self._last_season_mask(table, week)
+        drawn = table.draw(forbidden, self.rng, penalized=repeats)
+        self.stats["attempts"][week] = self.stats["attempts"].get(week, 0) + 1
+        if drawn is None:
+            self.logger.info("No legal pairing for week %s", week)
             return False
-
-    def _validate_matchup(self, matchup: tuple, week: int) -> bool:
+        week_matchups = [(self.teams[home_id], self.teams[away_id]) for home_id, away_id in table.pairs(drawn)]
+        self.logger.info("Week schedule accepted")
+        # adds week schedule to the season schedule
+        self.schedule[f"Week {str(week)}"] = week_matchups
+        # updates matchup counts for every team
+        for matchup in week_matchups:
+            self._record_matchup(home=matchup[0], away=matchup[1])
+        self.previous_week = week_matchups
+        return True
+
+    def _forbidden_masks(self, table: MatchingTable, week: int) -> dict:
         """
-        Helper method to validate that a matchup is acceptable. Matchup is validated by confirming that a team isn't
-        playing itself, has played every team once by week 10, and hasn't played this opponent twice
+        Helper method to express the week's constraints as masks of pairs that may not play
 
         Args:
-            matchup (tuple): The current matchup (team, opponent)
+            table (MatchingTable): the league's matching table
             week (int): The current week
 
         Returns:
-            bool: Returns a boolean on if the matchup should be accepted, True if yes otherwise False
+            dict: pair mask keyed by rejection reason
         """
-        self.logger.info("Validating the matchup")
-        try:
-            # set number of times a team should play another to 1 until week 10 to ensure each team plays
-            # each other team to start the season
-            max_games_against_opponent = 1 if week <= 9 else 2
+        # set number of times a team should play another to 1 until the round robin is over to ensure each
+        # team plays each other team to start the season
+        max_games_against_opponent = 1 if week <= self.round_robin_weeks else 2
+        n = len(self.teams)
+        exhausted = 0
+        for home_id in range(n):
+            row = home_id * n
+            for away_id in range(home_id + 1, n):
+                if self.matchup_counts[row + away_id] >= max_games_against_opponent:
+                    exhausted |= 1 << table.pair_bits[(home_id, away_id)]
+        rivals = 0
+        if self.rivalry_week and week < self.rivalry_week:
+            rivals = table.pair_mask(
+                (self.team_ids[home], self.team_ids[away]) for home, away in self._rivalry_matchups()
+            )
+        previous = table.pair_mask((self.team_ids[home], self.team_ids[away]) for home, away in self.previous_week)
+        last_season = self._last_season_mask(table, week) if self.last_season == "forbid" else 0
+        return {
+            "rival before rivalry week": rivals,
+            "previous-week repeat": previous,
+            "max meetings": exhausted,
+            "last-season repeat": last_season,
+        }
 
-            # name the two teams involved in the matchup
-            home = matchup[0]
-            away = matchup[1]
+    def _last_season_mask(self, table: MatchingTable, week: int) -> int:
+        """
+        Helper method to return the mask of the pairs that met in the same week last season
 
-            # check that the matchup did not occur the previous week
-            if matchup in self.previous_week:
-                self.logger.info("Matchup failed because matchup occurred the previous week")
-                return False
+        Args:
+            table (MatchingTable): the league's matching table
+            week (int): The current week
 
-            # check that team isn't playing itself
-            if home != away:
-                home_dict = self._return_correct_team_dict(team=home)
-                away_dict = self._return_correct_team_dict(team=away)
-                # check that a team doesn't face its rival before rivalry week
-                if week < 5:
-                    if self.rivals[home] == away:
-                        self.logger.info("Matchup failed because rivals played before week 5")
-                        return False
-                    elif self.rivals[away] == home:
-                        self.logger.info("Matchup failed because rivals played before week 5")
-                        return False
-                # check the number of matchups these teams have had against one another
-                matchup_total_home_away = home_dict[away]
-                matchup_total_away_home = away_dict[home]
-                if matchup_total_away_home == matchup_total_home_away:
-                    if matchup_total_away_home < max_games_against_opponent:
-                        self.logger.info("Matchup validation successful")
-                        return True
-                    else:
-                        self.logger.info("Matchup failed because teams play each other more than twice")
-                        return False
-                    self.logger.info(f"Matchup {matchup} has count: {matchup_total_away_home}")
-                else:
-                    self.logger.error(
-                        f"{home}/{away} count: {home}: {matchup_total_home_away}, {away}: {matchup_total_away_home}"
-                    )
-                    raise AssertionError("Home team dict and away team dict do not match.")
-            else:
-                self.logger.info("Matchup failed because team is playing itself")
-                return False
-        except Exception as e:
-            self.logger.error(e)
-            raise e
+        Returns:
+            int: pair mask, 0 when there is no archived season
+        """
+        pairs = self.last_season_pairs.get(week, ())
+        return table.pair_mask((self.team_ids[home], self.team_ids[away]) for home, away in pairs)
+
+    def _rivalry_matchups(self) -> list:
+        """
+        Helper method to list each rivalry once, in team order
+
+        Returns:
+            list: rivalry matchups as (team, rival) tuples
+        """
+        week_matchups = []
+        for team in self.teams:
+            rival = self.rivals[team]
+            if self.team_ids[team] < self.team_ids[rival]:
+                week_matchups.append((team, rival))
+        return week_matchups
 
     def _rivalry_week(self, week: int):
         """
@@ -367,22 +281,10 @@ class ScheduleGenerator:
         """
         try:
             self.logger.info("Creating rivalry week matchups")
-            week_matchups = []
-            rivals = {
-                "Griffin": "Ryan",
-                "Connor": "Kaminska",
-                "Bill": "Joe/Joe",
-                "Arnav": "Anagh",
-                "Tim/Spencer": "Stephen",
-            }
-            for key in rivals:
-                # create rival matchup
-                rival_matchup = (key, rivals[key])
-                week_matchups.append(rival_matchup)
-            for matchup in list(set(week_matchups)):
+            week_matchups = self._rivalry_matchups()
+            for matchup in week_matchups:
                 # update total number of matchups played
-                self._update_correct_team_dict(home=matchup[0], away=matchup[1])
-                self._update_correct_team_dict(home=matchup[1], away=matchup[0])
+                self._record_matchup(home=matchup[0], away=matchup[1])
             # add matchups to the schedule
             self.schedule[f"Rivalry Week {str(week)}"] = week_matchups
             self.logger.info("Rivalry week matchups created successfully!")
@@ -391,187 +293,712 @@ class ScheduleGenerator:
             self.logger.error(e)
             raise e
 
-    def _format_output(self) -> dict:
+    def _check_feasibility(self) -> str:
         """
-        Helper method to generate a string version of each week's schedule for human readability
+        Helper method to catch season structures that can never be scheduled before searching
 
         Returns:
-            dict: Dictionary of schedule keyed by week with values being a string of the week's matchups
+            str: reason the constraints are infeasible, empty string if no structural problem was found
         """
-        try:
-            self.logger.info("Formatting output")
-            output_dict = self.schedule.copy()
-            for key in output_dict:
-                string_of_week = " "
-                # create weekly string of matchups
-                for matchup in output_dict[key]:
-                    string_of_matchup = str(matchup[0]) + " versus " + str(matchup[1])
-                    string_of_week = string_of_week + string_of_matchup + ", "
-                string_of_week = string_of_week.rstrip(", ")
-                output_dict[key] = string_of_week
-            self.logger.info("Formatted output successfully!")
-            return output_dict
-        except Exception as e:
-            self.logger.error(e)
-            raise e
+        if len(self.teams) % 2 != 0:
+            return f"{len(self.teams)} teams cannot all play every week"
+        if self.rivalry_week:
+            for team in self.teams:
+                rival = self.rivals.get(team)
+                if rival is None or rival == team or self.rivals.get(rival) != team:
+                    return f"{team} does not have a mutual rival"
+            if self.rivalry_week > self.round_robin_weeks:
+                return (
+                    f"Rivalry week {self.rivalry_week} falls after the round robin ends in week "
+                    f"{self.round_robin_weeks}"
+                )
+        if self.season_length - self.round_robin_weeks > len(self.teams) - 1:
+            return "Too many weeks after the round robin for teams to play an opponent at most twice"
+        return ""
+
+    def _solver_matchup_allowed(self, home: str, away: str, week: int, previous: set) -> bool:
+        """
+        Helper method for the solver to check a matchup against the season rules
+
+        Args:
+            home (str): first team in matchup
+            away (str): second team in matchup
+            week (int): the week being scheduled
+            previous (set): sorted team pairs that played the previous week
 
-    def _output_schedule(self) -> bool:
+        Returns:
+            bool: True if the matchup is allowed in this week, otherwise False
         """
-        Helper method to output the schedule to a txt file.
+        if home == away:
+            # a team is never its own opponent, which is not a rule worth counting
+            return False
+        if self.rivalry_week and week < self.rivalry_week and self.rivals[home] == away:
+            reason = "rival before rivalry week"
+        elif ((home, away) if home < away else (away, home)) in previous:
+            reason = "previous-week repeat"
+        elif self._meetings(home, away) >= (1 if week <= self.round_robin_weeks else 2):
+            reason = "max meetings"
+        elif self.last_season == "forbid" and self._last_season_repeat(home, away, week):
+            reason = "last-season repeat"
+        else:
+            return True
+        self.stats["rejections"][reason] += 1
+        return False
+
+    def _last_season_repeat(self, home: str, away: str, week: int) -> bool:
         """
-        schedule = self._format_output()
-        self.logger.info("Outputting schedule")
-        try:
-            # writes the schedule line by line to a file
-            with open("schedule.txt", "w") as f:
-                for key, value in schedule.items():
-                    f.write("%s:%s\n\n" % (key, value))
-            self.logger.info("Schedule outputted successfully!")
-        except Exception as e:
-            self.logger.error(e)
-            raise e
+        Helper method to check whether two teams met in the same week last season
+
+        Args:
+            home (str): first team in matchup
+            away (str): second team in matchup
+            week (int): the week being scheduled
 
-    def _validate_output(self):
+        Returns:
+            bool: True if the matchup repeats last season's pairing
         """
-        Double checks that each matchup only occurs maximum of one time
+        return ((home, away) if home < away else (away, home)) in self.last_season_pairs.get(week, ())
+
+    def _solve_week(self, week: int, season: dict) -> bool:
+        """
+        Helper method to schedule a week and every week after it, backtracking on dead ends
 
         Args:
-            None
+            week (int): the week being scheduled
+            season (dict): matchups already placed, keyed by week number
+
+        Returns:
+            bool: True if this week and every later week were scheduled, otherwise False
         """
-        self.logger.info("Validating output")
+        if week > self.season_length:
+            return True
+        outer = self._clock_week(week)
         try:
-            team_matchup_count_dicts = {}
-            for team in self.teams:
-                team_dict = self._return_correct_team_dict(team=team)
-                team_matchup_count_dicts[team] = team_dict
-            self.logger.info("Creating validation doc")
-            with open("validate_schedule.txt", "w") as f:
-                for key in team_matchup_count_dicts:
-                    f.write("%s\n" % (f"{key}: {team_matchup_count_dicts[key]}"))
-            self.logger.info("Validation doc created successfully!")
-        except Exception as e:
-            self.logger.error(e)
-            raise e
+            return self._search_week(week, season)
+        finally:
+            self._clock_week(outer)
+
+    def _clock_week(self, week: int) -> int:
+        """
+        Helper method to charge the time since the clock was last read to the week being searched and switch the
+        clock to another week, so each week's time excludes the later weeks searched from inside it
 
-    def _output_team_schedules(self):
+        Args:
+            week (int): week the clock runs for from now on, None to stop it
+
+        Returns:
+            int: week the clock was running for
+        """
+        now = time.perf_counter()
+        if self.clocked_week is not None:
+            week_time = self.stats["week_time"]
+            week_time[self.clocked_week] = week_time.get(self.clocked_week, 0.0) + now - self.clock
+        previous_week, self.clocked_week, self.clock = self.clocked_week, week, now
+        return previous_week
+
+    def _search_week(self, week: int, season: dict) -> bool:
         """
-        Helper method to output team schedules as opposed to weekly schedules
+        Helper method for _solve_week that searches the week's matchups
 
         Args:
-            None
+            week (int): the week being scheduled
+            season (dict): matchups already placed, keyed by week number
+
+        Returns:
+            bool: True if this week and every later week were scheduled, otherwise False
         """
-        self.logger.info("Creating team schedules")
+        previous = {(home, away) if home < away else (away, home) for home, away in season.get(week - 1, [])}
+        if week == self.rivalry_week:
+            week_matchups = self._rivalry_matchups()
+            if not all(self._solver_matchup_allowed(home, away, week, previous) for home, away in week_matchups):
+                return False
+            return self._place_week(week, week_matchups, season)
+        # forward checking domains: every team's legal opponents for this week
+        domains = {}
+        for team in self.teams:
+            domains[team] = {
+                opponent
+                for opponent in self.teams
+                if self._solver_matchup_allowed(team, opponent, week, previous)
+            }
+        return self._fill_week(week, domains, [], season)
+
+    def _fill_week(self, week: int, domains: dict, week_matchups: list, season: dict) -> bool:
+        """
+        Helper method to pair the remaining teams of a week, always branching on the team with the fewest options
+
+        Args:
+            week (int): the week being scheduled
+            domains (dict): legal opponents for every unpaired team, keyed by team
+            week_matchups (list): matchups already placed this week
+            season (dict): matchups already placed, keyed by week number
+
+        Returns:
+            bool: True if the week and every later week were scheduled, otherwise False
+        """
+        self.stats["solver_nodes"] += 1
+        self.stats["attempts"][week] = self.stats["attempts"].get(week, 0) + 1
+        if not domains:
+            return self._place_week(week, list(week_matchups), season)
+        team = min(domains, key=lambda unpaired: len(domains[unpaired]))
+        options = sorted(domains[team])
+        self.rng.shuffle(options)
+        if self.last_season == "penalize":
+            # try last season's opponent in this week only after every other option
+            options.sort(key=lambda opponent: self._last_season_repeat(team, opponent, week))
+        for opponent in options:
+            remaining = {}
+            for unpaired, legal in domains.items():
+                if unpaired == team or unpaired == opponent:
+                    continue
+                remaining[unpaired] = legal - {team, opponent}
+                # prune as soon as any unpaired team runs out of legal opponents
+                if not remaining[unpaired]:
+                    break
+            else:
+                week_matchups.append((team, opponent))
+                if self._fill_week(week, remaining, week_matchups, season):
+                    return True
+                week_matchups.pop()
+        return False
+
+    def _place_week(self, week: int, week_matchups: list, season: dict) -> bool:
+        """
+        Helper method to tentatively add a full week to the season and continue the search
+
+        Args:
+            week (int): the week being scheduled
+            week_matchups (list): the week's matchups
+            season (dict): matchups already placed, keyed by week number
+
+        Returns:
+            bool: True if every later week was scheduled, otherwise False (the week is removed again)
+        """
+        for home, away in week_matchups:
+            self._record_matchup(home=home, away=away)
+        season[week] = week_matchups
+        if self._solve_week(week + 1, season):
+            return True
+        del season[week]
+        for home, away in week_matchups:
+            self._record_matchup(home=home, away=away, change=-1)
+        self.stats["restarts"] += 1
+        return False
+
+    def solve_season(self) -> bool:
+        """
+        Builds the whole season with backtracking search and forward checking instead of rejection sampling.
+        The search is complete, so a False return means the constraints cannot be satisfied.
+
+        Returns:
+            bool: True if a valid season was built, False if the constraints are infeasible
+        """
+        self.logger.info("Solver beginning schedule generation.")
         try:
-            team_schedule = {}
-            with open("schedule.txt", "r") as file:
-                lines = file.readlines()
-                week = 0
-                matchups = []
-                for line in lines:
-                    line = line.strip()
-                    # determine week number and matchup
-                    if line.startswith("Week"):
-                        week = int(line.split(":")[0].split()[1])
-                        matchups = line.split(":")[1].strip().split(",")
-                    elif line.startswith("Rivalry Week"):
-                        week = "Rivalry"
-                        matchups = line.split(":")[1].strip().split(",")
-                    # create team specific schedules
-                    for matchup in matchups:
-                        teams = matchup.split("versus")
-                        team1 = teams[0].strip()
-                        team2 = teams[1].strip()
-                        if team1 not in team_schedule:
-                            team_schedule[team1] = []
-                        if team2 not in team_schedule:
-                            team_schedule[team2] = []
-                        team_schedule[team1].append((week, team2))
-                        team_schedule[team2].append((week, team1))
-                    # clear matchup list to prevent duplication
-                    matchups = []
-            self.logger.info("Outputting team schedules to file")
-            # output team schedules into a file
-            with open("team_schedules.txt", "w") as f:
-                for team, schedule in team_schedule.items():
-                    f.write(f"Schedule for {team}:\n")
-                    for matchup in schedule:
-                        week, opponent = matchup
-                        if week == "Rivalry":
-                            weekly_match = f"Rivalry Week: versus {opponent}"
-                        else:
-                            weekly_match = f"Week {week}: versus {opponent}"
-                        f.write(f"{weekly_match}\n")
-                    f.write("\n")
+            reason = self._check_feasibility()
+            if reason:
+                self.logger.warning(f"Schedule constraints are infeasible: {reason}")
+                return False
+            season = {}
+            if not self._solve_week(1, season):
+                self.logger.warning(
+                    f"Schedule constraints are infeasible: search exhausted after {self.stats['solver_nodes']} nodes"
+                )
+                return False
+            # load the solution into the schedule used by the output methods, counts are already in the matrix
+            for week in range(1, self.season_length + 1):
+                if week == self.rivalry_week:
+                    self.schedule[f"Rivalry Week {str(week)}"] = season[week]
+                else:
+                    self.schedule[f"Week {str(week)}"] = season[week]
+            self.previous_week = season[self.season_length]
+            self.logger.info("Solver found a valid season after %s nodes", self.stats["solver_nodes"])
+            return True
         except Exception as e:
             self.logger.error(e)
             raise e
 
-    def _move_files_to_schedule_folder(self):
+    def sample_season(self, max_draws: int = 10000) -> bool:
         """
-        Helper method to move schedule files into a schedule folder
+        Builds the whole season as one draw from every valid season, each equally likely, using the exact counts of
+        SeasonCounter. Week by week generation favours seasons that are easy to build greedily; this never restarts.
+        Under the "forbid" last season rule, a season repeating last season's pairings is drawn again, which keeps
+        the draw uniform over the seasons that pass.
 
         Args:
-            None
+            max_draws (int): draws to try before giving up under the "forbid" rule
+
+        Returns:
+            bool: True if a valid season was built, False if the constraints are infeasible
         """
-        self.logger.info("Moving created txt files into schedule folder.")
+        if self.last_season == "penalize":
+            raise ValueError('Uniform sampling cannot penalize last season, use "forbid" or the optimizer')
+        reason = self._check_feasibility()
+        if reason:
+            self.logger.warning(f"Schedule constraints are infeasible: {reason}")
+            return False
+        counter = season_counter(len(self.teams), self.season_length, self.rivalry_week)
+        # the counter pairs team ids 2i and 2i + 1 as rivals
+        if self.rivalry_week:
+            ids = [team for matchup in self._rivalry_matchups() for team in matchup]
+        else:
+            ids = list(self.teams)
+        for _ in range(max_draws):
+            weeks = [[(ids[home], ids[away]) for home, away in week] for week in counter.sample(self.rng)]
+            if self.last_season == "forbid":
+                repeats = sum(
+                    self._last_season_repeat(home, away, week)
+                    for week, week_matchups in enumerate(weeks, start=1)
+                    for home, away in week_matchups
+                )
+                if repeats:
+                    self.stats["rejections"]["last-season repeat"] += repeats
+                    self.stats["restarts"] += 1
+                    continue
+            for week, week_matchups in enumerate(weeks, start=1):
+                label = "Rivalry Week" if week == self.rivalry_week else "Week"
+                self.schedule[f"{label} {week}"] = week_matchups
+                self.stats["attempts"][week] = self.stats["attempts"].get(week, 0) + 1
+                for home, away in week_matchups:
+                    self._record_matchup(home=home, away=away)
+            self.previous_week = weeks[-1]
+            return True
+        self.logger.warning(f"No season without last season's pairings in {max_draws} draws")
+        return False
+
+    def season(self) -> Season:
+        """
+        Method to return the generated schedule as an in-memory Season
+
+        Returns:
+            Season: the season, from which every view and output file is derived
+        """
+        return Season.from_schedule(self.teams, self.schedule)
+
+    def build_season(self, solver: bool = False, uniform: bool = False) -> bool:
+        """
+        Method to generate every week of the season in memory without writing any files
+
+        Args:
+            solver (bool): build the season with the backtracking solver instead of random trial and error
+            uniform (bool): draw the season uniformly from every valid season, see sample_season
+
+        Returns:
+            bool: True if a full season was generated, otherwise False
+        """
+        start = time.perf_counter()
         try:
-            # Create the "schedule" folder if it doesn't exist
-            if not os.path.exists("schedule"):
-                os.makedirs("schedule")
-            # List of files to be moved
-            files_to_move = ["schedule.txt", "team_schedules.txt", "validate_schedule.txt"]
-            # Move each file to the "schedule" folder
-            for file_name in files_to_move:
-                source_path = file_name
-                destination_path = os.path.join("schedule", file_name)
-                shutil.move(source_path, destination_path)
-            self.logger.info("Files moved successfully to the 'schedule' folder.")
-        except Exception as e:
-            self.logger.error(e)
-            raise e
+            return self._build_season(solver=solver, uniform=uniform)
+        finally:
+            self.stats["total_time"] = self.stats.get("total_time", 0.0) + time.perf_counter() - start
+
+    def _build_season(self, solver: bool, uniform: bool = False) -> bool:
+        """
+        Helper method for build_season that runs the chosen generation mode
+
+        Args:
+            solver (bool): build the season with the backtracking solver instead of random trial and error
+            uniform (bool): draw the season uniformly from every valid season
+
+        Returns:
+            bool: True if a full season was generated, otherwise False
+        """
+        if uniform:
+            return self.sample_season()
+        if solver:
+            return self.solve_season()
+        # generate schedule iterating by week, each week is drawn from every legal pairing so a week without one
+        # cannot be fixed by retrying it. Dead ends come almost always at the end of the round robin, when the
+        # pairs left no longer form a weekly pairing, so the weeks before it are redrawn; later dead ends end the
+        # attempt.
+        week = len(self.schedule) + 1
+        retries = 0
+        while week <= self.season_length:
+            if self.generate_weekly_schedule(week):
+                week += 1
+                continue
+            if week > self.round_robin_weeks or retries == ROUND_ROBIN_RETRIES:
+                return False
+            retries += 1
+            week = max(1, week - ROUND_ROBIN_TAIL)
+            self._remove_weeks(week)
+        return True
+
+    def _remove_weeks(self, week: int):
+        """
+        Helper method to take a week and every week after it back out of the season
+
+        Args:
+            week (int): first week to remove
+        """
+        while len(self.schedule) >= week:
+            _, week_matchups = self.schedule.popitem()
+            for home, away in week_matchups:
+                self._record_matchup(home=home, away=away, change=-1)
+        self.previous_week = list(self.schedule.values())[-1] if self.schedule else []
+
+    def optimize_schedule(self, iterations: int = 1000000, **cost_options) -> float:
+        """
+        Method to improve the generated season with ScheduleOptimizer and load the result back into the generator
+
+        Args:
+            iterations (int): number of candidate moves to evaluate
+            cost_options: cost weights passed through to ScheduleOptimizer
 
-    def controller(self):
+        Returns:
+            float: season cost after optimization
+        """
+        optimizer = ScheduleOptimizer(
+            self.teams,
+            self.schedule,
+            self.round_robin_weeks,
+            self.rivalry_week,
+            seed=self.seed,
+            **self._cost_options(cost_options),
+        )
+        cost = optimizer.optimize(iterations=iterations)
+        self.schedule = optimizer.to_schedule()
+        # matchup swaps change which pairs meet twice, so rebuild the count matrix from the new season
+        self.matchup_counts = bytearray(len(self.matchup_counts))
+        for week_matchups in self.schedule.values():
+            for home, away in week_matchups:
+                self._record_matchup(home=home, away=away)
+        self.previous_week = self.schedule[list(self.schedule)[-1]]
+        return cost
+
+    def season_cost(self, **cost_options) -> float:
+        """
+        Method to score the generated season with the ScheduleOptimizer cost, lower is better
+
+        Args:
+            cost_options: cost weights passed through to ScheduleOptimizer
+
+        Returns:
+            float: season cost
+        """
+        return ScheduleOptimizer(
+            self.teams, self.schedule, self.round_robin_weeks, self.rivalry_week, **self._cost_options(cost_options)
+        ).cost
+
+    def _cost_options(self, cost_options: dict) -> dict:
+        """
+        Helper method to add last season's pairings to the optimizer cost options
+
+        Args:
+            cost_options (dict): cost weights passed through to ScheduleOptimizer
+
+        Returns:
+            dict: cost options, with the pairings to keep out of their weeks when last season is not allowed
+        """
+        cost_options = dict(cost_options)
+        if self.last_season != "allow":
+            cost_options.setdefault("previous_pairs", self.last_season_pairs)
+            if self.last_season == "forbid":
+                # far above every other term, so the optimizer never trades a repeat for a better season
+                cost_options.setdefault("repeat_weight", 1000.0)
+        return cost_options
+
+    def stats_report(self) -> str:
+        """
+        Method to format the generation statistics as a compact report
+
+        Returns:
+            str: report of attempts and time per week, rejections by reason, and restarts
+        """
+        return format_stats_report(self.stats)
+
+    def controller(
+        self, solver: bool = False, optimize_iterations: int = 0, output_dir: str = "schedule", uniform: bool = False
+    ):
         """
         Controller method to run the class
+
+        Args:
+            solver (bool): build the season with the backtracking solver instead of random trial and error
+            optimize_iterations (int): number of optimizer moves to run on the season before writing it, 0 skips it
+            output_dir (str): directory the schedule files are written to
+            uniform (bool): draw the season uniformly from every valid season
         """
         self.logger.info("Controller beginning schedule generation.")
         try:
-            current_week = 1
-            count_attempts = 1
-            # generate schedule iterating by week
-            while current_week < 16:
-                count_attempts += 1
-                indicator = self.generate_weekly_schedule(current_week)
-                # only incremement the week if the schedule was accepted to ensure each week gets a schedule
-                if indicator:
-                    count_attempts = 1
-                    current_week += 1
-                if count_attempts > 15:
-                    return False
-            # write the schedule, team schedules, and validation to a txt file in a schedule folder
-            self._validate_output()
-            self._output_schedule()
-            self._output_team_schedules()
-            self._move_files_to_schedule_folder()
+            if not self.build_season(solver=solver, uniform=uniform):
+                return False
+            if optimize_iterations:
+                self.optimize_schedule(iterations=optimize_iterations)
+            # write the schedule, team schedules, and validation files in one pass into the schedule folder
+            season = self.season()
+            violations = format_violations(
+                validate_season(season, rivals=self.rivals, round_robin_weeks=self.round_robin_weeks)
+            )
+            for message in violations:
+                self.logger.error(message)
+            season.write(output_dir, violations=violations)
             return True
         except Exception as e:
             self.logger.error(e)
             raise e
 
 
+def combine_stats(stats_list: list) -> dict:
+    """
+    Adds up the generation statistics of several ScheduleGenerator attempts
+
+    Args:
+        stats_list (list): the stats dictionaries of each attempt
+
+    Returns:
+        dict: combined statistics in the same layout as ScheduleGenerator.stats
+    """
+    combined = {
+        "attempts": {},
+        "rejections": {reason: 0 for reason in REJECTION_REASONS},
+        "restarts": 0,
+        "week_time": {},
+        "solver_nodes": 0,
+        "total_time": 0.0,
+    }
+    for stats in stats_list:
+        for key in ("attempts", "week_time", "rejections"):
+            for item, value in stats[key].items():
+                combined[key][item] = combined[key].get(item, 0) + value
+        combined["restarts"] += stats["restarts"]
+        combined["solver_nodes"] += stats["solver_nodes"]
+        combined["total_time"] += stats.get("total_time", 0.0)
+    combined["seasons"] = len(stats_list)
+    return combined
+
+
+def format_stats_report(stats: dict) -> str:
+    """
+    Formats generation statistics as a compact report
+
+    Args:
+        stats (dict): statistics from ScheduleGenerator.stats or combine_stats
+
+    Returns:
+        str: multi-line report
+    """
+    # uniform draws build the whole season at once, so they have no time per week
+    if stats["week_time"]:
+        lines = ["Week  Attempts  Time (ms)"]
+    else:
+        lines = ["Week  Attempts"]
+    for week in sorted(set(stats["attempts"]) | set(stats["week_time"])):
+        line = f"{week:>4}  {stats['attempts'].get(week, 0):>8}"
+        if stats["week_time"]:
+            line += f"  {stats['week_time'].get(week, 0.0) * 1000:>9.2f}"
+        lines.append(line)
+    rejections = ", ".join(f"{reason}: {count}" for reason, count in stats["rejections"].items())
+    lines.append(f"Rejections: {rejections}")
+    restarts = f"Restarts: {stats['restarts']}"
+    if "seasons" in stats:
+        restarts += f", season attempts: {stats['seasons']}"
+    if stats["solver_nodes"]:
+        restarts += f", solver nodes: {stats['solver_nodes']}"
+    lines.append(restarts)
+    lines.append(f"Total time: {stats.get('total_time', 0.0) * 1000:.2f} ms")
+    return "\n".join(lines)
+
+
+def reproduce_command(
+    seed: int,
+    solver: bool = False,
+    uniform: bool = False,
+    optimize_iterations: int = 0,
+    last_season: str = "allow",
+    archive_dir: str = ARCHIVE_DIR,
+) -> str:
+    """
+    Builds the command line that rebuilds a seeded season, with every flag that changes how it is generated
+
+    Args:
+        seed (int): seed of the season's attempt
+        solver (bool): the season was built by the backtracking solver
+        uniform (bool): the season was drawn uniformly from every valid season
+        optimize_iterations (int): optimizer moves run on the season
+        last_season (str): last season rule the season was built under
+        archive_dir (str): archive the last season rule read
+
+    Returns:
+        str: command line
+    """
+    command = f"python schedule_generator.py --seed {seed} --attempts 1"
+    if solver:
+        command += " --solver"
+    if uniform:
+        command += " --uniform"
+    if optimize_iterations:
+        command += f" --optimize {optimize_iterations}"
+    if last_season != "allow":
+        command += f" --last-season {last_season}"
+        if archive_dir != ARCHIVE_DIR:
+            command += f" --archive {archive_dir}"
+    return command
+
+
+def _search_attempt(task: tuple) -> tuple:
+    """
+    Runs one seeded schedule attempt inside a worker process
+
+    Args:
+        task (tuple): (seed, teams, rivals, solver, archive, last_season)
+
+    Returns:
+        tuple: (seed, schedule, cost, stats), schedule and cost are None if the attempt failed
+    """
+    seed, teams, rivals, solver, archive, last_season = task
+    SG = ScheduleGenerator(teams=teams, rivals=rivals, seed=seed, archive=archive, last_season=last_season)
+    if SG.build_season(solver=solver):
+        return seed, SG.schedule, SG.season_cost(), SG.stats
+    return seed, None, None, SG.stats
+
+
+def parallel_search(
+    attempts: int = 60,
+    first_seed: int = None,
+    workers: int = None,
+    best: int = 1,
+    solver: bool = False,
+    teams: list = None,
+    rivals: dict = None,
+    archive=None,
+    last_season: str = "allow",
+    stats: list = None,
+) -> list:
+    """
+    Runs independent seeded attempts across a process pool. Attempt i uses seed first_seed + i, so any
+    season found here can be rebuilt with ScheduleGenerator(seed=seed).
+
+    Args:
+        attempts (int): maximum number of attempts to run
+        first_seed (int): seed of the first attempt, chosen at random if not given
+        workers (int): number of worker processes, defaults to the number of cores
+        best (int): stop once this many valid seasons have been found
+        solver (bool): use the backtracking solver in each attempt
+        teams (list): team names, defaults to the current QPFL teams
+        rivals (dict): each team's rival keyed by team, defaults to the current QPFL rivalries
+        archive (ScheduleArchive): past schedules for the last_season rule
+        last_season (str): "allow", "penalize" or "forbid" last season's pairings in the same weeks
+        stats (list): list the generation statistics of every finished attempt are appended to
+
+    Returns:
+        list: (seed, schedule, cost) tuples for the valid seasons found, lowest season cost first
+    """
+    logger = logging.getLogger("controller_logs")
+    if first_seed is None:
+        first_seed = random.SystemRandom().randrange(2**32)
+    tasks = ((first_seed + offset, teams, rivals, solver, archive, last_season) for offset in range(attempts))
+    found = []
+    # leaving the pool context terminates the workers still running once enough seasons are found
+    with multiprocessing.Pool(processes=workers) as pool:
+        for seed, schedule, cost, attempt_stats in pool.imap_unordered(_search_attempt, tasks):
+            if stats is not None:
+                stats.append(attempt_stats)
+            if schedule is None:
+                continue
+            logger.warning(f"Valid season found with seed {seed} (cost {cost:.2f})")
+            found.append((seed, schedule, cost))
+            if len(found) >= best:
+                break
+    found.sort(key=lambda result: result[2])
+    return found
+
+
 if __name__ == "__main__":
-    number_of_tries = 60
-    count = 1
+    parser = argparse.ArgumentParser(description="Generate a QPFL season schedule")
+    parser.add_argument("--solver", action="store_true", help="use the backtracking solver instead of random retries")
+    parser.add_argument("--uniform", action="store_true", help="draw the season uniformly from every valid season")
+    parser.add_argument("--count", action="store_true", help="print how many valid seasons there are")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first attempt, reproduces a printed seed")
+    parser.add_argument("--attempts", type=int, default=60, help="maximum number of attempts")
+    parser.add_argument("--parallel", action="store_true", help="run attempts across a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for --parallel")
+    parser.add_argument("--best", type=int, default=1, help="number of valid seasons to collect with --parallel")
+    parser.add_argument("--optimize", type=int, default=0, metavar="MOVES", help="optimizer moves to run on the season")
+    parser.add_argument("--profile", action="store_true", help="print attempt, rejection and timing statistics")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="directory of past season files")
+    parser.add_argument(
+        "--last-season",
+        choices=LAST_SEASON_MODES,
+        default="allow",
+        help="how to treat last season's pairings in the same weeks",
+    )
+    args = parser.parse_args()
+    if args.uniform and (args.solver or args.parallel):
+        parser.error("--uniform never retries, it cannot be combined with --solver or --parallel")
+    if args.uniform and args.last_season == "penalize":
+        parser.error("--uniform supports --last-season forbid but not penalize")
+    archive = ScheduleArchive(args.archive) if args.last_season != "allow" else None
+    history = {"archive": archive, "last_season": args.last_season}
+    # every flag that changes how a seeded season is generated, for the rebuild command of the winning seed
+    flags = {
+        "solver": args.solver,
+        "uniform": args.uniform,
+        "optimize_iterations": args.optimize,
+        "last_season": args.last_season,
+        "archive_dir": args.archive,
+    }
+    generators = []
+    # statistics of the attempts searched in the worker processes
+    attempt_stats = []
     logger = logging.getLogger("controller_logs")
-    while count <= number_of_tries:
-        logger.warning(f"Starting attempt number {count} of {number_of_tries}")
-        SG = ScheduleGenerator()
-        success = SG.controller()
-        if success:
-            break
+    first_seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2**32)
+    if args.parallel:
+        found = parallel_search(
+            attempts=args.attempts,
+            first_seed=first_seed,
+            workers=args.workers,
+            best=args.best,
+            solver=args.solver,
+            stats=attempt_stats,
+            **history,
+        )
+        if found:
+            for seed, _, cost in found:
+                logger.warning(
+                    f"Winning seed: {seed} (cost {cost:.2f}), rebuild with: {reproduce_command(seed, **flags)}"
+                )
+            # rebuild the lowest cost winner from its seed to write the schedule files
+            SG = ScheduleGenerator(seed=found[0][0], **history)
+            generators.append(SG)
+            SG.controller(solver=args.solver, optimize_iterations=args.optimize)
+            logger.warning("Schedule generated successfully!")
+        else:
+            logger.warning(f"Schedule validation failed after {args.attempts} attempts")
+    elif args.solver or args.uniform:
+        SG = ScheduleGenerator(seed=first_seed, **history)
+        generators.append(SG)
+        if SG.controller(solver=args.solver, optimize_iterations=args.optimize, uniform=args.uniform):
+            logger.warning(f"Winning seed: {first_seed}, rebuild with: {reproduce_command(first_seed, **flags)}")
+            logger.warning("Schedule generated successfully!")
         else:
-            count += 1
-    if success:
-        logger.warning("Schedule generated successfully!")
+            logger.warning("Schedule constraints are infeasible, no schedule generated")
     else:
-        logger.warning(f"Schedule validation failed after {number_of_tries} attempts")
+        number_of_tries = args.attempts
+        count = 1
+        success = False
+        while count <= number_of_tries:
+            logger.warning(f"Starting attempt number {count} of {number_of_tries}")
+            SG = ScheduleGenerator(seed=first_seed + count - 1, **history)
+            generators.append(SG)
+            success = SG.controller(optimize_iterations=args.optimize)
+            if success:
+                break
+            else:
+                count += 1
+        if success:
+            logger.warning(f"Winning seed: {SG.seed}, rebuild with: {reproduce_command(SG.seed, **flags)}")
+            logger.warning("Schedule generated successfully!")
+        else:
+            logger.warning(f"Schedule validation failed after {number_of_tries} attempts")
+    if args.profile:
+        # the rebuilt --parallel winner repeats one searched attempt, so the workers' statistics are reported instead
+        stats_list = attempt_stats if args.parallel else [SG.stats for SG in generators]
+        if stats_list:
+            print(format_stats_report(combine_stats(stats_list)))
+    if args.count:
+        # the league shape comes from a fresh generator, the search may not have left one behind
+        league = ScheduleGenerator(**history)
+        counter = season_counter(len(league.teams), league.season_length, league.rivalry_week)
+        print(f"Round robins (weeks 1-{counter.round_robin_weeks}): {counter.round_robin_count():,}")
+        print(f"Valid seasons: {counter.total_count():,}")
@@ -0,0 +1,208 @@
+"""
+QPFL Weekly Matching Table
+"""
+
+import functools
+
+# largest league whose matchings are enumerated to draw a week, 16 teams already have 2,027,025 of them
+TABLE_TEAMS = 14
+
+
+class MatchingTable:
+    """
+    Every possible weekly pairing (perfect matching) of a league, enumerated once on first use. Each matching is
+    stored as a bitmask over team pairs, so a week's constraints become one forbidden-pair mask and filtering the
+    table is a single AND per matching. 10 teams have 945 matchings, 12 have 10,395 and 14 have 135,135; larger
+    leagues draw their weeks by counting the legal matchings instead of listing them.
+    """
+
+    def __init__(self, team_count: int):
+        """
+        Initializer for the MatchingTable class
+
+        Args:
+            team_count (int): number of teams, must be even
+        """
+        if team_count % 2 != 0:
+            raise ValueError(f"{team_count} teams cannot all be paired every week")
+        self.team_count = team_count
+        # bit number of every pair of team ids, and the pair of every bit number
+        self.pair_bits = {}
+        self.bit_pairs = []
+        for home_id in range(team_count):
+            for away_id in range(home_id + 1, team_count):
+                self.pair_bits[(home_id, away_id)] = len(self.bit_pairs)
+                self.pair_bits[(away_id, home_id)] = len(self.bit_pairs)
+                self.bit_pairs.append((home_id, away_id))
+
+    @functools.cached_property
+    def masks(self) -> list:
+        """
+        Every matching of the league as a pair mask, enumerated on first use
+        """
+        masks = []
+        self._enumerate(list(range(self.team_count)), 0, masks)
+        return masks
+
+    def _enumerate(self, unpaired: list, mask: int, masks: list):
+        """
+        Helper method to add every matching that completes a partial matching, pairing the lowest unpaired team
+        first so each matching is produced exactly once
+
+        Args:
+            unpaired (list): team ids not yet paired, in ascending order
+            mask (int): pairs already chosen
+            masks (list): list the matchings are added to
+        """
+        if not unpaired:
+            masks.append(mask)
+            return
+        team = unpaired[0]
+        for index in range(1, len(unpaired)):
+            opponent = unpaired[index]
+            self._enumerate(
+                unpaired[1:index] + unpaired[index + 1 :], mask | (1 << self.pair_bits[(team, opponent)]), masks
+            )
+
+    def pair_mask(self, pairs) -> int:
+        """
+        Method to build a mask from team id pairs
+
+        Args:
+            pairs: iterable of (team id, team id) tuples
+
+        Returns:
+            int: mask with the bit of every pair set
+        """
+        mask = 0
+        for pair in pairs:
+            mask |= 1 << self.pair_bits[pair]
+        return mask
+
+    def legal(self, forbidden: int) -> list:
+        """
+        Method to return every matching that uses none of the forbidden pairs
+
+        Args:
+            forbidden (int): mask of pairs that may not play this week
+
+        Returns:
+            list: masks of the legal matchings
+        """
+        return [mask for mask in self.masks if not mask & forbidden]
+
+    def draw(self, forbidden: int, rng, penalized: int = 0) -> int:
+        """
+        Method to draw a matching uniformly from those that use none of the forbidden pairs and as few of the
+        penalized pairs as possible. Leagues up to TABLE_TEAMS filter the enumerated table, larger ones count the
+        matchings instead so the table is never built.
+
+        Args:
+            forbidden (int): mask of pairs that may not play this week
+            rng (random.Random): random source
+            penalized (int): mask of pairs to avoid where possible
+
+        Returns:
+            int: mask of the drawn matching, None if no matching avoids the forbidden pairs
+        """
+        if self.team_count > TABLE_TEAMS:
+            return self._draw_by_counting(forbidden, rng, penalized)
+        legal = self.legal(forbidden)
+        if not legal:
+            return None
+        if penalized:
+            fewest = min((mask & penalized).bit_count() for mask in legal)
+            legal = [mask for mask in legal if (mask & penalized).bit_count() == fewest]
+        return rng.choice(legal)
+
+    def _draw_by_counting(self, forbidden: int, rng, penalized: int) -> int:
+        """
+        Helper method for draw that counts the best matchings of every set of unpaired teams, always pairing the
+        lowest unpaired team first, and then walks down choosing each pair in proportion to the matchings it leaves
+
+        Args:
+            forbidden (int): mask of pairs that may not play this week
+            rng (random.Random): random source
+            penalized (int): mask of pairs to avoid where possible
+
+        Returns:
+            int: mask of the drawn matching, None if no matching avoids the forbidden pairs
+        """
+        # (opponent, pair bit, penalty) of every allowed game, keyed by team
+        games = [[] for _ in range(self.team_count)]
+        for bit, (home_id, away_id) in enumerate(self.bit_pairs):
+            if not forbidden >> bit & 1:
+                games[home_id].append((away_id, bit, penalized >> bit & 1))
+        memo = {0: (0, 1)}
+
+        def best(unpaired: int) -> tuple:
+            # (fewest penalized pairs, number of matchings with that many) of the unpaired teams
+            if unpaired not in memo:
+                team = (unpaired & -unpaired).bit_length() - 1
+                rest = unpaired ^ (1 << team)
+                fewest, count = None, 0
+                for opponent, _, penalty in games[team]:
+                    if rest >> opponent & 1:
+                        opponent_fewest, opponent_count = best(rest ^ (1 << opponent))
+                        if not opponent_count:
+                            continue
+                        if fewest is None or opponent_fewest + penalty < fewest:
+                            fewest, count = opponent_fewest + penalty, opponent_count
+                        elif opponent_fewest + penalty == fewest:
+                            count += opponent_count
+                memo[unpaired] = (fewest, count)
+            return memo[unpaired]
+
+        unpaired = (1 << self.team_count) - 1
+        fewest, count = best(unpaired)
+        if not count:
+            return None
+        mask = 0
+        while unpaired:
+            team = (unpaired & -unpaired).bit_length() - 1
+            rest = unpaired ^ (1 << team)
+            pick = rng.randrange(count)
+            for opponent, bit, penalty in games[team]:
+                if not rest >> opponent & 1:
+                    continue
+                opponent_fewest, opponent_count = best(rest ^ (1 << opponent))
+                if not opponent_count or opponent_fewest + penalty != fewest:
+                    continue
+                if pick < opponent_count:
+                    break
+                pick -= opponent_count
+            mask |= 1 << bit
+            unpaired = rest ^ (1 << opponent)
+            fewest, count = opponent_fewest, opponent_count
+        return mask
+
+    def pairs(self, mask: int) -> list:
+        """
+        Method to decode a matching mask into team id pairs
+
+        Args:
+            mask (int): matching mask
+
+        Returns:
+            list: (team id, team id) tuples in ascending order
+        """
+        pairs = []
+        while mask:
+            low_bit = mask & -mask
+            pairs.append(self.bit_pairs[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return pairs
+
+
+@functools.lru_cache(maxsize=None)
+def matching_table(team_count: int) -> MatchingTable:
+    """
+    Returns the matching table for a league size, building it on first use
+
+    Args:
+        team_count (int): number of teams
+
+    Returns:
+        MatchingTable: the shared table
+    """
+    return MatchingTable(team_count)
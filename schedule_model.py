@@ -0,0 +1,393 @@
+"""
+QPFL Season Model
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+
+
+class Season:
+    """
+    In-memory QPFL season. Weekly, per-team and validation views are all derived from the same matchup lists,
+    and every output format is written from it in a single pass.
+    """
+
+    def __init__(self, teams: list, weeks: list, rivalry_week: int = None):
+        """
+        Initializer for the Season class
+
+        Args:
+            teams (list): team names in league order
+            weeks (list): each week's matchups as a list of (team, opponent) tuples, week 1 first
+            rivalry_week (int): week number of rivalry week, if the season has one
+        """
+        self.logger = logging.getLogger(name="schedule_logger")
+        self.teams = list(teams)
+        self.weeks = [[tuple(matchup) for matchup in week_matchups] for week_matchups in weeks]
+        self.rivalry_week = rivalry_week
+
+    @classmethod
+    def from_schedule(cls, teams: list, schedule: dict):
+        """
+        Builds a season from a ScheduleGenerator schedule dict keyed by "Week N" / "Rivalry Week N"
+
+        Args:
+            teams (list): team names in league order
+            schedule (dict): matchups keyed by week label, in week order
+
+        Returns:
+            Season: the season
+        """
+        rivalry_week = None
+        weeks = []
+        for week, (label, week_matchups) in enumerate(schedule.items(), start=1):
+            if label.startswith("Rivalry"):
+                rivalry_week = week
+            weeks.append(week_matchups)
+        return cls(teams, weeks, rivalry_week=rivalry_week)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Builds a season from the to_dict / schedule.json layout
+
+        Args:
+            data (dict): teams, rivalry week and weeks of [team, opponent] pairs
+
+        Returns:
+            Season: the season
+        """
+        weeks = data["weeks"]
+        teams = data.get("teams") or _teams_in_order(weeks)
+        return cls(teams, weeks, rivalry_week=data.get("rivalry_week"))
+
+    @classmethod
+    def from_csv_text(cls, text: str):
+        """
+        Builds a season from the schedule.csv layout (week, label, home, away)
+
+        Args:
+            text (str): CSV file contents
+
+        Returns:
+            Season: the season
+        """
+        weeks = {}
+        rivalry_week = None
+        for row in csv.DictReader(io.StringIO(text)):
+            week = int(row["week"])
+            weeks.setdefault(week, []).append((row["home"], row["away"]))
+            if row.get("label", "").startswith("Rivalry"):
+                rivalry_week = week
+        ordered = [weeks.get(week, []) for week in range(1, max(weeks, default=0) + 1)]
+        return cls(_teams_in_order(ordered), ordered, rivalry_week=rivalry_week)
+
+    @classmethod
+    def from_schedule_text(cls, text: str):
+        """
+        Builds a season from the weekly schedule.txt layout ("Week N: A versus B, C versus D").
+        Team names containing ", " or " versus " are ambiguous in this format, use JSON or CSV for those.
+
+        Args:
+            text (str): schedule.txt contents
+
+        Returns:
+            Season: the season
+        """
+        weeks = []
+        rivalry_week = None
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            label, _, matchups = line.partition(": ")
+            if label.startswith("Rivalry"):
+                rivalry_week = len(weeks) + 1
+            week_matchups = []
+            for matchup in matchups.split(", "):
+                home, _, away = matchup.partition(" versus ")
+                week_matchups.append((home.strip(), away.strip()))
+            weeks.append(week_matchups)
+        return cls(_teams_in_order(weeks), weeks, rivalry_week=rivalry_week)
+
+    @classmethod
+    def from_team_schedules_text(cls, text: str):
+        """
+        Builds a season from the per-team team_schedules.txt layout, as used in past_schedules.
+        "Rivalry Week" lines carry no number, so their week is taken from their position in the team's list.
+
+        Args:
+            text (str): team_schedules.txt contents
+
+        Returns:
+            Season: the season
+        """
+        team_games = {}
+        team = None
+        rivalry_week = None
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("Schedule for ") and line.endswith(":"):
+                team = line[len("Schedule for ") : -1]
+                team_games[team] = []
+                continue
+            label, _, opponent = line.partition(": versus ")
+            games = team_games[team]
+            if label.startswith("Rivalry"):
+                week = len(games) + 1
+                rivalry_week = week
+            else:
+                week = int(label.split()[-1])
+            games.append((week, opponent.strip()))
+        weeks = {}
+        for team, games in team_games.items():
+            for week, opponent in games:
+                # each game appears in both teams' lists, keep it once
+                if (opponent, team) not in weeks.setdefault(week, []):
+                    weeks[week].append((team, opponent))
+        ordered = [weeks.get(week, []) for week in range(1, max(weeks, default=0) + 1)]
+        return cls(list(team_games), ordered, rivalry_week=rivalry_week)
+
+    def label(self, week: int) -> str:
+        """
+        Method to return the display label of a week
+
+        Args:
+            week (int): week number, starting at 1
+
+        Returns:
+            str: "Week N" or "Rivalry Week N"
+        """
+        return f"Rivalry Week {week}" if week == self.rivalry_week else f"Week {week}"
+
+    def weekly_view(self) -> dict:
+        """
+        Method to return the season's matchups keyed by week label
+
+        Returns:
+            dict: matchups keyed by week label, in week order
+        """
+        return {self.label(week): list(week_matchups) for week, week_matchups in enumerate(self.weeks, start=1)}
+
+    def team_view(self) -> dict:
+        """
+        Method to return each team's schedule
+
+        Returns:
+            dict: list of (week, opponent) tuples keyed by team, in league order
+        """
+        team_schedule = {team: [] for team in self.teams}
+        for week, week_matchups in enumerate(self.weeks, start=1):
+            for home, away in week_matchups:
+                team_schedule[home].append((week, away))
+                team_schedule[away].append((week, home))
+        for games in team_schedule.values():
+            games.sort()
+        return team_schedule
+
+    def meeting_counts(self) -> dict:
+        """
+        Method to return how many times every pair of teams meets
+
+        Returns:
+            dict: for each team, a dict of meeting counts keyed by opponent
+        """
+        counts = {team: {opponent: 0 for opponent in self.teams} for team in self.teams}
+        for week_matchups in self.weeks:
+            for home, away in week_matchups:
+                counts[home][away] += 1
+                counts[away][home] += 1
+        return counts
+
+    def to_dict(self) -> dict:
+        """
+        Method to return a JSON serializable version of the season
+
+        Returns:
+            dict: teams, rivalry week and weeks of [team, opponent] pairs
+        """
+        return {
+            "teams": self.teams,
+            "rivalry_week": self.rivalry_week,
+            "weeks": [[list(matchup) for matchup in week_matchups] for week_matchups in self.weeks],
+        }
+
+    def _schedule_text(self) -> str:
+        """
+        Helper method to render the weekly schedule text
+
+        Returns:
+            str: one "Week N: A versus B, ..." line per week
+        """
+        lines = []
+        for label, week_matchups in self.weekly_view().items():
+            matchups = ", ".join(f"{home} versus {away}" for home, away in week_matchups)
+            lines.append(f"{label}: {matchups}\n\n")
+        return "".join(lines)
+
+    def _team_schedules_text(self) -> str:
+        """
+        Helper method to render the per-team schedule text
+
+        Returns:
+            str: a "Schedule for X:" block per team
+        """
+        lines = []
+        for team, games in self.team_view().items():
+            lines.append(f"Schedule for {team}:\n")
+            for week, opponent in games:
+                if week == self.rivalry_week:
+                    lines.append(f"Rivalry Week: versus {opponent}\n")
+                else:
+                    lines.append(f"Week {week}: versus {opponent}\n")
+            lines.append("\n")
+        return "".join(lines)
+
+    def _validation_text(self, violations: list = None) -> str:
+        """
+        Helper method to render the meeting counts and rule violations for the validation doc
+
+        Args:
+            violations (list): violation messages to list after the counts, None skips the section
+
+        Returns:
+            str: one "Team: {opponent: count}" line per team, followed by the violations
+        """
+        text = "".join(f"{team}: {counts}\n" for team, counts in self.meeting_counts().items())
+        if violations is not None:
+            text += "\nViolations:\n" + ("".join(f"{message}\n" for message in violations) or "None\n")
+        return text
+
+    def _csv_text(self) -> str:
+        """
+        Helper method to render the season as CSV, one row per matchup
+
+        Returns:
+            str: CSV with week, label, home and away columns
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(["week", "label", "home", "away"])
+        for week, week_matchups in enumerate(self.weeks, start=1):
+            for home, away in week_matchups:
+                writer.writerow([week, self.label(week), home, away])
+        return buffer.getvalue()
+
+    def write(self, directory: str = "schedule", violations: list = None) -> list:
+        """
+        Method to write every output format straight into the output directory. Each file is written to a
+        temporary file in the same directory and renamed into place, so readers never see a partial file.
+
+        Args:
+            directory (str): output directory, created if it doesn't exist
+            violations (list): validator messages to include in validate_schedule.txt
+
+        Returns:
+            list: paths of the written files
+        """
+        self.logger.info(f"Writing season files to {directory}")
+        outputs = {
+            "schedule.txt": self._schedule_text(),
+            "team_schedules.txt": self._team_schedules_text(),
+            "validate_schedule.txt": self._validation_text(violations),
+            "schedule.json": json.dumps(self.to_dict(), indent=2) + "\n",
+            "schedule.csv": self._csv_text(),
+        }
+        os.makedirs(directory, exist_ok=True)
+        written = []
+        for file_name, content in outputs.items():
+            path = os.path.join(directory, file_name)
+            _write_atomic(path, content)
+            written.append(path)
+        self.logger.info("Season files written successfully!")
+        return written
+
+
+def load_season(path: str) -> Season:
+    """
+    Loads a season from any supported format: schedule.json, schedule.csv, the weekly schedule.txt or the
+    per-team team_schedules.txt layout
+
+    Args:
+        path (str): season file
+
+    Returns:
+        Season: the season
+    """
+    with open(path, "r", newline="") as f:
+        text = f.read()
+    return parse_season(text, os.path.splitext(path)[1].lower())
+
+
+def parse_season(text: str, extension: str = "") -> Season:
+    """
+    Parses a season from file contents, using the extension when given and the contents otherwise
+
+    Args:
+        text (str): file contents
+        extension (str): file extension such as ".json", ".csv" or ".txt"
+
+    Returns:
+        Season: the season
+    """
+    stripped = text.lstrip()
+    if extension in (".json", ".jsonl") or stripped.startswith("{"):
+        return Season.from_dict(json.loads(stripped))
+    if extension == ".csv" or stripped.startswith("week,"):
+        return Season.from_csv_text(text)
+    if stripped.startswith("Schedule for "):
+        return Season.from_team_schedules_text(text)
+    return Season.from_schedule_text(text)
+
+
+def _teams_in_order(weeks: list) -> list:
+    """
+    Lists every team in order of first appearance
+
+    Args:
+        weeks (list): each week's matchups
+
+    Returns:
+        list: team names
+    """
+    teams = {}
+    for week_matchups in weeks:
+        for matchup in week_matchups:
+            for team in matchup:
+                teams.setdefault(team, None)
+    return list(teams)
+
+
+def _write_atomic(path: str, content: str):
+    """
+    Writes a file by renaming a fully written temporary file over it. The file keeps the mode of the file it
+    replaces, or gets the mode open() would give a new file.
+
+    Args:
+        path (str): destination path
+        content (str): file contents
+    """
+    directory = os.path.dirname(path) or "."
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(handle, "w", newline="") as f:
+            f.write(content)
+        # mkstemp creates the file readable by its owner only
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,378 @@
+"""
+QPFL Schedule Optimizer
+"""
+
+import logging
+import math
+import random
+import time
+
+
+class ScheduleOptimizer:
+    """
+    Improves a valid season with simulated annealing over week swaps and matchup swaps. Every move is scored
+    incrementally from the pairs and teams it touches, so the season is never re-checked as a whole.
+    """
+
+    def __init__(
+        self,
+        teams: list,
+        schedule: dict,
+        round_robin_weeks: int,
+        rivalry_week: int = None,
+        min_rematch_gap: int = 5,
+        spacing_weight: float = 1.0,
+        recent_weeks: int = 4,
+        recent_weight: float = 1.0,
+        strength: dict = None,
+        balance_weight: float = 0.0,
+        previous_pairs: dict = None,
+        repeat_weight: float = 1.0,
+        seed: int = None,
+    ):
+        """
+        Initializer for the ScheduleOptimizer class
+
+        Args:
+            teams (list): team names
+            schedule (dict): a valid season as built by ScheduleGenerator, weeks in order
+            round_robin_weeks (int): last week of the round robin
+            rivalry_week (int): week that is fixed to rivalry matchups, never moved
+            min_rematch_gap (int): rematches closer than this many weeks to the first meeting are penalized per week
+            spacing_weight (float): weight of the rematch spacing penalty
+            recent_weeks (int): rematching a pair that first met in the last this many round robin weeks is penalized
+            recent_weight (float): weight of the recent pairing penalty
+            strength (dict): optional team strength (e.g. last season's points for) keyed by team
+            balance_weight (float): weight of the squared difference between each team's summed rematch opponent
+                strength and the league average
+            previous_pairs (dict): pairs to keep out of a week, such as last season's pairings, as sets of
+                (team, team) tuples keyed by week number
+            repeat_weight (float): penalty for each pair scheduled in a week it appears in previous_pairs
+            seed (int): seed for the annealing moves
+        """
+        self.logger = logging.getLogger(name="schedule_logger")
+        self.teams = list(teams)
+        self.team_ids = {team: team_id for team_id, team in enumerate(self.teams)}
+        self.season_length = len(schedule)
+        self.round_robin_weeks = round_robin_weeks
+        self.rivalry_week = rivalry_week
+        self.min_rematch_gap = min_rematch_gap
+        self.spacing_weight = spacing_weight
+        self.recent_weeks = recent_weeks
+        self.recent_weight = recent_weight
+        self.balance_weight = balance_weight
+        self.rng = random.Random(seed)
+        n = len(self.teams)
+        self.strength = [float(strength[team]) if strength else 0.0 for team in self.teams]
+        self.repeat_weight = repeat_weight
+        # (pair index, week) of every pairing to keep out of its week
+        self.repeats = set()
+        for week, pairs in (previous_pairs or {}).items():
+            for home, away in pairs:
+                if home in self.team_ids and away in self.team_ids:
+                    self.repeats.add((self._pair(self.team_ids[home], self.team_ids[away]), week))
+        rematch_weeks = self.season_length - round_robin_weeks
+        self.balance_target = rematch_weeks * sum(self.strength) / n
+        # opponents[week][team] holds the opponent id, weeks are 1-indexed with sentinel rows on both ends
+        self.opponents = [[-1] * n for _ in range(self.season_length + 2)]
+        # meeting weeks of every pair, indexed by low_id * n + high_id
+        self.meetings = [[] for _ in range(n * n)]
+        for week, week_matchups in enumerate(schedule.values(), start=1):
+            for home, away in week_matchups:
+                home_id = self.team_ids[home]
+                away_id = self.team_ids[away]
+                self.opponents[week][home_id] = away_id
+                self.opponents[week][away_id] = home_id
+                self.meetings[self._pair(home_id, away_id)].append(week)
+        self.rematch_strength = [0.0] * n
+        for pair, weeks in enumerate(self.meetings):
+            if len(weeks) == 2:
+                self.rematch_strength[pair // n] += self.strength[pair % n]
+                self.rematch_strength[pair % n] += self.strength[pair // n]
+        self.round_robin_movable = [
+            week for week in range(1, min(round_robin_weeks, self.season_length) + 1) if week != rivalry_week
+        ]
+        self.rematch_movable = list(range(round_robin_weeks + 1, self.season_length + 1))
+        self.cost = self.total_cost()
+        self.moves_evaluated = 0
+
+    def _pair(self, home_id: int, away_id: int) -> int:
+        """
+        Helper method to return the index of a pair of team ids
+
+        Returns:
+            int: pair index
+        """
+        if home_id < away_id:
+            return home_id * len(self.teams) + away_id
+        return away_id * len(self.teams) + home_id
+
+    def _pair_cost(self, pair: int, weeks: list) -> float:
+        """
+        Helper method to score the meeting weeks of one pair
+
+        Args:
+            pair (int): pair index
+            weeks (list): sorted weeks the pair meets
+
+        Returns:
+            float: spacing, recent pairing and repeated pairing penalty of the pair
+        """
+        cost = 0.0
+        if self.repeats:
+            cost += self.repeat_weight * sum((pair, week) in self.repeats for week in weeks)
+        if len(weeks) < 2:
+            return cost
+        gap = weeks[1] - weeks[0]
+        if gap < self.min_rematch_gap:
+            cost += self.spacing_weight * (self.min_rematch_gap - gap)
+        if weeks[0] > self.round_robin_weeks - self.recent_weeks:
+            cost += self.recent_weight
+        return cost
+
+    def _balance_cost(self, value: float) -> float:
+        """
+        Helper method to score one team's summed rematch opponent strength
+
+        Returns:
+            float: balance penalty of the team
+        """
+        return self.balance_weight * (value - self.balance_target) ** 2
+
+    def total_cost(self) -> float:
+        """
+        Method to score the whole season from scratch
+
+        Returns:
+            float: season cost, lower is better
+        """
+        cost = sum(self._pair_cost(pair, weeks) for pair, weeks in enumerate(self.meetings) if weeks)
+        cost += sum(self._balance_cost(value) for value in self.rematch_strength)
+        return cost
+
+    def metrics(self) -> dict:
+        """
+        Method to break the season cost down into its terms
+
+        Returns:
+            dict: total cost, each cost term, and the closest rematch gap in weeks
+        """
+        spacing = 0.0
+        recent = 0
+        gaps = []
+        for weeks in self.meetings:
+            if len(weeks) == 2:
+                gap = weeks[1] - weeks[0]
+                gaps.append(gap)
+                spacing += self.spacing_weight * max(0, self.min_rematch_gap - gap)
+                recent += weeks[0] > self.round_robin_weeks - self.recent_weeks
+        return {
+            "cost": round(self.cost, 6),
+            "spacing": round(spacing, 6),
+            "recent_rematches": recent,
+            "repeated_pairings": sum(
+                (pair, week) in self.repeats for pair, weeks in enumerate(self.meetings) for week in weeks
+            ),
+            "balance": round(sum(self._balance_cost(value) for value in self.rematch_strength), 6),
+            "min_rematch_gap": min(gaps) if gaps else None,
+        }
+
+    def _try_matchup_swap(self, temperature: float) -> bool:
+        """
+        Helper method to propose re-pairing two matchups of one rematch week, (a, b), (c, d) into (a, c), (b, d)
+        or (a, d), (b, c), and accept it by the annealing rule
+
+        Args:
+            temperature (float): current annealing temperature
+
+        Returns:
+            bool: True if the move was applied
+        """
+        week = self.rng.choice(self.rematch_movable)
+        row = self.opponents[week]
+        a = self.rng.randrange(len(self.teams))
+        b = row[a]
+        c = self.rng.randrange(len(self.teams))
+        d = row[c]
+        if c == a or c == b:
+            return False
+        if self.rng.random() < 0.5:
+            c, d = d, c
+        before = self.opponents[week - 1]
+        after = self.opponents[week + 1]
+        # new pairs must not meet in a neighbouring week or be meeting for a third time
+        if before[a] == c or after[a] == c or before[b] == d or after[b] == d:
+            return False
+        new_first = self._pair(a, c)
+        new_second = self._pair(b, d)
+        if len(self.meetings[new_first]) >= 2 or len(self.meetings[new_second]) >= 2:
+            return False
+        old_first = self._pair(a, b)
+        old_second = self._pair(c, d)
+        old_first_weeks = [w for w in self.meetings[old_first] if w != week]
+        old_second_weeks = [w for w in self.meetings[old_second] if w != week]
+        new_first_weeks = sorted(self.meetings[new_first] + [week])
+        new_second_weeks = sorted(self.meetings[new_second] + [week])
+        delta = (
+            self._pair_cost(old_first, old_first_weeks)
+            + self._pair_cost(old_second, old_second_weeks)
+            + self._pair_cost(new_first, new_first_weeks)
+            + self._pair_cost(new_second, new_second_weeks)
+            - self._pair_cost(old_first, self.meetings[old_first])
+            - self._pair_cost(old_second, self.meetings[old_second])
+            - self._pair_cost(new_first, self.meetings[new_first])
+            - self._pair_cost(new_second, self.meetings[new_second])
+        )
+        balance = None
+        if self.balance_weight:
+            strength = self.strength
+            current = self.rematch_strength
+            old_pairs_twice = (len(self.meetings[old_first]) == 2, len(self.meetings[old_second]) == 2)
+            new_pairs_twice = (len(new_first_weeks) == 2, len(new_second_weeks) == 2)
+            balance = {team: current[team] for team in (a, b, c, d)}
+            if old_pairs_twice[0]:
+                balance[a] -= strength[b]
+                balance[b] -= strength[a]
+            if old_pairs_twice[1]:
+                balance[c] -= strength[d]
+                balance[d] -= strength[c]
+            if new_pairs_twice[0]:
+                balance[a] += strength[c]
+                balance[c] += strength[a]
+            if new_pairs_twice[1]:
+                balance[b] += strength[d]
+                balance[d] += strength[b]
+            for team, value in balance.items():
+                delta += self._balance_cost(value) - self._balance_cost(current[team])
+        if delta > 0 and self.rng.random() >= math.exp(-delta / temperature):
+            return False
+        self.meetings[old_first] = old_first_weeks
+        self.meetings[old_second] = old_second_weeks
+        self.meetings[new_first] = new_first_weeks
+        self.meetings[new_second] = new_second_weeks
+        row[a], row[c], row[b], row[d] = c, a, d, b
+        if balance:
+            for team, value in balance.items():
+                self.rematch_strength[team] = value
+        self.cost += delta
+        return True
+
+    def _try_week_swap(self, temperature: float) -> bool:
+        """
+        Helper method to propose swapping two whole weeks within the round robin or within the rematch weeks,
+        and accept it by the annealing rule
+
+        Args:
+            temperature (float): current annealing temperature
+
+        Returns:
+            bool: True if the move was applied
+        """
+        movable = self.round_robin_movable if self.rng.random() < 0.5 else self.rematch_movable
+        if len(movable) < 2:
+            return False
+        first, second = self.rng.sample(movable, 2)
+        # neighbours of each week after the swap, a swapped neighbour is the other week itself
+        swapped = {first: second, second: first}
+        last_week = self.season_length
+        for week in (first, second):
+            row = self.opponents[swapped[week]]
+            for neighbour in (week - 1, week + 1):
+                if neighbour < 1 or neighbour > last_week:
+                    continue
+                neighbour_row = self.opponents[swapped.get(neighbour, neighbour)]
+                if any(row[team] == neighbour_row[team] for team in range(len(self.teams))):
+                    return False
+        changes = {}
+        for week in (first, second):
+            row = self.opponents[week]
+            for team, opponent in enumerate(row):
+                if team < opponent:
+                    pair = self._pair(team, opponent)
+                    weeks = changes.get(pair, self.meetings[pair])
+                    changes[pair] = sorted(swapped[week] if w == week else w for w in weeks)
+        delta = sum(
+            self._pair_cost(pair, weeks) - self._pair_cost(pair, self.meetings[pair]) for pair, weeks in changes.items()
+        )
+        if delta > 0 and self.rng.random() >= math.exp(-delta / temperature):
+            return False
+        for pair, weeks in changes.items():
+            self.meetings[pair] = weeks
+        self.opponents[first], self.opponents[second] = self.opponents[second], self.opponents[first]
+        self.cost += delta
+        return True
+
+    def optimize(self, iterations: int = 1000000, start_temperature: float = 2.0, end_temperature: float = 0.01):
+        """
+        Method to run simulated annealing with a geometric cooling schedule
+
+        Args:
+            iterations (int): number of candidate moves to evaluate
+            start_temperature (float): initial temperature
+            end_temperature (float): final temperature
+
+        Returns:
+            float: season cost after optimization
+        """
+        self.logger.info(f"Optimizing schedule from cost {self.cost:.2f}")
+        start = time.perf_counter()
+        cooling = (end_temperature / start_temperature) ** (1 / max(iterations, 1))
+        temperature = start_temperature
+        best_cost = self.cost
+        best_state = self._snapshot()
+        for _ in range(iterations):
+            if self.rematch_movable and self.rng.random() < 0.8:
+                self._try_matchup_swap(temperature)
+            else:
+                self._try_week_swap(temperature)
+            if self.cost < best_cost - 1e-9:
+                best_cost = self.cost
+                best_state = self._snapshot()
+            temperature *= cooling
+        self.moves_evaluated += iterations
+        self._restore(best_state)
+        self.elapsed = time.perf_counter() - start
+        self.logger.info(
+            f"Optimized schedule to cost {self.cost:.2f}, "
+            f"{iterations / max(self.elapsed, 1e-9) * 60:,.0f} moves per minute"
+        )
+        return self.cost
+
+    def _snapshot(self) -> tuple:
+        """
+        Helper method to copy the mutable state of the season
+
+        Returns:
+            tuple: copies of the opponents, meetings, rematch strength and cost
+        """
+        return (
+            [row[:] for row in self.opponents],
+            [weeks[:] for weeks in self.meetings],
+            self.rematch_strength[:],
+            self.cost,
+        )
+
+    def _restore(self, state: tuple):
+        """
+        Helper method to restore a snapshot of the season
+
+        Args:
+            state (tuple): snapshot from _snapshot
+        """
+        self.opponents, self.meetings, self.rematch_strength, self.cost = state
+
+    def to_schedule(self) -> dict:
+        """
+        Method to return the optimized season in the ScheduleGenerator schedule format
+
+        Returns:
+            dict: matchups keyed by week label, in week order
+        """
+        schedule = {}
+        for week in range(1, self.season_length + 1):
+            label = "Rivalry Week" if week == self.rivalry_week else "Week"
+            row = self.opponents[week]
+            schedule[f"{label} {week}"] = [
+                (self.teams[team], self.teams[opponent]) for team, opponent in enumerate(row) if team < opponent
+            ]
+        return schedule
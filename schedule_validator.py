@@ -0,0 +1,162 @@
+"""
+QPFL Season Validator
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from schedule_model import Season, load_season
+
+
+def validate_season(
+    season: Season, rivals: dict = None, round_robin_weeks: int = None, max_meetings: int = 2
+) -> list:
+    """
+    Checks every season rule in one pass over a compact team x week opponent array: every team plays every
+    week, no team plays itself, rivals meet in rivalry week and not before, every pair meets once by the end of
+    the round robin, no pair meets more than max_meetings times, and no pair meets in back to back weeks
+
+    Args:
+        season (Season): the season to check
+        rivals (dict): each team's rival keyed by team, defaults to the pairs of the season's rivalry week
+        round_robin_weeks (int): last week of the round robin, defaults to one week per opponent
+        max_meetings (int): most times two teams may meet in the season
+
+    Returns:
+        list: (week, teams, message) tuples, one per violation, empty if the season is valid
+    """
+    teams = season.teams
+    n = len(teams)
+    team_ids = {team: team_id for team_id, team in enumerate(teams)}
+    if round_robin_weeks is None:
+        round_robin_weeks = min(n - 1, len(season.weeks))
+    rivalry_week = season.rivalry_week
+    if rivals is None and rivalry_week and rivalry_week <= len(season.weeks):
+        rivals = {}
+        for home, away in season.weeks[rivalry_week - 1]:
+            rivals[home] = away
+            rivals[away] = home
+    rival_ids = [-1] * n
+    for team, rival in (rivals or {}).items():
+        if team in team_ids and rival in team_ids:
+            rival_ids[team_ids[team]] = team_ids[rival]
+    violations = []
+    # opponents[week * n + team] holds the opponent id, -1 until the team is scheduled that week
+    opponents = [-1] * ((len(season.weeks) + 1) * n)
+    counts = bytearray(n * n)
+    for week, week_matchups in enumerate(season.weeks, start=1):
+        row = week * n
+        previous_row = row - n
+        for home, away in week_matchups:
+            home_id = team_ids.get(home)
+            away_id = team_ids.get(away)
+            if home_id is None or away_id is None:
+                violations.append((week, (home, away), "unknown team"))
+                continue
+            if home_id == away_id:
+                violations.append((week, (home, away), "team plays itself"))
+                continue
+            if opponents[row + home_id] != -1 or opponents[row + away_id] != -1:
+                violations.append((week, (home, away), "team scheduled twice in the same week"))
+                continue
+            opponents[row + home_id] = away_id
+            opponents[row + away_id] = home_id
+            if week > 1 and opponents[previous_row + home_id] == away_id:
+                violations.append((week, (home, away), "rematch of the previous week"))
+            cell = home_id * n + away_id
+            counts[cell] += 1
+            counts[away_id * n + home_id] += 1
+            meetings = counts[cell]
+            if meetings > max_meetings:
+                violations.append((week, (home, away), f"meeting number {meetings}, at most {max_meetings} allowed"))
+            elif week <= round_robin_weeks and meetings > 1:
+                violations.append((week, (home, away), "rematch before the round robin is complete"))
+            if rivalry_week and rival_ids[home_id] == away_id and week < rivalry_week:
+                violations.append((week, (home, away), f"rivals meet before rivalry week {rivalry_week}"))
+        for team_id in range(n):
+            if opponents[row + team_id] == -1:
+                violations.append((week, (teams[team_id],), "team has no game"))
+        if rivalry_week == week:
+            for team_id in range(n):
+                if rival_ids[team_id] != -1 and opponents[row + team_id] != rival_ids[team_id]:
+                    if team_id < rival_ids[team_id]:
+                        violations.append(
+                            (week, (teams[team_id], teams[rival_ids[team_id]]), "rivals do not meet in rivalry week")
+                        )
+        if week == round_robin_weeks:
+            for home_id in range(n):
+                for away_id in range(home_id + 1, n):
+                    if not counts[home_id * n + away_id]:
+                        violations.append(
+                            (week, (teams[home_id], teams[away_id]), "pair has not met by the end of the round robin")
+                        )
+    return violations
+
+
+def format_violations(violations: list) -> list:
+    """
+    Formats validator output for people to read
+
+    Args:
+        violations (list): (week, teams, message) tuples from validate_season
+
+    Returns:
+        list: one "Week N: A vs B - message" string per violation
+    """
+    return [f"Week {week}: {' vs '.join(teams)} - {message}" for week, teams, message in violations]
+
+
+def validate_jsonl(path: str, rivals: dict = None) -> dict:
+    """
+    Validates every season in a JSONL file, one season record per line, such as schedule_batch output
+
+    Args:
+        path (str): JSONL file
+        rivals (dict): each team's rival keyed by team, defaults to each season's rivalry week pairs
+
+    Returns:
+        dict: season count, invalid seed list, seconds and seasons per second
+    """
+    start = time.perf_counter()
+    seasons = 0
+    invalid = []
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            seasons += 1
+            if validate_season(Season.from_dict(record), rivals=rivals):
+                invalid.append(record.get("seed", seasons))
+    seconds = time.perf_counter() - start
+    return {
+        "seasons": seasons,
+        "invalid": invalid,
+        "seconds": round(seconds, 3),
+        "seasons_per_second": round(seasons / max(seconds, 1e-9), 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate QPFL season files")
+    parser.add_argument("paths", nargs="+", help="season files: .json, .csv, .jsonl, schedule.txt or team schedules")
+    args = parser.parse_args()
+    logger = logging.getLogger("controller_logs")
+    failed = False
+    for path in args.paths:
+        if path.endswith(".jsonl"):
+            summary = validate_jsonl(path)
+            failed = failed or bool(summary["invalid"])
+            logger.warning(
+                f"{path}: {summary['seasons']} seasons, {len(summary['invalid'])} invalid "
+                f"({summary['seasons_per_second']} seasons/s)"
+            )
+            continue
+        messages = format_violations(validate_season(load_season(path)))
+        failed = failed or bool(messages)
+        logger.warning(f"{path}: {'valid' if not messages else f'{len(messages)} violations'}")
+        for message in messages:
+            logger.warning(f"  {message}")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,219 @@
+"""
+QPFL Score Cache
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import time
+
+from scoring import DEFAULT_RULES, ScoringRules, score_player, stats_fingerprint
+
+
+class ScoreCache:
+    """
+    Persistent store of scored player-weeks in a SQLite file. Each player-week keeps its latest stat line, a hash
+    of that stat line and the fingerprint of the rules it was scored under. A lookup with different stats misses,
+    and a row scored under other rules is rescored from its stored stats the first time it is read, so nobody is
+    asked for a player's stats twice in a week.
+    """
+
+    def __init__(self, path: str = "scores.db", rules: ScoringRules = None):
+        """
+        Initializer for the ScoreCache class
+
+        Args:
+            path (str): SQLite file, created if missing, ":memory:" for a throwaway cache
+            rules (ScoringRules): compiled scoring rules, defaults to the league rules
+        """
+        self.logger = logging.getLogger("scorer_logs")
+        self.path = path
+        self.rules = rules or DEFAULT_RULES
+        self.hits = 0
+        self.misses = 0
+        self.rescored = 0
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scores (
+                player TEXT NOT NULL,
+                week INTEGER NOT NULL,
+                position TEXT NOT NULL,
+                stats_hash TEXT NOT NULL,
+                rules_hash TEXT NOT NULL,
+                stats TEXT NOT NULL,
+                points INTEGER NOT NULL,
+                scored_at REAL NOT NULL,
+                PRIMARY KEY (player, week)
+            )
+            """
+        )
+        self.connection.commit()
+
+    def close(self):
+        """
+        Method to close the SQLite connection
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        """
+        Context manager entry, the cache closes on exit
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Context manager exit
+        """
+        self.close()
+
+    def lookup(self, player: str, week: int, stats: dict = None):
+        """
+        Method to return a stored score. Without stats any stored stat line for the player-week counts, with stats
+        the stored line must hash the same.
+
+        Args:
+            player (str): player name
+            week (int): week number
+            stats (dict): stat record the score must match, None to accept the stored one
+
+        Returns:
+            int: points, or None when the player-week is not stored or its stats differ
+        """
+        row = self.connection.execute(
+            "SELECT position, stats_hash, rules_hash, stats, points FROM scores WHERE player = ? AND week = ?",
+            (player, week),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        position, stats_hash, rules_hash, stored_stats, points = row
+        if stats is not None and stats_fingerprint(position, stats, self.rules) != stats_hash:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if rules_hash != self.rules.fingerprint:
+            # scored under other rules: rescore the stored stat line instead of asking for it again
+            self.rescored += 1
+            points = self.store(player, week, position, json.loads(stored_stats))
+        return points
+
+    def stat_line(self, player: str, week: int) -> tuple:
+        """
+        Method to return the stat line stored for a player-week
+
+        Args:
+            player (str): player name
+            week (int): week number
+
+        Returns:
+            tuple: (position, stats), None when the player-week is not stored
+        """
+        row = self.connection.execute(
+            "SELECT position, stats FROM scores WHERE player = ? AND week = ?", (player, week)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def store(self, player: str, week: int, position: str, stats: dict, points: int = None) -> int:
+        """
+        Method to save a player-week, replacing any stored stat line for it
+
+        Args:
+            player (str): player name
+            week (int): week number
+            position (str): qb, rb, wr, te, k, def or hc
+            stats (dict): stat record for the position
+            points (int): points already computed under the cache's rules, scored here when None
+
+        Returns:
+            int: points stored
+        """
+        position = position.strip().lower()
+        if points is None:
+            points = score_player(position, stats, self.rules)
+        try:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        player,
+                        week,
+                        position,
+                        stats_fingerprint(position, stats, self.rules),
+                        self.rules.fingerprint,
+                        json.dumps(stats, sort_keys=True),
+                        points,
+                        time.time(),
+                    ),
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Could not store {player} week {week} in {self.path}: {e}")
+            raise
+        return points
+
+    def score(self, player: str, week: int, position: str, stats: dict) -> int:
+        """
+        Method to score a player-week, reusing the stored score when the stat line has not changed
+
+        Args:
+            player (str): player name
+            week (int): week number
+            position (str): qb, rb, wr, te, k, def or hc
+            stats (dict): stat record for the position
+
+        Returns:
+            int: points
+        """
+        points = self.lookup(player, week, stats)
+        if points is None:
+            points = self.store(player, week, position, stats)
+        return points
+
+    def forget(self, week: int = None) -> int:
+        """
+        Method to delete stored scores
+
+        Args:
+            week (int): only delete this week, None deletes everything
+
+        Returns:
+            int: rows deleted
+        """
+        with self.connection:
+            if week is None:
+                cursor = self.connection.execute("DELETE FROM scores")
+            else:
+                cursor = self.connection.execute("DELETE FROM scores WHERE week = ?", (week,))
+        return cursor.rowcount
+
+    def week_scores(self, week: int) -> dict:
+        """
+        Method to return every stored score of a week, rescoring rows stored under other rules
+
+        Args:
+            week (int): week number
+
+        Returns:
+            dict: points keyed by player
+        """
+        players = [row[0] for row in self.connection.execute("SELECT player FROM scores WHERE week = ?", (week,))]
+        return {player: self.lookup(player, week) for player in players}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show or clear stored QPFL scores")
+    parser.add_argument("--db", default="scores.db", help="SQLite score cache")
+    parser.add_argument("--week", type=int, required=True, help="week number")
+    parser.add_argument("--clear", action="store_true", help="delete the week's stored scores")
+    args = parser.parse_args()
+    logger = logging.getLogger("scorer_logs")
+    with ScoreCache(args.db) as cache:
+        if args.clear:
+            logger.warning(f"Deleted {cache.forget(args.week)} stored scores for week {args.week}")
+        else:
+            for player, points in sorted(cache.week_scores(args.week).items()):
+                print(f"{player}: {points}")
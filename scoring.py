@@ -0,0 +1,289 @@
+"""
+QPFL Scoring Rules
+"""
+
+import bisect
+import hashlib
+import json
+import os
+
+# league scoring settings, compiled once by load_rules
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_rules.json")
+HEAD_COACH_FIELDS = ("win", "margin")
+
+
+class Tiers:
+    """
+    A points ladder such as the D/ST points allowed brackets, compiled from a list of {"max", "points"} tiers
+    where the last tier has no max. Values from 0 up to the last bound are answered from a dense table in one
+    index, anything outside it falls back to a bisect over the bounds.
+    """
+
+    def __init__(self, tiers: list, name: str = "tiers"):
+        """
+        Initializer for the Tiers class
+
+        Args:
+            tiers (list): {"max": int or None, "points": int} dicts in ascending order, only the last max is None
+            name (str): rule name used in error messages
+        """
+        if not tiers or tiers[-1].get("max") is not None:
+            raise ValueError(f"{name} must end with an open tier (max null)")
+        self.bounds = [int(tier["max"]) for tier in tiers[:-1]]
+        if any(high <= low for low, high in zip(self.bounds, self.bounds[1:])):
+            raise ValueError(f"{name} bounds must be strictly increasing, got {self.bounds}")
+        self.points = [int(tier["points"]) for tier in tiers]
+        top = max(self.bounds[-1] + 1, 0) if self.bounds else 0
+        self.table = [self.points[bisect.bisect_left(self.bounds, value)] for value in range(top)]
+
+    def lookup(self, value: int) -> int:
+        """
+        Method to return the points of the tier a value falls in, a value equal to a bound is in that tier
+
+        Args:
+            value (int): stat value such as points allowed or margin
+
+        Returns:
+            int: points for the tier
+        """
+        if 0 <= value < len(self.table):
+            return self.table[value]
+        return self.points[bisect.bisect_left(self.bounds, value)]
+
+
+class ScoringRules:
+    """
+    League scoring settings compiled from the rules file: per-stat weights, yards per point, the field goal
+    distance buckets and the tier ladders. Changing the league settings only means editing scoring_rules.json.
+    """
+
+    def __init__(self, config: dict):
+        """
+        Initializer for the ScoringRules class
+
+        Args:
+            config (dict): parsed rules file
+        """
+        self.config = config
+        # identifies the rule set, so scores stored under other rules can be told apart
+        canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+        self.fingerprint = hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+        offense = config["offense"]
+        self.yards_per_point = {field: int(yards) for field, yards in offense["yards_per_point"].items()}
+        self.offense_points = {field: int(points) for field, points in offense["points_per_stat"].items()}
+
+        kicker = config["kicker"]
+        # (field, prompt label, points) for each field goal distance bucket
+        self.field_goals = []
+        for bucket in kicker["field_goals"]:
+            if bucket.get("max_yards") is None:
+                label = f"FGs {bucket['min_yards']}+ yards"
+            else:
+                label = f"FGs {bucket['min_yards']}-{bucket['max_yards']} yards"
+            self.field_goals.append((bucket["field"], label, int(bucket["points"])))
+        self.kicker_points = {field: int(points) for field, points in kicker["points_per_stat"].items()}
+        self.kicker_points.update({field: points for field, _, points in self.field_goals})
+
+        defense = config["defense"]
+        self.points_allowed = Tiers(defense["points_allowed"], "defense.points_allowed")
+        self.defense_points = {field: int(points) for field, points in defense["points_per_stat"].items()}
+
+        head_coach = config["head_coach"]
+        self.win_margin = Tiers(head_coach["win_margin"], "head_coach.win_margin")
+        self.loss_margin = Tiers(head_coach["loss_margin"], "head_coach.loss_margin")
+
+        offense_fields = tuple(self.yards_per_point) + tuple(self.offense_points)
+        self.position_fields = {
+            "qb": offense_fields,
+            "rb": offense_fields,
+            "wr": offense_fields,
+            "te": offense_fields,
+            "k": tuple(self.kicker_points),
+            "def": ("points_allowed",) + tuple(self.defense_points),
+            "hc": HEAD_COACH_FIELDS,
+        }
+
+
+def load_rules(path: str = RULES_PATH) -> ScoringRules:
+    """
+    Reads and compiles a scoring rules file
+
+    Args:
+        path (str): rules JSON file, defaults to scoring_rules.json next to this module
+
+    Returns:
+        ScoringRules: compiled rules
+    """
+    with open(path, "r") as f:
+        return ScoringRules(json.load(f))
+
+
+DEFAULT_RULES = load_rules()
+
+# stat fields read by each position under the league rules, any field missing from a stat record counts as 0
+OFFENSE_FIELDS = DEFAULT_RULES.position_fields["qb"]
+KICKER_FIELDS = DEFAULT_RULES.position_fields["k"]
+DEFENSE_FIELDS = DEFAULT_RULES.position_fields["def"]
+POSITION_FIELDS = DEFAULT_RULES.position_fields
+
+
+def _stat(stats: dict, field: str) -> int:
+    """
+    Reads one stat as an integer, blank or missing stats count as 0
+
+    Args:
+        stats (dict): stat record
+        field (str): stat name
+
+    Returns:
+        int: stat value
+    """
+    value = stats.get(field)
+    if value is None or value == "":
+        return 0
+    return int(value)
+
+
+def _flag(value) -> bool:
+    """
+    Reads a yes/no stat such as a head coach win
+
+    Args:
+        value: bool, number or string such as "y", "n", "true", "1"
+
+    Returns:
+        bool: True for a yes value
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in ("y", "yes", "true", "t", "1", "w", "win")
+    return bool(value)
+
+
+def score_offense(stats: dict, rules: ScoringRules = None) -> int:
+    """
+    Scores a quarterback, running back, wide receiver or tight end. All offensive players share one rule set,
+    by default 1 point per 25 passing yards, 1 per 10 rushing or receiving yards, 6 per TD, -2 per turnover,
+    -4 more per turnover returned for a TD and 2 per two point conversion
+
+    Args:
+        stats (dict): stat record with OFFENSE_FIELDS
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        int: player's total points for the week
+    """
+    rules = rules or DEFAULT_RULES
+    points = 0
+    for field, yards in rules.yards_per_point.items():
+        points += _stat(stats, field) // yards
+    for field, weight in rules.offense_points.items():
+        points += weight * _stat(stats, field)
+    return points
+
+
+def score_kicker(stats: dict, rules: ScoringRules = None) -> int:
+    """
+    Scores a kicker
+
+    Args:
+        stats (dict): stat record with KICKER_FIELDS
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        int: K's total points for the week
+    """
+    rules = rules or DEFAULT_RULES
+    points = 0
+    for field, weight in rules.kicker_points.items():
+        points += weight * _stat(stats, field)
+    return points
+
+
+def score_defense(stats: dict, rules: ScoringRules = None) -> int:
+    """
+    Scores a defense/special teams
+
+    Args:
+        stats (dict): stat record with DEFENSE_FIELDS
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        int: D/ST's total points for the week
+    """
+    rules = rules or DEFAULT_RULES
+    points = rules.points_allowed.lookup(_stat(stats, "points_allowed"))
+    for field, weight in rules.defense_points.items():
+        points += weight * _stat(stats, field)
+    return points
+
+
+def score_head_coach(stats: dict, rules: ScoringRules = None) -> int:
+    """
+    Scores a head coach from the result and margin of the game
+
+    Args:
+        stats (dict): stat record with HEAD_COACH_FIELDS
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        int: HC's total points for the week
+    """
+    rules = rules or DEFAULT_RULES
+    margin = _stat(stats, "margin")
+    if _flag(stats.get("win")):
+        return rules.win_margin.lookup(margin)
+    return rules.loss_margin.lookup(margin)
+
+
+def stats_fingerprint(position: str, stats: dict, rules: ScoringRules = None) -> str:
+    """
+    Hashes the scoring-relevant part of a stat line: only the position's fields, read the way the scorers read
+    them, with zero stats left out, so a missing stat and a 0 hash the same and unrelated keys are ignored
+
+    Args:
+        position (str): qb, rb, wr, te, k, def or hc
+        stats (dict): stat record for the position
+        rules (ScoringRules): compiled rules whose stat fields to read, defaults to the league rules
+
+    Returns:
+        str: hex digest of the stat line
+    """
+    position = position.strip().lower()
+    fields = (rules or DEFAULT_RULES).position_fields[position]
+    values = {}
+    for field in fields:
+        value = _flag(stats.get(field)) if field == "win" else _stat(stats, field)
+        if value:
+            values[field] = value
+    canonical = json.dumps([position, values], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+POSITION_SCORERS = {
+    "qb": score_offense,
+    "rb": score_offense,
+    "wr": score_offense,
+    "te": score_offense,
+    "k": score_kicker,
+    "def": score_defense,
+    "hc": score_head_coach,
+}
+
+
+def score_player(position: str, stats: dict, rules: ScoringRules = None) -> int:
+    """
+    Scores one player-week
+
+    Args:
+        position (str): qb, rb, wr, te, k, def or hc
+        stats (dict): stat record for the position
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        int: player's total points for the week
+    """
+    try:
+        scorer = POSITION_SCORERS[position.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown position {position!r}, expected one of {', '.join(POSITION_SCORERS)}")
+    return scorer(stats, rules)
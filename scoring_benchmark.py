@@ -0,0 +1,299 @@
+"""
+QPFL Scoring Benchmarks
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+
+from bulk_scorer import score_stat_lines
+from scoring import score_player
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_fixtures.json")
+# share of each position in the made-up stat lines, roughly one lineup's worth
+POSITION_MIX = {"qb": 1, "rb": 2, "wr": 2, "te": 1, "k": 1, "def": 1, "hc": 1}
+
+
+def _count(rng: random.Random, mean: float) -> int:
+    """
+    Draws a small non-negative count such as TDs or sacks, Poisson distributed around a mean
+
+    Args:
+        rng (random.Random): random source
+        mean (float): average count
+
+    Returns:
+        int: count
+    """
+    count = 0
+    total = rng.expovariate(1.0)
+    while total < mean:
+        count += 1
+        total += rng.expovariate(1.0)
+    return count
+
+
+def _yards(rng: random.Random, mean: float, spread: float) -> int:
+    """
+    Draws a yardage total, which can be slightly negative
+
+    Args:
+        rng (random.Random): random source
+        mean (float): average yards
+        spread (float): standard deviation
+
+    Returns:
+        int: yards
+    """
+    return max(int(round(rng.gauss(mean, spread))), -15)
+
+
+def synthetic_stat_line(position: str, rng: random.Random) -> dict:
+    """
+    Makes up a plausible stat line for one player-week
+
+    Args:
+        position (str): qb, rb, wr, te, k, def or hc
+        rng (random.Random): random source
+
+    Returns:
+        dict: stat record with the position and its stat fields
+    """
+    stats = {"position": position}
+    if position == "qb":
+        stats["pass_yards"] = _yards(rng, 240, 70)
+        stats["rush_yards"] = _yards(rng, 15, 15)
+        stats["tds"] = _count(rng, 1.8)
+        stats["turnovers"] = _count(rng, 0.9)
+        stats["turnover_tds"] = _count(rng, 0.05 * stats["turnovers"])
+        stats["two_pt"] = _count(rng, 0.1)
+    elif position == "rb":
+        stats["rush_yards"] = _yards(rng, 60, 30)
+        stats["rec_yards"] = _yards(rng, 20, 15)
+        stats["tds"] = _count(rng, 0.6)
+        stats["turnovers"] = _count(rng, 0.2)
+        stats["two_pt"] = _count(rng, 0.05)
+    elif position in ("wr", "te"):
+        stats["rec_yards"] = _yards(rng, 60 if position == "wr" else 40, 30)
+        stats["rush_yards"] = _yards(rng, 2, 4)
+        stats["tds"] = _count(rng, 0.45 if position == "wr" else 0.35)
+        stats["turnovers"] = _count(rng, 0.1)
+        stats["two_pt"] = _count(rng, 0.05)
+    elif position == "k":
+        stats["pat_made"] = _count(rng, 2.3)
+        stats["pat_missed"] = _count(rng, 0.1)
+        for field, mean in (
+            ("fg_1_29", 0.4),
+            ("fg_30_39", 0.5),
+            ("fg_40_49", 0.5),
+            ("fg_50_59", 0.3),
+            ("fg_60_69", 0.02),
+            ("fg_70_plus", 0.002),
+        ):
+            stats[field] = _count(rng, mean)
+        stats["fg_missed"] = _count(rng, 0.3)
+    elif position == "def":
+        stats["points_allowed"] = 0 if rng.random() < 0.03 else max(_yards(rng, 21, 9), 0)
+        stats["turnovers"] = _count(rng, 1.3)
+        stats["sacks"] = _count(rng, 2.5)
+        stats["safeties"] = _count(rng, 0.03)
+        stats["blocked_kicks"] = _count(rng, 0.05)
+        stats["blocked_pats"] = _count(rng, 0.03)
+        stats["def_tds"] = _count(rng, 0.15)
+    elif position == "hc":
+        stats["win"] = rng.choice(["y", "n"])
+        stats["margin"] = max(_yards(rng, 10, 8), 1)
+    else:
+        raise ValueError(f"Unknown position {position!r}, expected one of {', '.join(POSITION_MIX)}")
+    return stats
+
+
+def synthetic_stat_lines(count: int, seed: int = 0) -> list:
+    """
+    Makes up a seeded set of stat lines across every position in POSITION_MIX proportions, the same seed gives
+    the same lines
+
+    Args:
+        count (int): number of player-weeks
+        seed (int): random seed
+
+    Returns:
+        list: stat records, each with a player, week and position
+    """
+    rng = random.Random(seed)
+    positions = [position for position, share in POSITION_MIX.items() for _ in range(share)]
+    lines = []
+    for number in range(count):
+        stats = synthetic_stat_line(positions[number % len(positions)], rng)
+        stats["player"] = f"Player {number}"
+        stats["week"] = 1 + number % 17
+        lines.append(stats)
+    return lines
+
+
+def scores_digest(points: list) -> str:
+    """
+    Hashes a list of scores so a whole synthetic run can be checked against one stored value
+
+    Args:
+        points (list): integer points in line order
+
+    Returns:
+        str: hex digest
+    """
+    return hashlib.blake2b(",".join(str(int(value)) for value in points).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def check_fixtures(path: str = FIXTURES_PATH) -> list:
+    """
+    Scores the golden fixtures: hand-checked stat lines, and the total and digest of a seeded synthetic run
+
+    Args:
+        path (str): fixtures JSON file
+
+    Returns:
+        list: one message per fixture that no longer scores as recorded, empty when all match
+    """
+    with open(path, "r") as f:
+        fixtures = json.load(f)
+    failures = []
+    for case in fixtures["cases"]:
+        points = score_player(case["position"], case["stats"])
+        if points != case["points"]:
+            failures.append(f"{case['name']}: scored {points}, expected {case['points']}")
+    synthetic = fixtures.get("synthetic")
+    if synthetic:
+        lines = synthetic_stat_lines(synthetic["count"], synthetic["seed"])
+        points = [score_player(line["position"], line) for line in lines]
+        if scores_digest(points) != synthetic["digest"]:
+            failures.append(
+                f"synthetic seed {synthetic['seed']} x {synthetic['count']}: total {sum(points)}, "
+                f"expected {synthetic['total_points']} (digest changed)"
+            )
+    return failures
+
+
+def _best_rate(function, lines: list, repeats: int) -> tuple:
+    """
+    Times a scoring path over the same lines several times and keeps the fastest run
+
+    Args:
+        function: callable taking the stat lines and returning one score per line
+        lines (list): stat records
+        repeats (int): timed runs
+
+    Returns:
+        tuple: (player-weeks per second, scores from the last run)
+    """
+    best = float("inf")
+    points = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        points = function(lines)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / max(best, 1e-9), list(points)
+
+
+def run_benchmarks(sizes: list, seed: int = 0, repeats: int = 3) -> dict:
+    """
+    Benchmarks every scoring path on seeded synthetic stat lines and checks they agree with each other and with
+    the golden fixtures
+
+    Args:
+        sizes (list): numbers of player-weeks to score
+        seed (int): random seed for the synthetic lines
+        repeats (int): timed runs per path, the fastest is reported
+
+    Returns:
+        dict: benchmark metadata, fixture failures and one result per size and path
+    """
+    logger = logging.getLogger("scorer_logs")
+    paths = {
+        "scalar": lambda lines: [score_player(line["position"], line) for line in lines],
+        "bulk": lambda lines: [score["points"] for score in score_stat_lines(lines)],
+    }
+    try:
+        # numpy is optional, the vectorized paths are skipped without it
+        from vectorized_scoring import columns_from_records, score_columns
+
+        paths["vectorized"] = lambda lines: score_columns(*columns_from_records(lines)).tolist()
+    except ImportError:
+        logger.warning("NumPy is not installed, skipping the vectorized path")
+        columns_from_records = None
+
+    results = []
+    for size in sizes:
+        lines = synthetic_stat_lines(size, seed)
+        reference = None
+        for name, function in paths.items():
+            rate, points = _best_rate(function, lines, repeats)
+            if reference is None:
+                reference = points
+            results.append(
+                {
+                    "path": name,
+                    "player_weeks": size,
+                    "player_weeks_per_second": round(rate, 1),
+                    "matches_scalar": points == reference,
+                    "digest": scores_digest(points),
+                }
+            )
+        if columns_from_records is not None:
+            # scoring columns that are already built, as a caller holding a stat table would
+            positions, columns = columns_from_records(lines)
+            rate, points = _best_rate(lambda _: score_columns(positions, columns).tolist(), lines, repeats)
+            results.append(
+                {
+                    "path": "vectorized_columns_only",
+                    "player_weeks": size,
+                    "player_weeks_per_second": round(rate, 1),
+                    "matches_scalar": points == reference,
+                    "digest": scores_digest(points),
+                }
+            )
+        logger.warning(
+            f"{size} player-weeks: "
+            + ", ".join(
+                f"{result['path']} {result['player_weeks_per_second']:,.0f}/s"
+                for result in results
+                if result["player_weeks"] == size
+            )
+        )
+    return {
+        "benchmark": "scoring",
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed": seed,
+        "fixture_failures": check_fixtures(),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark and check the QPFL scoring paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000], help="player-weeks per run")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the synthetic stat lines")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per path, the fastest is kept")
+    parser.add_argument("--out", default=None, help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--check", action="store_true", help="only check the golden fixtures")
+    args = parser.parse_args()
+    if args.check:
+        report = {"benchmark": "scoring", "fixture_failures": check_fixtures(), "results": []}
+    else:
+        report = run_benchmarks(args.sizes, args.seed, args.repeats)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    failed = report["fixture_failures"] or not all(result["matches_scalar"] for result in report["results"])
+    if failed:
+        logging.getLogger("scorer_logs").error("Scoring regression: " + "; ".join(report["fixture_failures"]))
+    raise SystemExit(1 if failed else 0)
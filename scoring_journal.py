@@ -0,0 +1,192 @@
+"""
+QPFL Scoring Session Journal
+"""
+
+import datetime
+import json
+import logging
+import os
+
+
+class ScoringJournal:
+    """
+    Append-only JSONL record of an interactive scoring session. Every answer is written and synced to disk as soon
+    as it is entered, keyed by what it answers (a stat field, "mode", "player", ...) rather than by the prompt
+    text, so a session replays the same way when the rules change its prompts. The first line holds the session
+    header and a finished session ends with a "done" line.
+    """
+
+    def __init__(self, path: str, rules_fingerprint: str = None, replay_only: bool = False):
+        """
+        Initializer for the ScoringJournal class. An unfinished journal at the path is picked up to be replayed and
+        then continued, a new one is started otherwise.
+
+        Args:
+            path (str): journal file
+            rules_fingerprint (str): fingerprint of the rules the session scores with, kept in the header
+            replay_only (bool): read the journal without writing to it
+        """
+        self.logger = logging.getLogger("scorer_logs")
+        self.path = path
+        self.replay_only = replay_only
+        self.header = None
+        self.entries = []
+        self.position = 0
+        self.handle = None
+        damaged = False
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        if not isinstance(entry, dict) or "key" not in entry:
+                            raise ValueError("not a journal entry")
+                        if entry["key"] != "session" and "answer" not in entry:
+                            raise ValueError("journal entry without an answer")
+                    except ValueError:
+                        # a crash can leave half a line at the end, everything before it is intact
+                        self.logger.warning(f"Ignoring unreadable line {number} of {path} and everything after it")
+                        damaged = True
+                        break
+                    if entry["key"] == "session":
+                        self.header = entry
+                    else:
+                        self.entries.append(entry)
+        if replay_only:
+            if self.header is None:
+                raise ValueError(f"{path} is not a scoring journal")
+            return
+        if self.header is None:
+            damaged = True
+            self.header = {
+                "key": "session",
+                "started": datetime.datetime.now().isoformat(timespec="seconds"),
+                "rules": rules_fingerprint,
+            }
+        if damaged:
+            # a new journal gets its header, a damaged one loses its unreadable tail so new answers follow the last
+            # good one
+            self._rewrite()
+        self.handle = open(path, "a")
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether the journal holds a complete session
+        """
+        return any(entry["key"] == "done" for entry in self.entries)
+
+    @property
+    def replaying(self) -> bool:
+        """
+        Whether journaled answers are still waiting to be replayed
+        """
+        return self.position < len(self.entries) and self.entries[self.position]["key"] != "done"
+
+    def _rewrite(self):
+        """
+        Helper method to write the header and the kept entries over the journal file
+        """
+        if self.handle is not None:
+            self.handle.close()
+        with open(self.path, "w") as f:
+            for entry in [self.header] + self.entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if self.handle is not None:
+            self.handle = open(self.path, "a")
+
+    def upcoming(self, key: str) -> bool:
+        """
+        Method to check whether the next journaled answer answers a question, without taking it
+
+        Args:
+            key (str): what would be asked
+
+        Returns:
+            bool: True if the next journaled answer is for that question
+        """
+        return self.replaying and self.entries[self.position]["key"] == key
+
+    def next(self, key: str):
+        """
+        Method to take the next journaled answer if it answers the same question
+
+        Args:
+            key (str): what is being asked
+
+        Returns:
+            the journaled entry, None when the journal is used up or the session went another way
+        """
+        if not self.replaying:
+            return None
+        entry = self.entries[self.position]
+        if entry["key"] != key:
+            # the session no longer follows the journal (other flags, or rules that change the kicker prompts), so
+            # the remaining answers are dropped and the session continues interactively
+            self.logger.warning(
+                f"Journal answers {entry['key']!r} at entry {self.position + 1} but {key!r} was asked, continuing "
+                f"without the remaining {len(self.entries) - self.position} journaled answers"
+            )
+            del self.entries[self.position :]
+            if not self.replay_only:
+                self._rewrite()
+            return None
+        self.position += 1
+        return entry
+
+    def record(self, key: str, answer, **details):
+        """
+        Method to append an answer and sync it to disk
+
+        Args:
+            key (str): what was asked
+            answer: the answer as entered
+            details: extra values to keep with the answer
+        """
+        entry = {"key": key, "answer": answer, **details}
+        self.entries.append(entry)
+        self.position = len(self.entries)
+        if self.handle is None:
+            return
+        self.handle.write(json.dumps(entry) + "\n")
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+
+    def close(self):
+        """
+        Method to close the journal file
+        """
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+def archive_finished(path: str) -> str:
+    """
+    Moves a finished journal aside so a new session can start at the same path. A file there that is not a
+    scoring journal is moved aside too rather than written over, an empty one is left to be started over.
+
+    Args:
+        path (str): journal file
+
+    Returns:
+        str: new path of the moved file, None when nothing was moved
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    try:
+        journal = ScoringJournal(path, replay_only=True)
+    except ValueError:
+        suffix = "unreadable-" + datetime.datetime.now().isoformat(timespec="seconds")
+    else:
+        if not journal.finished:
+            return None
+        suffix = str(journal.header.get("started", ""))
+    stem, extension = os.path.splitext(path)
+    archived = f"{stem}-{suffix.replace(':', '')}{extension}"
+    os.replace(path, archived)
+    return archived
@@ -0,0 +1,284 @@
+"""
+QPFL Standings
+"""
+
+import argparse
+import json
+
+from bulk_scorer import read_stat_lines
+from schedule_model import load_season
+
+# applied in order to teams with the same win percentage until they separate
+TIEBREAKERS = ("head_to_head", "points_for", "points_against")
+
+
+class Standings:
+    """
+    League standings kept up to date one week at a time. Records, points and a head-to-head index are updated
+    per game, so applying a week costs O(teams), and the ranked table is stored after every week so any week's
+    standings can be read back without replaying the season.
+    """
+
+    def __init__(self, teams: list, tiebreakers: tuple = TIEBREAKERS):
+        """
+        Initializer for the Standings class
+
+        Args:
+            teams (list): team names
+            tiebreakers (tuple): tiebreakers to apply in order, from TIEBREAKERS
+        """
+        for tiebreaker in tiebreakers:
+            if tiebreaker not in TIEBREAKERS:
+                raise ValueError(f"Unknown tiebreaker {tiebreaker!r}, expected one of {', '.join(TIEBREAKERS)}")
+        self.teams = list(teams)
+        self.tiebreakers = tuple(tiebreakers)
+        self.wins = dict.fromkeys(self.teams, 0)
+        self.losses = dict.fromkeys(self.teams, 0)
+        self.ties = dict.fromkeys(self.teams, 0)
+        self.points_for = dict.fromkeys(self.teams, 0)
+        self.points_against = dict.fromkeys(self.teams, 0)
+        # head_to_head[team][opponent] is [wins, games] with a tie worth half a win
+        self.head_to_head = {team: {opponent: [0, 0] for opponent in self.teams} for team in self.teams}
+        self.weeks = []
+        self.tables = {}
+
+    def _record_game(self, team: str, score, opponent: str, opponent_score):
+        """
+        Helper method to add one game to both teams' records and the head-to-head index
+
+        Args:
+            team (str): team name
+            score: team's points
+            opponent (str): opponent name
+            opponent_score: opponent's points
+        """
+        for side in (team, opponent):
+            if side not in self.wins:
+                raise ValueError(f"{side} is not in the league")
+        self.points_for[team] += score
+        self.points_against[team] += opponent_score
+        self.points_for[opponent] += opponent_score
+        self.points_against[opponent] += score
+        if score > opponent_score:
+            self.wins[team] += 1
+            self.losses[opponent] += 1
+            result = 1.0
+        elif score < opponent_score:
+            self.losses[team] += 1
+            self.wins[opponent] += 1
+            result = 0.0
+        else:
+            self.ties[team] += 1
+            self.ties[opponent] += 1
+            result = 0.5
+        self.head_to_head[team][opponent][0] += result
+        self.head_to_head[team][opponent][1] += 1
+        self.head_to_head[opponent][team][0] += 1.0 - result
+        self.head_to_head[opponent][team][1] += 1
+
+    def apply_week(self, week: int, matchups: list) -> list:
+        """
+        Method to apply one week of results and store the standings after it
+
+        Args:
+            week (int): week number, weeks must be applied in order
+            matchups (list): (team, score, opponent, opponent score) tuples, as returned by
+                LiveScoreboard.matchup_scores
+
+        Returns:
+            list: standings rows after the week, see table
+        """
+        if self.weeks and week <= self.weeks[-1]:
+            raise ValueError(f"Week {week} applied after week {self.weeks[-1]}")
+        for team, score, opponent, opponent_score in matchups:
+            self._record_game(team, score, opponent, opponent_score)
+        self.weeks.append(week)
+        self.tables[week] = self._rank()
+        return self.tables[week]
+
+    def apply_results(self, results: dict) -> list:
+        """
+        Method to apply a week scored by weekly_results.score_week
+
+        Args:
+            results (dict): score_week output
+
+        Returns:
+            list: standings rows after the week, see table
+        """
+        matchups = [
+            (matchup["team"], matchup["score"], matchup["opponent"], matchup["opponent_score"])
+            for matchup in results["matchups"]
+        ]
+        return self.apply_week(results["week"], matchups)
+
+    def _win_percentage(self, team: str) -> float:
+        """
+        Helper method for a team's win percentage, ties count half
+
+        Args:
+            team (str): team name
+
+        Returns:
+            float: win percentage, 0 before any game
+        """
+        games = self.wins[team] + self.losses[team] + self.ties[team]
+        return (self.wins[team] + 0.5 * self.ties[team]) / games if games else 0.0
+
+    def _played_evenly(self, group: list) -> bool:
+        """
+        Helper method to check head-to-head applies to a tied group: every pair in it has met, and equally often,
+        so no team gains from a schedule that skipped a rival in the group
+
+        Args:
+            group (list): tied team names
+
+        Returns:
+            bool: True when head-to-head records are comparable
+        """
+        games = {self.head_to_head[team][opponent][1] for team in group for opponent in group if opponent != team}
+        return len(games) == 1 and 0 not in games
+
+    def _tiebreaker_value(self, tiebreaker: str, team: str, group: list):
+        """
+        Helper method to return a team's value for a tiebreaker within a tied group, higher is better
+
+        Args:
+            tiebreaker (str): one of TIEBREAKERS
+            team (str): team name
+            group (list): teams still tied
+
+        Returns:
+            value to compare, higher ranks first
+        """
+        if tiebreaker == "head_to_head":
+            wins = games = 0
+            for opponent in group:
+                if opponent != team:
+                    wins += self.head_to_head[team][opponent][0]
+                    games += self.head_to_head[team][opponent][1]
+            return wins / games
+        if tiebreaker == "points_for":
+            return self.points_for[team]
+        return -self.points_against[team]
+
+    def _break_ties(self, group: list) -> list:
+        """
+        Helper method to order teams with the same win percentage. The first tiebreaker that separates any of them
+        splits the group, and each smaller group that is still tied starts again from the first tiebreaker. Teams
+        no tiebreaker separates stay in alphabetical order.
+
+        Args:
+            group (list): tied team names
+
+        Returns:
+            list: team names, best first
+        """
+        if len(group) == 1:
+            return group
+        for tiebreaker in self.tiebreakers:
+            if tiebreaker == "head_to_head" and not self._played_evenly(group):
+                continue
+            values = {team: self._tiebreaker_value(tiebreaker, team, group) for team in group}
+            levels = sorted(set(values.values()), reverse=True)
+            if len(levels) > 1:
+                ordered = []
+                for level in levels:
+                    ordered += self._break_ties([team for team in group if values[team] == level])
+                return ordered
+        return sorted(group)
+
+    def _rank(self) -> list:
+        """
+        Helper method to rank every team by win percentage and tiebreakers
+
+        Returns:
+            list: standings rows, see table
+        """
+        groups = {}
+        for team in self.teams:
+            groups.setdefault(self._win_percentage(team), []).append(team)
+        order = []
+        for percentage in sorted(groups, reverse=True):
+            order += self._break_ties(groups[percentage])
+        return [
+            {
+                "rank": rank,
+                "team": team,
+                "wins": self.wins[team],
+                "losses": self.losses[team],
+                "ties": self.ties[team],
+                "points_for": self.points_for[team],
+                "points_against": self.points_against[team],
+            }
+            for rank, team in enumerate(order, start=1)
+        ]
+
+    def table(self, week: int = None) -> list:
+        """
+        Method to return the standings after a week
+
+        Args:
+            week (int): week number, defaults to the latest week applied
+
+        Returns:
+            list: one dict per team, best first, with rank, team, wins, losses, ties, points_for and points_against
+        """
+        if week is None:
+            week = self.weeks[-1] if self.weeks else None
+        if week is None:
+            return self._rank()
+        if week not in self.tables:
+            raise ValueError(f"Week {week} has not been applied")
+        return self.tables[week]
+
+
+def format_table(rows: list, week: int = None) -> str:
+    """
+    Renders standings rows as text
+
+    Args:
+        rows (list): rows from Standings.table
+        week (int): week shown in the heading
+
+    Returns:
+        str: standings text
+    """
+    lines = [f"Standings after week {week}" if week else "Standings"]
+    lines.append(f"{'':>3} {'Team':<14}{'W-L-T':>9}{'PF':>9}{'PA':>9}")
+    for row in rows:
+        record = f"{row['wins']}-{row['losses']}-{row['ties']}"
+        lines.append(f"{row['rank']:>3} {row['team']:<14}{record:>9}{row['points_for']:>9g}{row['points_against']:>9g}")
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build QPFL standings from weekly results")
+    parser.add_argument("--results", nargs="*", default=[], help="weekly_results.py --out JSON files")
+    parser.add_argument("--scores", default=None, help="team scores with week, team, score, needs --schedule")
+    parser.add_argument("--schedule", default="schedule/schedule.json", help="saved schedule pairing the scores")
+    parser.add_argument("--week", type=int, default=None, help="show the standings after this week")
+    args = parser.parse_args()
+    if args.scores:
+        season = load_season(args.schedule)
+        standings = Standings(season.teams)
+        scores = {(int(line["week"]), line["team"]): float(line["score"]) for line in read_stat_lines(args.scores)}
+        for week, week_matchups in enumerate(season.weeks, start=1):
+            if not all((week, team) in scores for matchup in week_matchups for team in matchup):
+                break
+            standings.apply_week(
+                week,
+                [(team, scores[(week, team)], opponent, scores[(week, opponent)]) for team, opponent in week_matchups],
+            )
+    else:
+        weekly = []
+        for path in args.results:
+            with open(path, "r") as f:
+                weekly.append(json.load(f))
+        weekly.sort(key=lambda week_results: week_results["week"])
+        teams = sorted({team for week_results in weekly for team in week_results["lineups"]})
+        standings = Standings(teams)
+        for week_results in weekly:
+            standings.apply_results(week_results)
+    shown_week = args.week if args.week is not None else (standings.weeks[-1] if standings.weeks else None)
+    print(format_table(standings.table(args.week), shown_week), end="")
@@ -0,0 +1,364 @@
+"""
+QPFL Stat Ingestion
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+import urllib.parse
+
+from bulk_scorer import read_stat_lines
+from scoring import POSITION_FIELDS
+
+# provider field names mapped to scorer stat fields, used for any source without its own "fields" map.
+# Fields already named like the scorer's pass through unchanged.
+PROVIDER_FIELDS = {
+    "passing_yards": "pass_yards",
+    "rushing_yards": "rush_yards",
+    "receiving_yards": "rec_yards",
+    "touchdowns": "tds",
+    "turnovers_returned_for_td": "turnover_tds",
+    "two_point_conversions": "two_pt",
+    "xp_made": "pat_made",
+    "xp_missed": "pat_missed",
+    "fg_made_0_29": "fg_1_29",
+    "fg_made_30_39": "fg_30_39",
+    "fg_made_40_49": "fg_40_49",
+    "fg_made_50_59": "fg_50_59",
+    "fg_made_60_69": "fg_60_69",
+    "fg_made_70_plus": "fg_70_plus",
+    "takeaways": "turnovers",
+    "blocked_xp": "blocked_pats",
+    "defensive_tds": "def_tds",
+}
+PROVIDER_POSITIONS = {"dst": "def", "d/st": "def", "def": "def", "pk": "k"}
+
+
+class HttpConnectionPool:
+    """
+    Minimal asyncio HTTP/1.1 GET client that keeps connections open per host and reuses them, so a sweep of many
+    requests to one provider pays for a handful of connections rather than one per request
+    """
+
+    def __init__(self, max_per_host: int = 4):
+        """
+        Initializer for the HttpConnectionPool class
+
+        Args:
+            max_per_host (int): most connections open to one host, further requests wait for a free one
+        """
+        self.max_per_host = max_per_host
+        self.slots = {}
+        self.idle = {}
+        self.opened = 0
+
+    async def _connection(self, host: str, port: int) -> tuple:
+        """
+        Helper method to take an idle connection to a host, or open a new one
+
+        Args:
+            host (str): host name
+            port (int): port
+
+        Returns:
+            tuple: (reader, writer)
+        """
+        idle = self.idle.get((host, port), [])
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+        self.opened += 1
+        return await asyncio.open_connection(host, port)
+
+    async def get(self, url: str) -> tuple:
+        """
+        Method to GET a URL. The connection goes back to the pool when the server keeps it alive.
+
+        Args:
+            url (str): http:// URL
+
+        Returns:
+            tuple: (status code, body bytes)
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only http:// sources are supported, got {url}")
+        host, port = parts.hostname, parts.port or 80
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        slots = self.slots.setdefault((host, port), asyncio.Semaphore(self.max_per_host))
+        async with slots:
+            return await self._request(host, port, parts.netloc, path)
+
+    async def _request(self, host: str, port: int, netloc: str, path: str) -> tuple:
+        """
+        Helper method to send one GET on a pooled connection and read the response
+
+        Args:
+            host (str): host name
+            port (int): port
+            netloc (str): Host header value
+            path (str): path and query
+
+        Returns:
+            tuple: (status code, body bytes)
+        """
+        reader, writer = await self._connection(host, port)
+        try:
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {netloc}\r\nConnection: keep-alive\r\n\r\n".encode())
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError(f"{host}:{port} closed the connection")
+            status = int(status_line.split()[1])
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if headers.get("transfer-encoding", "").lower() == "chunked":
+                body = b""
+                while True:
+                    size = int((await reader.readline()).split(b";")[0], 16)
+                    if size == 0:
+                        await reader.readline()
+                        break
+                    body += await reader.readexactly(size)
+                    await reader.readline()
+            elif "content-length" in headers:
+                body = await reader.readexactly(int(headers["content-length"]))
+            else:
+                body = await reader.read()
+                headers["connection"] = "close"
+        except BaseException:
+            # a half-read response leaves the connection unusable
+            writer.close()
+            raise
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self.idle.setdefault((host, port), []).append((reader, writer))
+        return status, body
+
+    async def close(self):
+        """
+        Method to close every idle connection
+        """
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle = {}
+
+
+def normalize(record: dict, week: int, source: str, fields: dict = None) -> dict:
+    """
+    Converts one provider stat line into the stat record the scorers read
+
+    Args:
+        record (dict): provider stat line with a player name and position under any of the usual keys
+        week (int): week number
+        source (str): source name, kept on the record
+        fields (dict): provider field name to scorer field name, defaults to PROVIDER_FIELDS
+
+    Returns:
+        dict: stat record with player, position, week, source and the position's stat fields
+    """
+    fields = PROVIDER_FIELDS if fields is None else fields
+    player = record.get("player") or record.get("name")
+    position = str(record.get("position") or record.get("pos") or "").strip().lower()
+    position = PROVIDER_POSITIONS.get(position, position)
+    if not player or position not in POSITION_FIELDS:
+        raise ValueError(f"Stat line from {source} has no player or an unknown position: {record}")
+    stats = {"player": player, "position": position, "week": week, "source": source}
+    wanted = POSITION_FIELDS[position]
+    for key, value in record.items():
+        field = fields.get(key, key)
+        if field in wanted and value not in (None, ""):
+            stats[field] = value
+    return stats
+
+
+async def _fetch_json(pool: HttpConnectionPool, url: str, limit: asyncio.Semaphore):
+    """
+    GETs one JSON document with a bounded number of requests in flight
+
+    Args:
+        pool (HttpConnectionPool): shared connection pool
+        url (str): http:// URL
+        limit (asyncio.Semaphore): bounds the requests in flight across all sources
+
+    Returns:
+        parsed JSON body
+    """
+    async with limit:
+        status, body = await pool.get(url)
+    if status != 200:
+        raise ConnectionError(f"GET {url} returned {status}")
+    return json.loads(body)
+
+
+async def ingest_http_source(source: dict, week: int, pool: HttpConnectionPool, limit: asyncio.Semaphore) -> list:
+    """
+    Reads a week from an HTTP provider: the week's game list, then every game's stat lines at once
+
+    Args:
+        source (dict): {"name", "url": games list URL with a {week} placeholder, "fields"}
+        week (int): week number
+        pool (HttpConnectionPool): shared connection pool
+        limit (asyncio.Semaphore): bounds the requests in flight across all sources
+
+    Returns:
+        list: normalized stat records
+    """
+    index_url = source["url"].format(week=week)
+    index = await _fetch_json(pool, index_url, limit)
+    games = await asyncio.gather(
+        *(_fetch_json(pool, urllib.parse.urljoin(index_url, game), limit) for game in index["games"])
+    )
+    return [
+        normalize(line, week, source["name"], source.get("fields"))
+        for game in games
+        for line in game["players"]
+    ]
+
+
+async def ingest_file_source(source: dict, week: int) -> list:
+    """
+    Reads a week from a file drop: every CSV, JSON and JSONL file in the source's directory
+
+    Args:
+        source (dict): {"name", "path": directory with a {week} placeholder, "fields"}
+        week (int): week number
+
+    Returns:
+        list: normalized stat records
+    """
+    directory = source["path"].format(week=week)
+
+    def read_drop():
+        lines = []
+        for name in sorted(os.listdir(directory)):
+            if os.path.splitext(name)[1].lower() in (".csv", ".json", ".jsonl"):
+                lines += read_stat_lines(os.path.join(directory, name))
+        return lines
+
+    lines = await asyncio.to_thread(read_drop)
+    return [normalize(line, week, source["name"], source.get("fields")) for line in lines]
+
+
+async def ingest_week(sources: list, week: int, max_in_flight: int = 16, max_per_host: int = 4) -> dict:
+    """
+    Collects a week's stat lines from every source in one concurrent sweep. A source that fails, or has not
+    finished within its "timeout" (seconds for the whole source, default 10), is reported and the others still
+    count. When several sources have the same player, the first source listed wins.
+
+    Args:
+        sources (list): source dicts with a "type" of "http" or "file" and an optional "timeout", see
+            ingest_http_source and ingest_file_source
+        week (int): week number
+        max_in_flight (int): most HTTP requests open at once across all sources
+        max_per_host (int): most connections kept to one provider host
+
+    Returns:
+        dict: stat records keyed by player, per-source line counts and errors, duplicates dropped, connections
+            opened and seconds taken
+    """
+    logger = logging.getLogger("scorer_logs")
+    start = time.perf_counter()
+    pool = HttpConnectionPool(max_per_host)
+    limit = asyncio.Semaphore(max_in_flight)
+    tasks = []
+    for source in sources:
+        if source.get("type", "http") == "http":
+            ingest = ingest_http_source(source, week, pool, limit)
+        elif source["type"] == "file":
+            ingest = ingest_file_source(source, week)
+        else:
+            raise ValueError(f"Unknown source type {source['type']!r} for {source['name']}, expected http or file")
+        # the timeout covers the source's whole fetch, so a slow provider is dropped however many games it lists
+        tasks.append(asyncio.wait_for(ingest, source.get("timeout", 10.0)))
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await pool.close()
+    stats = {}
+    summary = {"sources": {}, "duplicates": 0}
+    for source, result in zip(sources, results):
+        if isinstance(result, BaseException):
+            error = "timed out" if isinstance(result, asyncio.TimeoutError) else str(result) or type(result).__name__
+            logger.error(f"Source {source['name']} failed: {error}")
+            summary["sources"][source["name"]] = {"lines": 0, "error": error}
+            continue
+        summary["sources"][source["name"]] = {"lines": len(result), "error": None}
+        for line in result:
+            if line["player"] in stats:
+                summary["duplicates"] += 1
+                continue
+            stats[line["player"]] = line
+    summary["stats"] = stats
+    summary["connections"] = pool.opened
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def load_sources(path: str) -> list:
+    """
+    Reads the source list from a JSON config, relative file drop paths are taken from the config's directory
+
+    Args:
+        path (str): config JSON shaped {"sources": [...]}
+
+    Returns:
+        list: source dicts
+    """
+    with open(path, "r") as f:
+        sources = json.load(f)["sources"]
+    for source in sources:
+        if source.get("type") == "file" and not os.path.isabs(source["path"]):
+            source["path"] = os.path.join(os.path.dirname(os.path.abspath(path)), source["path"])
+    return sources
+
+
+def write_stat_lines(path: str, stats: dict):
+    """
+    Writes ingested stat records as JSONL, or CSV for a .csv path, in the format bulk_scorer and weekly_results read
+
+    Args:
+        path (str): output file
+        stats (dict): stat records keyed by player
+    """
+    with open(path, "w", newline="") as f:
+        if not path.lower().endswith(".csv"):
+            for line in stats.values():
+                f.write(json.dumps(line) + "\n")
+            return
+        fields = ["player", "position", "week", "source"]
+        for line in stats.values():
+            fields += [field for field in line if field not in fields]
+        writer = csv.DictWriter(f, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(stats.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect a week's stat lines from every configured source")
+    parser.add_argument("--config", default="stat_fixtures/sources.json", help="sources JSON")
+    parser.add_argument("--week", type=int, required=True, help="week number")
+    parser.add_argument("--out", default=None, help="stat file to write, defaults to week{N}_stats.jsonl")
+    parser.add_argument("--max-in-flight", type=int, default=16, help="most HTTP requests open at once")
+    args = parser.parse_args()
+    summary = asyncio.run(ingest_week(load_sources(args.config), args.week, args.max_in_flight))
+    out = args.out or f"week{args.week}_stats.jsonl"
+    write_stat_lines(out, summary["stats"])
+    logging.getLogger("scorer_logs").warning(
+        f"Wrote {len(summary['stats'])} stat lines to {out} in {summary['seconds']}s "
+        f"({summary['connections']} connections, {summary['duplicates']} duplicates dropped)"
+    )
@@ -0,0 +1,173 @@
+"""
+QPFL Stand-in Stat Provider
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stat_fixtures")
+
+
+class StatServer:
+    """
+    Local stand-in for a live stat provider, serving fixture box scores over HTTP/1.1 with keep-alive so the
+    ingestion path can be exercised offline. Routes:
+        GET /weeks/{week}/games            {"games": [game path, ...]}
+        GET /weeks/{week}/games/{game}     {"game": game, "players": [provider stat line, ...]}
+    Week N is read from stat_fixtures/provider_weekN.json.
+    """
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, delay: float = 0.0):
+        """
+        Initializer for the StatServer class
+
+        Args:
+            fixtures_dir (str): directory holding provider_week{N}.json files
+            delay (float): seconds to wait before each response, to imitate a remote provider
+        """
+        self.logger = logging.getLogger("stat_server_logs")
+        self.fixtures_dir = fixtures_dir
+        self.delay = delay
+        self.weeks = {}
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+
+    def _week(self, week: int) -> dict:
+        """
+        Helper method to load a week of fixture games, once
+
+        Args:
+            week (int): week number
+
+        Returns:
+            dict: player lines keyed by game, None when there is no fixture for the week
+        """
+        if week not in self.weeks:
+            path = os.path.join(self.fixtures_dir, f"provider_week{week}.json")
+            if not os.path.exists(path):
+                return None
+            with open(path, "r") as f:
+                self.weeks[week] = json.load(f)["games"]
+        return self.weeks[week]
+
+    def route(self, path: str) -> tuple:
+        """
+        Method to answer one GET request
+
+        Args:
+            path (str): request path
+
+        Returns:
+            tuple: (HTTP status, JSON-ready body)
+        """
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        if len(parts) >= 3 and parts[0] == "weeks" and parts[1].isdigit() and parts[2] == "games":
+            games = self._week(int(parts[1]))
+            if games is not None:
+                if len(parts) == 3:
+                    return 200, {"games": [f"/weeks/{parts[1]}/games/{game}" for game in games]}
+                if len(parts) == 4 and parts[3] in games:
+                    return 200, {"game": parts[3], "players": games[parts[3]]}
+        return 404, {"error": f"No such resource {path}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Helper method to serve requests on one connection until the client closes it or asks to
+
+        Args:
+            reader (asyncio.StreamReader): connection reader
+            writer (asyncio.StreamWriter): connection writer
+        """
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                self.requests += 1
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                if method == "GET":
+                    status, body = self.route(path)
+                else:
+                    status, body = 405, {"error": f"{method} not allowed"}
+                payload = json.dumps(body).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {reason}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError) as e:
+            self.logger.warning(f"Dropped connection: {e}")
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Method to start listening
+
+        Args:
+            host (str): interface to bind
+            port (int): port to bind, 0 picks a free one
+
+        Returns:
+            int: port the server listens on
+        """
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Method to stop listening and close the server
+        """
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def _serve(host: str, port: int, delay: float):
+    """
+    Runs the stand-in server until interrupted
+
+    Args:
+        host (str): interface to bind
+        port (int): port to bind
+        delay (float): seconds to wait before each response
+    """
+    server = StatServer(delay=delay)
+    port = await server.start(host, port)
+    logging.getLogger("stat_server_logs").warning(f"Serving fixture stats on http://{host}:{port}/weeks/1/games")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve fixture box scores like a live stat provider")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="port to bind")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before each response")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port, args.delay))
+    except KeyboardInterrupt:
+        pass
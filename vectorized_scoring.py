@@ -0,0 +1,257 @@
+"""
+QPFL Vectorized Scoring
+"""
+
+import argparse
+import logging
+import random
+import time
+
+import numpy as np
+
+from scoring import DEFAULT_RULES, POSITION_FIELDS, ScoringRules, Tiers, score_player
+
+
+def _column(columns: dict, field: str, rows: int) -> np.ndarray:
+    """
+    Reads one stat column as an int64 array, a missing column counts as all 0
+
+    Args:
+        columns (dict): stat arrays keyed by field
+        field (str): stat name
+        rows (int): number of rows in the table
+
+    Returns:
+        np.ndarray: stat values
+    """
+    if field not in columns:
+        return np.zeros(rows, dtype=np.int64)
+    return np.asarray(columns[field], dtype=np.int64)
+
+
+def _tier_columns(tiers: Tiers, values: np.ndarray) -> np.ndarray:
+    """
+    Looks up the tier points of every value with the breakpoints compiled in scoring.Tiers
+
+    Args:
+        tiers (Tiers): compiled tier ladder
+        values (np.ndarray): stat values
+
+    Returns:
+        np.ndarray: points per row
+    """
+    index = np.searchsorted(np.asarray(tiers.bounds, dtype=np.int64), values, side="left")
+    return np.asarray(tiers.points, dtype=np.int64)[index]
+
+
+def _weighted_columns(weights: dict, columns: dict, rows: int) -> np.ndarray:
+    """
+    Sums weight * stat over a set of per-stat weights
+
+    Args:
+        weights (dict): points per unit keyed by field
+        columns (dict): stat arrays keyed by field
+        rows (int): number of rows in the table
+
+    Returns:
+        np.ndarray: points per row
+    """
+    points = np.zeros(rows, dtype=np.int64)
+    for field, weight in weights.items():
+        points += weight * _column(columns, field, rows)
+    return points
+
+
+def score_offense_columns(columns: dict, rows: int, rules: ScoringRules = None) -> np.ndarray:
+    """
+    Scores QB/RB/WR/TE rows with the same rules as scoring.score_offense
+
+    Args:
+        columns (dict): stat arrays keyed by field
+        rows (int): number of rows in the table
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        np.ndarray: points per row
+    """
+    rules = rules or DEFAULT_RULES
+    points = _weighted_columns(rules.offense_points, columns, rows)
+    for field, yards in rules.yards_per_point.items():
+        points += np.floor_divide(_column(columns, field, rows), yards)
+    return points
+
+
+def score_kicker_columns(columns: dict, rows: int, rules: ScoringRules = None) -> np.ndarray:
+    """
+    Scores kicker rows with the same rules as scoring.score_kicker
+
+    Args:
+        columns (dict): stat arrays keyed by field
+        rows (int): number of rows in the table
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        np.ndarray: points per row
+    """
+    rules = rules or DEFAULT_RULES
+    return _weighted_columns(rules.kicker_points, columns, rows)
+
+
+def score_defense_columns(columns: dict, rows: int, rules: ScoringRules = None) -> np.ndarray:
+    """
+    Scores D/ST rows with the same rules as scoring.score_defense
+
+    Args:
+        columns (dict): stat arrays keyed by field
+        rows (int): number of rows in the table
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        np.ndarray: points per row
+    """
+    rules = rules or DEFAULT_RULES
+    points = _tier_columns(rules.points_allowed, _column(columns, "points_allowed", rows))
+    return points + _weighted_columns(rules.defense_points, columns, rows)
+
+
+def score_head_coach_columns(columns: dict, rows: int, rules: ScoringRules = None) -> np.ndarray:
+    """
+    Scores head coach rows with the same rules as scoring.score_head_coach
+
+    Args:
+        columns (dict): stat arrays keyed by field, win may be bool, 0/1 or y/n strings
+        rows (int): number of rows in the table
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        np.ndarray: points per row
+    """
+    rules = rules or DEFAULT_RULES
+    margin = _column(columns, "margin", rows)
+    win = columns.get("win", np.zeros(rows, dtype=bool))
+    win = np.asarray(win)
+    if win.dtype.kind in ("U", "S", "O"):
+        win = np.isin(np.char.lower(np.char.strip(win.astype(str))), ["y", "yes", "true", "t", "1", "w", "win"])
+    else:
+        win = win.astype(bool)
+    return np.where(win, _tier_columns(rules.win_margin, margin), _tier_columns(rules.loss_margin, margin))
+
+
+COLUMN_SCORERS = {
+    "qb": score_offense_columns,
+    "rb": score_offense_columns,
+    "wr": score_offense_columns,
+    "te": score_offense_columns,
+    "k": score_kicker_columns,
+    "def": score_defense_columns,
+    "hc": score_head_coach_columns,
+}
+
+
+def score_columns(positions, columns: dict, rules: ScoringRules = None) -> np.ndarray:
+    """
+    Scores a whole stat table at once, applying each position's rules to its rows
+
+    Args:
+        positions: position of every row (qb, rb, wr, te, k, def, hc)
+        columns (dict): stat arrays keyed by field, all the same length as positions
+        rules (ScoringRules): compiled rules, defaults to the league rules
+
+    Returns:
+        np.ndarray: int64 points per row, identical to scoring.score_player row by row
+    """
+    positions = np.char.lower(np.char.strip(np.asarray(positions, dtype=str)))
+    rows = len(positions)
+    scores = np.zeros(rows, dtype=np.int64)
+    for position in np.unique(positions):
+        if position not in COLUMN_SCORERS:
+            raise ValueError(f"Unknown position {position!r}, expected one of {', '.join(COLUMN_SCORERS)}")
+        mask = positions == position
+        subset = {field: np.asarray(values)[mask] for field, values in columns.items()}
+        scores[mask] = COLUMN_SCORERS[position](subset, int(mask.sum()), rules)
+    return scores
+
+
+def columns_from_records(records: list, rules: ScoringRules = None) -> tuple:
+    """
+    Converts stat records into position and stat columns, missing or blank stats become 0
+
+    Args:
+        records (list): stat record dicts with a position field
+        rules (ScoringRules): compiled rules whose stat fields to read, defaults to the league rules
+
+    Returns:
+        tuple: (positions, columns dict)
+    """
+    positions = [record["position"] for record in records]
+    position_fields = (rules or DEFAULT_RULES).position_fields
+    fields = {field for stat_fields in position_fields.values() for field in stat_fields}
+    columns = {}
+    for field in fields:
+        if field == "win":
+            columns[field] = np.array([str(record.get(field) or "") for record in records])
+        else:
+            columns[field] = np.array(
+                [int(record[field]) if record.get(field) not in (None, "") else 0 for record in records],
+                dtype=np.int64,
+            )
+    return positions, columns
+
+
+def random_records(count: int, seed: int = 0) -> list:
+    """
+    Builds random stat records across every position, including negative yardage and big bracket values
+
+    Args:
+        count (int): number of records
+        seed (int): random seed
+
+    Returns:
+        list: stat record dicts
+    """
+    rng = random.Random(seed)
+    records = []
+    positions = list(POSITION_FIELDS)
+    for _ in range(count):
+        position = rng.choice(positions)
+        record = {"position": position}
+        for field in POSITION_FIELDS[position]:
+            if field == "win":
+                record[field] = rng.choice(["y", "n", True, False, 1, 0])
+            elif field.endswith("yards"):
+                record[field] = rng.randint(-30, 500)
+            elif field == "points_allowed":
+                record[field] = rng.choice([0, rng.randint(0, 60)])
+            else:
+                record[field] = rng.randint(0, 45)
+        records.append(record)
+    return records
+
+
+def check_against_scalar(count: int = 100000, seed: int = 0) -> int:
+    """
+    Scores random records with both the scalar and the columnar path and counts disagreements
+
+    Args:
+        count (int): number of random records
+        seed (int): random seed
+
+    Returns:
+        int: number of rows where the two paths disagree, 0 when they match exactly
+    """
+    records = random_records(count, seed)
+    scalar = np.array([score_player(record["position"], record) for record in records], dtype=np.int64)
+    positions, columns = columns_from_records(records)
+    return int(np.count_nonzero(score_columns(positions, columns) != scalar))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the columnar scorer against the scalar scorer")
+    parser.add_argument("--rows", type=int, default=100000, help="random player-weeks to compare")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    logger = logging.getLogger("scorer_logs")
+    start = time.perf_counter()
+    mismatches = check_against_scalar(args.rows, args.seed)
+    logger.warning(f"{mismatches} mismatches over {args.rows} random player-weeks ({time.perf_counter() - start:.2f}s)")
+    raise SystemExit(1 if mismatches else 0)
@@ -0,0 +1,202 @@
+"""
+QPFL Weekly Results
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import time
+
+from bulk_scorer import read_stat_lines
+from rosters import check_lineup, load_rosters
+from schedule_model import load_season
+from score_cache import ScoreCache
+from scoring import ScoringRules, load_rules, score_player
+
+
+def load_week_stats(path: str, week: int) -> dict:
+    """
+    Reads the stat lines of one week from a bulk scorer stat file. Lines without a week column are taken as this
+    week's, and a player listed twice keeps their last line.
+
+    Args:
+        path (str): CSV, JSON or JSONL stat file
+        week (int): week number
+
+    Returns:
+        dict: stat record keyed by player
+    """
+    stats = {}
+    for line in read_stat_lines(path):
+        if line.get("week") not in (None, "") and int(line["week"]) != week:
+            continue
+        stats[line["player"]] = line
+    return stats
+
+
+def _score_assignment(task: tuple) -> dict:
+    """
+    Scores the players assigned to one matchup inside a worker process
+
+    Args:
+        task (tuple): ((player, position, stats) tuples, rules)
+
+    Returns:
+        dict: points keyed by player
+    """
+    players, rules = task
+    return {player: score_player(position, stats, rules) for player, position, stats in players}
+
+
+def score_week(
+    season,
+    week: int,
+    rosters: dict,
+    stats: dict,
+    workers: int = None,
+    rules: ScoringRules = None,
+    cache: ScoreCache = None,
+) -> dict:
+    """
+    Scores every lineup slot of every team playing in a week and resolves the week's matchups. Each distinct player
+    is scored once: players already in the cache are read from it, and the rest are assigned to the first matchup
+    that rosters them, with the matchups' assignments scored in parallel.
+
+    Args:
+        season (Season): schedule the matchups come from
+        week (int): week number, week 1 first
+        rosters (dict): list of (player, position) tuples keyed by team, each filling rosters.LINEUP_SLOTS
+        stats (dict): the week's stat record keyed by player, a rostered player with no line scores 0
+        workers (int): worker processes, 1 scores in this process, defaults to the number of cores
+        rules (ScoringRules): compiled scoring rules, defaults to the league rules
+        cache (ScoreCache): score cache to read and fill, None to score everything
+
+    Returns:
+        dict: week, matchups (team, score, opponent, opponent score and winner), each team's lineup points,
+            players without a stat line and how many players were scored, cached and seconds taken
+    """
+    logger = logging.getLogger("scorer_logs")
+    start = time.perf_counter()
+    if not 1 <= week <= len(season.weeks):
+        raise ValueError(f"The schedule has weeks 1-{len(season.weeks)}, not week {week}")
+    matchups = season.weeks[week - 1]
+    for matchup in matchups:
+        for team in matchup:
+            if team not in rosters:
+                raise ValueError(f"{team} plays in week {week} but has no roster")
+            check_lineup(team, rosters[team])
+
+    points = {}
+    missing = []
+    cached = 0
+    assignments = [[] for _ in matchups]
+    for index, matchup in enumerate(matchups):
+        for team in matchup:
+            for player, position in rosters[team]:
+                if player in points:
+                    continue
+                if player not in stats:
+                    points[player] = 0
+                    missing.append(player)
+                    continue
+                stored = cache.lookup(player, week, stats[player]) if cache is not None else None
+                if stored is not None:
+                    points[player] = stored
+                    cached += 1
+                    continue
+                # placeholder so a player shared with a later matchup is assigned only once
+                points[player] = None
+                assignments[index].append((player, position, stats[player]))
+
+    tasks = [(players, rules) for players in assignments if players]
+    if workers == 1 or len(tasks) <= 1:
+        for result in map(_score_assignment, tasks):
+            points.update(result)
+    else:
+        with multiprocessing.Pool(processes=min(workers or multiprocessing.cpu_count(), len(tasks))) as pool:
+            for result in pool.imap_unordered(_score_assignment, tasks):
+                points.update(result)
+    if cache is not None:
+        for players in assignments:
+            for player, position, player_stats in players:
+                cache.store(player, week, position, player_stats, points[player])
+
+    lineups = {}
+    results = []
+    for team, opponent in matchups:
+        for side in (team, opponent):
+            lineups[side] = [
+                {"player": player, "position": position, "points": points[player]}
+                for player, position in rosters[side]
+            ]
+        score = sum(slot["points"] for slot in lineups[team])
+        opponent_score = sum(slot["points"] for slot in lineups[opponent])
+        if score == opponent_score:
+            winner = None
+        else:
+            winner = team if score > opponent_score else opponent
+        results.append(
+            {"team": team, "score": score, "opponent": opponent, "opponent_score": opponent_score, "winner": winner}
+        )
+    if missing:
+        logger.warning(f"No week {week} stats for {', '.join(sorted(missing))}, scored as 0")
+    return {
+        "week": week,
+        "label": season.label(week),
+        "matchups": results,
+        "lineups": lineups,
+        "missing": sorted(missing),
+        "players_scored": sum(len(players) for players in assignments),
+        "players_cached": cached,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def format_results(results: dict) -> str:
+    """
+    Renders a week's results as text, one matchup per line
+
+    Args:
+        results (dict): output of score_week
+
+    Returns:
+        str: results text
+    """
+    lines = [f"{results['label']} Results"]
+    for matchup in results["matchups"]:
+        line = f"{matchup['team']} {matchup['score']} - {matchup['opponent_score']} {matchup['opponent']}"
+        lines.append(line + ("" if matchup["winner"] else " (tie)"))
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a whole QPFL week from the schedule, rosters and stats")
+    parser.add_argument("--week", type=int, required=True, help="week number")
+    parser.add_argument("--schedule", default="schedule/schedule.json", help="saved schedule")
+    parser.add_argument("--rosters", required=True, help="rosters JSON, see rosters.py")
+    parser.add_argument("--stats", required=True, help="CSV, JSON or JSONL stat lines with a player column")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, 1 scores in this process")
+    parser.add_argument("--rules", default=None, help="scoring rules JSON, defaults to scoring_rules.json")
+    parser.add_argument("--cache", default=None, help="SQLite score cache to reuse and fill")
+    parser.add_argument("--out", default=None, help="write the full results as JSON here")
+    args = parser.parse_args()
+    rules = load_rules(args.rules) if args.rules else None
+    cache = ScoreCache(args.cache, rules) if args.cache else None
+    try:
+        week_results = score_week(
+            load_season(args.schedule),
+            args.week,
+            load_rosters(args.rosters),
+            load_week_stats(args.stats, args.week),
+            workers=args.workers,
+            rules=rules,
+            cache=cache,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+    print(format_results(week_results), end="")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(week_results, f, indent=2)